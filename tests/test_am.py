@@ -0,0 +1,94 @@
+import asyncio
+import functools
+
+import pytest
+
+import ucp
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking_progress_mode", [True, False])
+@pytest.mark.parametrize("size", [0, 10, 2 ** 20])
+async def test_am_send_recv(blocking_progress_mode, size):
+    ucp.init(blocking_progress_mode=blocking_progress_mode)
+
+    async def echo_server(ep):
+        msg = await ep.am_recv()
+        await ep.am_send(msg)
+
+    listener = ucp.create_listener(echo_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    msg = bytearray(b"x" * size)
+    await client.am_send(msg)
+    got = await client.am_recv()
+    assert msg == got
+
+
+@pytest.mark.asyncio
+async def test_am_allocator():
+    ucp.init()
+    allocator = functools.partial(np.empty, dtype=np.uint8)
+    ucp.register_am_allocator(allocator)
+
+    async def echo_server(ep):
+        msg = await ep.am_recv()
+        await ep.am_send(msg)
+
+    listener = ucp.create_listener(echo_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    msg = np.arange(100, dtype=np.uint8)
+    await client.am_send(msg)
+    got = await client.am_recv()
+    assert isinstance(got, np.ndarray)
+    np.testing.assert_array_equal(msg, got)
+
+
+@pytest.mark.asyncio
+async def test_am_many_to_one():
+    ucp.init()
+    n_clients, n_msgs = 4, 10
+    received = []
+    done = asyncio.Event()
+
+    async def server(ep):
+        for _ in range(n_msgs):
+            received.append(bytes(await ep.am_recv()))
+        if len(received) == n_clients * n_msgs:
+            done.set()
+
+    listener = ucp.create_listener(server)
+
+    async def client(i):
+        ep = await ucp.create_endpoint(ucp.get_address(), listener.port)
+        for j in range(n_msgs):
+            await ep.am_send(bytearray(b"%d-%d" % (i, j)))
+        await done.wait()
+
+    await asyncio.gather(*(client(i) for i in range(n_clients)))
+    assert sorted(received) == sorted(
+        b"%d-%d" % (i, j) for i in range(n_clients) for j in range(n_msgs)
+    )
+
+
+@pytest.mark.asyncio
+async def test_am_unmatched(monkeypatch):
+    monkeypatch.setenv("UCXPY_AM_UNMATCHED_MAX", "2")
+    ucp.init()
+    ctx = ucp.core._get_ctx()
+    # Messages of unknown endpoints are kept until the endpoint is created
+    # but only the most recent ones are kept
+    for i in range(3):
+        ctx._am_push_unmatched(42, bytearray([i]))
+    assert ctx._am_pop_unmatched(42) == [bytearray([1]), bytearray([2])]
+    assert ctx._am_pop_unmatched(42) == []
+
+    # Expired messages are dropped
+    ctx._am_unmatched_timeout = 0
+    ctx._am_push_unmatched(42, bytearray(1))
+    await asyncio.sleep(0.01)
+    ctx._am_push_unmatched(43, bytearray(1))
+    assert ctx._am_pop_unmatched(42) == []
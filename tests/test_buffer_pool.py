@@ -0,0 +1,72 @@
+import gc
+import pickle
+
+import pytest
+
+import ucp
+from ucp.buffer_pool import BufferPool
+
+np = pytest.importorskip("numpy")
+
+
+def test_reuse():
+    pool = BufferPool()
+    buf = pool.allocate(100)
+    assert isinstance(buf, np.ndarray)
+    assert buf.nbytes == 100
+
+    # The buffer is returned when all views of it have been deleted
+    view = memoryview(buf)[10:20]
+    del buf
+    gc.collect()
+    assert pool.nbytes == 0
+    del view
+    gc.collect()
+    assert pool.nbytes == 128
+
+    # Allocations of the same size class reuse the buffer
+    pool.allocate(65)
+    assert pool.stats["hits"] == 1
+
+
+def test_release():
+    pool = BufferPool()
+    buf = pool.allocate(1000)
+    pool.release(buf)
+    assert pool.nbytes == 1024
+    del buf
+    gc.collect()
+    assert pool.nbytes == 1024
+
+    with pytest.raises(ValueError, match="wasn't allocated by a BufferPool"):
+        pool.release(np.empty(10))
+
+
+def test_max_bytes():
+    pool = BufferPool(max_bytes=1024)
+    bufs = [pool.allocate(1000) for _ in range(2)]
+    del bufs
+    gc.collect()
+    assert pool.nbytes == 1024
+
+    pool.clear()
+    assert pool.nbytes == 0
+
+
+@pytest.mark.asyncio
+async def test_recv_obj_pool():
+    ucp.init()
+    pool = ucp.get_buffer_pool()
+
+    async def echo_obj_server(ep):
+        obj = await ep.recv_obj(allocator=pool)
+        await ep.send_obj(obj)
+
+    listener = ucp.create_listener(echo_obj_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    msg = list(range(1000))
+    await client.send_obj(pickle.dumps(msg))
+    got = await client.recv_obj(allocator=pool)
+    assert pickle.loads(got) == msg
+    assert pool.stats["misses"] > 0
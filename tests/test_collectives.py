@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import ucp.utils
+from ucp.collectives import Communicator, _get_reduce_op
+
+
+async def allreduce_worker(rank, eps, args):
+    size = len(eps) + 1
+    # A small segment size makes the ring algorithm use many segments
+    comm = Communicator(rank, eps, segment_size=64)
+    for algorithm in ["ring", "recursive_doubling"]:
+        for n in [1, 7, 1000]:
+            got = await comm.allreduce(
+                np.arange(n, dtype="f8") * (rank + 1), algorithm=algorithm
+            )
+            expect = np.arange(n, dtype="f8") * sum(range(1, size + 1))
+            np.testing.assert_array_equal(got, expect)
+
+    got = await comm.allreduce(np.full((10, 10), rank), op="max")
+    np.testing.assert_array_equal(got, np.full((10, 10), size - 1))
+    return got.sum()
+
+
+async def reduce_scatter_allgather_worker(rank, eps, args):
+    size = len(eps) + 1
+    comm = Communicator(rank, eps, segment_size=64)
+    got = await comm.reduce_scatter(np.arange(100, dtype="i8"))
+    expect = np.array_split(np.arange(100, dtype="i8") * size, size)[rank]
+    np.testing.assert_array_equal(got, expect)
+
+    for algorithm in ["ring", "recursive_doubling"]:
+        got = await comm.allgather(np.full(3, rank, dtype="u2"), algorithm=algorithm)
+        assert got.shape == (size, 3)
+        np.testing.assert_array_equal(got[:, 0], np.arange(size))
+    await comm.barrier()
+
+
+async def broadcast_scatter_worker(rank, eps, args):
+    size = len(eps) + 1
+    comm = Communicator(rank, eps, segment_size=64)
+    for root in range(size):
+        for algorithm in ["chain", "binomial"]:
+            buf = np.arange(1000, dtype="i4") if rank == root else np.zeros(1000, "i4")
+            got = await comm.broadcast(buf, root=root, algorithm=algorithm)
+            np.testing.assert_array_equal(got, np.arange(1000, dtype="i4"))
+
+        if rank == root:
+            buf = np.arange(size * 50, dtype="f4").reshape(size, 50)
+        else:
+            buf = np.zeros(50, dtype="f4")
+        got = await comm.scatter(buf, root=root)
+        np.testing.assert_array_equal(got, np.arange(50, dtype="f4") + rank * 50)
+
+
+@pytest.mark.parametrize("n_workers", [3, 4])
+def test_allreduce(n_workers):
+    results = ucp.utils.run_on_local_network(n_workers, allreduce_worker)
+    assert len(set(results)) == 1
+
+
+@pytest.mark.parametrize("n_workers", [3, 4])
+def test_reduce_scatter_allgather(n_workers):
+    ucp.utils.run_on_local_network(n_workers, reduce_scatter_allgather_worker)
+
+
+@pytest.mark.parametrize("n_workers", [2, 5])
+def test_broadcast_scatter(n_workers):
+    ucp.utils.run_on_local_network(n_workers, broadcast_scatter_worker)
+
+
+def test_communicator_args():
+    with pytest.raises(ValueError, match="ranks must be"):
+        Communicator(0, {2: None})
+    with pytest.raises(ValueError, match="Unknown reduction op"):
+        _get_reduce_op("mean")
+    with pytest.raises(ValueError, match="Unknown algorithm"):
+        Communicator(0, {})._select_algorithm("tree", 0)
@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+import ucp
+from ucp.endpoint_pool import EndpointPool
+
+
+async def echo_server(ep):
+    while not ep.closed():
+        msg = bytearray(10)
+        try:
+            await ep.recv(msg)
+            await ep.send(msg)
+        except ucp.exceptions.UCXCanceled:
+            break
+
+
+async def echo(ep, i):
+    msg = bytearray(b"%10d" % i)
+    await ep.send(msg)
+    got = bytearray(10)
+    await ep.recv(got)
+    assert msg == got
+
+
+@pytest.mark.asyncio
+async def test_hit_miss():
+    listener = ucp.create_listener(echo_server)
+    pool = EndpointPool()
+
+    # Concurrent requests share a single connection attempt
+    eps = await asyncio.gather(
+        *(pool.get(ucp.get_address(), listener.port) for _ in range(3))
+    )
+    assert eps[0] is eps[1] is eps[2]
+    assert pool.stats["misses"] == 1
+    assert await pool.get(ucp.get_address(), listener.port) is eps[0]
+    assert pool.stats["hits"] == 1
+    await echo(eps[0], 0)
+
+    # Closed endpoints are replaced lazily
+    await eps[0].close()
+    ep = await pool.get(ucp.get_address(), listener.port)
+    assert ep is not eps[0]
+    assert pool.stats["reconnects"] == 1
+    await echo(ep, 1)
+
+    await pool.clear()
+    assert len(pool) == 0
+    assert ep.closed()
+
+
+@pytest.mark.asyncio
+async def test_eviction():
+    listeners = [ucp.create_listener(echo_server) for _ in range(3)]
+    evicted = []
+    pool = EndpointPool(
+        max_endpoints=2, on_evict=lambda address, ep: evicted.append(address)
+    )
+    addresses = [(ucp.get_address(), lf.port) for lf in listeners]
+
+    eps = [await pool.get(*addresses[0]), await pool.get(*addresses[1])]
+    await pool.get(*addresses[0])  # Makes addresses[1] the least recently used
+    await pool.get(*addresses[2])
+    assert evicted == [addresses[1]]
+    assert pool.stats["evictions"] == 1
+    assert addresses[1] not in pool
+    await pool.clear()
+    assert eps[1].closed()
+
+    # Endpoints in use by `connection()` are not evicted
+    evicted.clear()
+    async with pool.connection(*addresses[0]) as ep:
+        await pool.get(*addresses[1])
+        await pool.get(*addresses[2])
+        assert evicted == [addresses[1]]
+        assert addresses[0] in pool
+        await echo(ep, 0)
+    await pool.clear()
+
+    # The new endpoint isn't evicted when all other endpoints are in use
+    pool = EndpointPool(max_endpoints=1)
+    async with pool.connection(*addresses[0]):
+        ep = await pool.get(*addresses[1])
+        assert not ep.closed()
+        assert pool.stats["evictions"] == 0
+        await echo(ep, 1)
+    await pool.clear()
+
+
+def test_pool_args():
+    with pytest.raises(ValueError, match="must be positive"):
+        EndpointPool(max_endpoints=0)
@@ -0,0 +1,49 @@
+import pytest
+
+import ucp
+from ucp.endpoint_reuse import EndpointReuse
+
+
+@pytest.fixture(autouse=True)
+def clear_existing_endpoints():
+    EndpointReuse.existing_endpoints.clear()
+    yield
+    EndpointReuse.existing_endpoints.clear()
+
+
+@pytest.mark.asyncio
+async def test_reuse():
+    async def echo_server(ep):
+        msg = bytearray(10)
+        await ep.recv(msg)
+        await ep.send(msg)
+
+    async def echo(ep, i):
+        msg = bytearray(b"%10d" % i)
+        await ep.send(msg)
+        got = bytearray(10)
+        await ep.recv(got)
+        assert msg == got
+
+    listener = EndpointReuse.create_listener(echo_server, port=0)
+    # The first round trip makes sure that the server has registered the
+    # new endpoint
+    clients = [await EndpointReuse.create_endpoint(ucp.get_address(), listener.port)]
+    await echo(clients[0], 0)
+    for i in range(1, 3):
+        clients.append(
+            await EndpointReuse.create_endpoint(ucp.get_address(), listener.port)
+        )
+        await echo(clients[i], i)
+
+    # All virtual endpoints share a single endpoint, which is registered
+    # by both the client and the server
+    assert len(EndpointReuse.existing_endpoints) == 2
+    assert clients[0].handle is clients[1].handle is clients[2].handle
+    assert clients[0].handle.refcount == 3
+    # The virtual endpoints use distinct tags
+    assert len({client.tag for client in clients}) == 3
+
+    for client in clients:
+        await client.close()
+    assert all(client.closed() for client in clients)
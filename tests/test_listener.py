@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+import ucp
+
+
+@pytest.mark.asyncio
+async def test_accept_queue():
+    listener = ucp.create_listener(None, accept="queue")
+    clients = [
+        await ucp.create_endpoint(ucp.get_address(), listener.port) for _ in range(3)
+    ]
+
+    servers = []
+    async for ep in listener:
+        servers.append(ep)
+        if len(servers) == len(clients):
+            break
+
+    for i, (client, server) in enumerate(zip(clients, servers)):
+        msg = bytearray(b"%10d" % i)
+        got = bytearray(10)
+        await asyncio.gather(client.send(msg), server.recv(got))
+        assert msg == got
+
+    stats = listener.stats
+    assert stats["accepted"] == 3
+    assert stats["pending"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["max_accept_latency"] >= stats["accept_latency"] > 0
+
+    # Closing the listener ends the iteration
+    asyncio.get_event_loop().call_soon(listener.close)
+    async for ep in listener:
+        assert False
+
+
+@pytest.mark.asyncio
+async def test_max_pending():
+    release = asyncio.Event()
+
+    async def server_node(ep):
+        await release.wait()
+
+    listener = ucp.create_listener(server_node, max_pending=1)
+    await ucp.create_endpoint(ucp.get_address(), listener.port)
+    assert listener.stats["pending"] == 1
+
+    # The listener is full thus the next connection is rejected
+    with pytest.raises((ucp.exceptions.UCXBaseException, asyncio.TimeoutError)):
+        await asyncio.wait_for(
+            ucp.create_endpoint(
+                ucp.get_address(), listener.port, endpoint_error_handling=True
+            ),
+            timeout=1,
+        )
+    assert listener.stats["rejected"] == 1
+
+    release.set()
+    await asyncio.sleep(0.1)
+    assert listener.stats["pending"] == 0
+    assert listener.stats["accepted"] == 1
+
+
+def test_listener_args():
+    ucp.reset()
+    with pytest.raises(ValueError, match="Unknown accept mode"):
+        ucp.create_listener(None, accept="batch")
+    with pytest.raises(ValueError, match="must be positive"):
+        ucp.create_listener(lambda ep: None, max_pending=0)
+    with pytest.raises(ValueError, match="must be None"):
+        ucp.create_listener(lambda ep: None, accept="queue")
+    ucp.reset()
@@ -51,3 +51,34 @@ async def test_many_servers_many_clients(num_servers, num_clients):
         for __ in range(i, min(i + somaxconn, num_clients * num_servers)):
             clients.append(client_node(listeners[__ % num_servers].port))
         await asyncio.gather(*clients, loop=asyncio.get_event_loop())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("concurrency", [None, 4])
+async def test_create_endpoints(concurrency):
+    listeners = [ucp.create_listener(server_node) for _ in range(2)]
+    addresses = [(ucp.get_address(), listeners[i % 2].port) for i in range(10)]
+    eps = await ucp.create_endpoints(addresses, concurrency=concurrency, timeout=60)
+    assert len(eps) == len(addresses)
+    await asyncio.gather(*(hello(ep) for ep in eps))
+
+
+@pytest.mark.asyncio
+async def test_create_endpoints_timeout():
+    listener = ucp.create_listener(server_node)
+    closed_listener = ucp.create_listener(server_node)
+    closed_port = closed_listener.port
+    closed_listener.close()
+
+    addresses = [
+        (ucp.get_address(), listener.port),
+        (ucp.get_address(), closed_port),
+    ]
+    ep, error = await ucp.create_endpoints(addresses, timeout=1, return_exceptions=True)
+    assert isinstance(error, Exception)
+    await hello(ep)
+
+    with pytest.raises(ucp.exceptions.UCXConnectionError) as excinfo:
+        await ucp.create_endpoints(addresses, timeout=1)
+    assert list(excinfo.value.errors) == [1]
+    await hello(excinfo.value.results[0])
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+import pytest
+
+import ucp
+
+
+@pytest.mark.asyncio
+async def test_adaptive_mode():
+    ucp.init(progress_mode="adaptive")
+
+    async def echo_server(ep):
+        for _ in range(10):
+            msg = bytearray(10)
+            await ep.recv(msg)
+            await ep.send(msg)
+
+    listener = ucp.create_listener(echo_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    for i in range(10):
+        msg = bytearray(b"%10d" % i)
+        await client.send(msg)
+        got = bytearray(10)
+        await client.recv(got)
+        assert msg == got
+        # Let the progress go idle every other message
+        if i % 2:
+            await asyncio.sleep(0.1)
+
+    (task,) = ucp.core._get_ctx().progress_tasks
+    assert task.transitions > 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [10, 2 ** 20])
+async def test_thread_mode(size):
+    ucp.init(progress_mode="thread")
+
+    async def echo_server(ep):
+        msg = bytearray(size)
+        await ep.recv(msg)
+        await ep.send(msg)
+
+    listener = ucp.create_listener(echo_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    (task,) = ucp.core._get_ctx().progress_tasks
+    assert task.thread.is_alive()
+
+    msg = bytearray(b"x" * size)
+    got = bytearray(size)
+    send = asyncio.ensure_future(client.send(msg))
+    recv = asyncio.ensure_future(client.recv(got))
+    await asyncio.sleep(0)  # Post the send and receive
+    # The progress thread keeps communicating while the event loop is busy
+    time.sleep(0.1)
+    await asyncio.gather(send, recv)
+    assert msg == got
+
+
+def test_progress_mode_args():
+    ucp.reset()
+    with pytest.raises(ValueError, match="Unknown progress mode"):
+        ucp.init(progress_mode="spinning")
+    with pytest.raises(ValueError, match="Cannot set both"):
+        ucp.init(blocking_progress_mode=True, progress_mode="adaptive")
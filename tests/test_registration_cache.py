@@ -0,0 +1,66 @@
+import pytest
+
+import ucp
+from ucp.registration_cache import RegistrationCache
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def context():
+    ucp.reset()
+    ucp.init()
+    yield ucp.core._get_ctx().context
+    ucp.reset()
+
+
+def test_hit_miss(context):
+    cache = RegistrationCache(context)
+    arena = np.empty(1000, dtype="u1")
+
+    memh = cache.get(arena)
+    assert cache.stats["misses"] == 1
+    assert memh.address == arena.ctypes.data
+    assert memh.length == arena.nbytes
+
+    # The arena and sub-buffers within the arena are hits
+    assert cache.get(arena) is memh
+    assert cache.get(arena[100:200]) is memh
+    assert cache.get(arena[-10:]) is memh
+    assert cache.stats["hits"] == 3
+    assert len(cache) == 1
+
+
+def test_eviction(context):
+    evicted = []
+    cache = RegistrationCache(context, max_bytes=2000, on_evict=evicted.append)
+    arenas = [np.empty(1000, dtype="u1") for _ in range(3)]
+
+    memhs = [cache.get(arenas[0]), cache.get(arenas[1])]
+    cache.get(arenas[0])  # Makes arenas[1] the least recently used
+    cache.get(arenas[2])
+    assert evicted == [memhs[1]]
+    assert cache.stats["evictions"] == 1
+    assert cache.nbytes == 2000
+
+    # Buffers larger than the budget are not cached
+    cache.get(np.empty(3000, dtype="u1"))
+    assert cache.stats["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_invalidate(context):
+    evicted = []
+    cache = RegistrationCache(context, on_evict=evicted.append)
+    arenas = [np.empty(1000, dtype="u1") for _ in range(2)]
+    memhs = [cache.get(a) for a in arenas]
+
+    assert cache.invalidate(arenas[0].ctypes.data + 500, 1) == 1
+    assert evicted == [memhs[0]]
+    assert cache.get(arenas[1]) is memhs[1]
+    assert cache.get(arenas[0]) is not memhs[0]
+    assert cache.stats["invalidations"] == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
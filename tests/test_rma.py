@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 
 import ucp
@@ -18,3 +20,61 @@ async def test_flush(blocking_progress_mode):
 
     await ucp.flush()
     ucp.reset()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking_progress_mode", [True, False])
+async def test_put_get(blocking_progress_mode):
+    ucp.init(blocking_progress_mode=blocking_progress_mode)
+    np = pytest.importorskip("numpy")
+
+    region = np.arange(1000, dtype="i8")
+    memh = ucp.mem_map(region)
+
+    async def server_node(ep):
+        await ep.send_obj(pickle.dumps((memh.address, memh.pack_rkey())))
+        # Wait for the client to finish writing
+        await ep.recv(bytearray(1))
+
+    listener = ucp.create_listener(server_node)
+    ep = await ucp.create_endpoint(ucp.get_address(), listener.port)
+    address, packed_rkey = pickle.loads(await ep.recv_obj())
+    rkey = ep.unpack_rkey(packed_rkey)
+
+    got = np.empty(500, dtype="i8")
+    await ep.get(got, address + 100 * region.itemsize, rkey)
+    np.testing.assert_array_equal(got, region[100:600])
+
+    await ep.put(np.full(10, -1, dtype="i8"), address, rkey)
+    await ep.flush()
+    await ep.send(bytearray(1))
+    assert (region[:10] == -1).all()
+    np.testing.assert_array_equal(region[10:], np.arange(10, 1000))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking_progress_mode", [True, False])
+async def test_put_flush(blocking_progress_mode):
+    ucp.init(blocking_progress_mode=blocking_progress_mode)
+    np = pytest.importorskip("numpy")
+
+    region = np.zeros(100, dtype="i8")
+    memh = ucp.mem_map(region)
+
+    async def server_node(ep):
+        await ep.send_obj(pickle.dumps((memh.address, memh.pack_rkey())))
+        # The client flushes its put before notifying us
+        await ep.recv(bytearray(1))
+        await ep.send_obj(region.tobytes())
+
+    listener = ucp.create_listener(server_node)
+    ep = await ucp.create_endpoint(ucp.get_address(), listener.port)
+    address, packed_rkey = pickle.loads(await ep.recv_obj())
+    rkey = ep.unpack_rkey(packed_rkey)
+
+    data = np.arange(100, dtype="i8")
+    await ep.put(data, address, rkey)
+    await ep.flush()
+    await ep.send(bytearray(1))
+    got = np.frombuffer(await ep.recv_obj(), dtype="i8")
+    np.testing.assert_array_equal(got, data)
@@ -1,6 +1,7 @@
 import asyncio
 
 import numpy as np
+import pytest
 
 import ucp.utils
 
@@ -19,9 +20,22 @@ async def worker(rank, eps, args):
 
     # We expect to get the sum of all ranks excluding ours
     expect = sum(range(len(eps) + 1)) - rank
-    got = np.concatenate(recv_list).sum()
+    got = sum(int(r[0]) for r in recv_list)
     assert expect == got
+    return rank
 
 
-def test_all_comm(n_workers=4):
-    ucp.utils.run_on_local_network(n_workers, worker)
+@pytest.mark.parametrize("n_workers", [1, 4, 8])
+def test_all_comm(n_workers):
+    results = ucp.utils.run_on_local_network(n_workers, worker)
+    assert results == list(range(n_workers))
+
+
+def failing_worker(rank, eps, args):
+    if rank == 1:
+        raise ValueError("rank 1 failed")
+
+
+def test_worker_failure():
+    with pytest.raises(ValueError, match="rank 1 failed"):
+        ucp.utils.run_on_local_network(3, failing_worker)
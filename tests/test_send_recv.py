@@ -1,5 +1,6 @@
 import asyncio
 import functools
+import os
 
 import pytest
 
@@ -191,3 +192,113 @@ async def test_send_recv_obj_numpy(blocking_progress_mode):
     await client.send_obj(msg)
     got = await client.recv_obj(allocator=allocator)
     assert msg == got
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking_progress_mode", [True, False])
+async def test_send_recv_obj_sizes(blocking_progress_mode):
+    ucp.init(blocking_progress_mode=blocking_progress_mode)
+
+    sizes = [0, 1, 10, 2 ** 20, 3]
+
+    async def echo_obj_server(ep):
+        for _ in sizes:
+            obj = await ep.recv_obj()
+            await ep.send_obj(obj)
+
+    listener = ucp.create_listener(echo_obj_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    for size in sizes:
+        msg = bytearray(os.urandom(size))
+        await client.send_obj(msg)
+        got = await client.recv_obj()
+        assert msg == got
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking_progress_mode", [True, False])
+async def test_send_recv_obj_reverse_order(blocking_progress_mode):
+    ucp.init(blocking_progress_mode=blocking_progress_mode)
+
+    async def server(ep):
+        # The second message is sent first
+        await ep.send_obj(b"second", tag=2)
+        await ep.send_obj(b"first", tag=1)
+
+    listener = ucp.create_listener(server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    first, second = await asyncio.wait_for(
+        asyncio.gather(client.recv_obj(tag=1), client.recv_obj(tag=2)), timeout=10
+    )
+    assert first == b"first"
+    assert second == b"second"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking_progress_mode", [True, False])
+@pytest.mark.parametrize("nframes", [0, 1, 5])
+async def test_send_recv_frames(blocking_progress_mode, nframes):
+    ucp.init(blocking_progress_mode=blocking_progress_mode)
+
+    async def echo_frames_server(ep):
+        frames = await ep.recv_frames()
+        await ep.send_frames(frames)
+
+    listener = ucp.create_listener(echo_frames_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    frames = [np.arange(i * 1000, dtype="f8") for i in range(nframes)]
+    await client.send_frames(frames)
+    got = await client.recv_frames()
+    assert len(got) == nframes
+    for frame, g in zip(frames, got):
+        np.testing.assert_array_equal(frame, np.frombuffer(g, dtype="f8"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking_progress_mode", [True, False])
+@pytest.mark.parametrize("nbytes", [0, 1000, 10 * 2 ** 20 + 3])
+async def test_send_recv_chunked(blocking_progress_mode, nbytes):
+    ucp.init(blocking_progress_mode=blocking_progress_mode)
+
+    async def echo_server(ep):
+        chunks = [chunk async for chunk in ep.recv_chunked(max_inflight=2)]
+        assert all(len(c) <= 2 ** 20 for c in chunks)
+        await ep.send_chunked(b"".join(chunks), chunk_size=2 ** 20)
+
+    listener = ucp.create_listener(echo_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    msg = np.random.randint(0, 255, nbytes, dtype="u1")
+    await client.send_chunked(msg, chunk_size=2 ** 20)
+    got = bytearray()
+    async for chunk in client.recv_chunked():
+        got += chunk
+    np.testing.assert_array_equal(msg, np.frombuffer(got, dtype="u1"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking_progress_mode", [True, False])
+@pytest.mark.parametrize("use_tags", [True, False])
+async def test_send_recv_many(blocking_progress_mode, use_tags):
+    ucp.init(blocking_progress_mode=blocking_progress_mode)
+
+    n_msgs = 100
+    tags = list(range(n_msgs)) if use_tags else None
+
+    async def echo_many_server(ep):
+        msgs = [np.empty(8, dtype=np.uint8) for _ in range(n_msgs)]
+        await ep.recv_many(msgs, tags=tags)
+        await ep.send_many(msgs, tags=tags)
+
+    listener = ucp.create_listener(echo_many_server)
+    client = await ucp.create_endpoint(ucp.get_address(), listener.port)
+
+    msgs = [np.full(8, i, dtype=np.uint8) for i in range(n_msgs)]
+    await client.send_many(msgs, tags=tags)
+    resps = [np.empty(8, dtype=np.uint8) for _ in range(n_msgs)]
+    await client.recv_many(resps, tags=tags)
+    for msg, resp in zip(msgs, resps):
+        np.testing.assert_array_equal(resp, msg)
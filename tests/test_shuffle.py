@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import ucp.utils
+from ucp.shuffle import _ByteBudget, _schedule, shuffle
+
+
+async def shuffle_worker(rank, eps, args):
+    order, max_outstanding_bytes = args
+    size = len(eps) + 1
+    partitions = {
+        dst: np.full(1000 * (dst + 1), rank, dtype="u1") for dst in range(size)
+    }
+    received = {}
+
+    def consumer(src, buffer):
+        received[src] = bytes(buffer)
+
+    stats = await shuffle(
+        rank,
+        eps,
+        partitions,
+        consumer,
+        max_outstanding_bytes=max_outstanding_bytes,
+        order=order,
+    )
+    assert sorted(received) == list(range(size))
+    for src, data in received.items():
+        assert data == bytes([src]) * 1000 * (rank + 1)
+    for peer, s in stats["peers"].items():
+        assert s["bytes_sent"] == 1000 * (peer + 1)
+        assert s["bytes_recv"] == 1000 * (rank + 1)
+    assert stats["peak_recv_bytes"] <= max(max_outstanding_bytes, 1000 * (rank + 1))
+
+
+@pytest.mark.parametrize("n_workers", [3, 4])
+@pytest.mark.parametrize("order", ["pairwise", "staggered"])
+@pytest.mark.parametrize("max_outstanding_bytes", [1, 2 ** 20])
+def test_shuffle(n_workers, order, max_outstanding_bytes):
+    ucp.utils.run_on_local_network(
+        n_workers, shuffle_worker, worker_args=(order, max_outstanding_bytes)
+    )
+
+
+def test_schedule():
+    # Every rank receives from a single peer per round
+    for size in [3, 4, 7]:
+        for order in ["pairwise", "staggered"]:
+            schedules = [_schedule(r, size, order) for r in range(size)]
+            for k in range(size - 1):
+                assert sorted(s[k][0] for s in schedules) == list(range(size))
+                for r in range(size):
+                    dst = schedules[r][k][0]
+                    assert schedules[dst][k][1] == r
+    with pytest.raises(ValueError, match="Unknown order"):
+        _schedule(0, 2, "random")
+
+
+def test_byte_budget():
+    budget = _ByteBudget(100)
+    budget._grant(60)
+    assert budget._fits(40)
+    assert not budget._fits(41)
+    budget.release(60)
+    # Oversized requests are granted when nothing is outstanding
+    assert budget._fits(1000)
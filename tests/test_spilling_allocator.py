@@ -0,0 +1,89 @@
+import gc
+
+import numpy as np
+import pytest
+
+import ucp.utils
+from ucp.shuffle import shuffle
+from ucp.spilling_allocator import SpillingAllocator
+
+
+def _is_spilled(buffer):
+    owner = buffer
+    while isinstance(owner, np.ndarray):
+        owner = owner.base
+    return owner.spill_file is not None
+
+
+def test_spill(tmp_path):
+    allocator = SpillingAllocator(memory_budget=100, directory=str(tmp_path))
+    in_memory = allocator.allocate(100)
+    spilled = allocator(10)
+    assert not _is_spilled(in_memory)
+    assert _is_spilled(spilled)
+    assert allocator.stats == {
+        "memory_nbytes": 100,
+        "spilled_nbytes": 10,
+        "total_spilled_nbytes": 10,
+        "spill_files": 1,
+    }
+
+    # Spilled buffers are writable and usable through the buffer protocol
+    memoryview(spilled)[:] = b"0123456789"
+    assert bytes(spilled) == b"0123456789"
+    # The spill files are unlinked right away
+    assert list(tmp_path.iterdir()) == []
+
+    # The buffers are released when all views of them have been deleted
+    view = memoryview(spilled)[2:4]
+    del in_memory, spilled
+    gc.collect()
+    assert allocator.memory_nbytes == 0
+    assert allocator.spilled_nbytes == 10
+    del view
+    gc.collect()
+    assert allocator.spilled_nbytes == 0
+
+
+def test_spill_files(tmp_path):
+    allocator = SpillingAllocator(0, directory=str(tmp_path), file_size=4096)
+    bufs = [allocator.allocate(1000) for _ in range(4)]
+    assert allocator.spill_files == 1
+    # Buffers are aligned within the file
+    assert all(b.ctypes.data % 64 == 0 for b in bufs)
+
+    # The file is full thus a new one is created
+    bufs.append(allocator.allocate(1000))
+    assert allocator.spill_files == 2
+    # Buffers larger than the file size get a file of their own
+    bufs.append(allocator.allocate(10000))
+    assert allocator.spill_files == 3
+
+    # The space of the current file is reused once released
+    for buf in bufs:
+        allocator.release(buf)
+    del bufs, buf
+    allocator.allocate(4096)
+    assert allocator.spill_files == 3
+
+    with pytest.raises(ValueError, match="wasn't allocated by a SpillingAllocator"):
+        allocator.release(np.empty(10))
+
+
+async def shuffle_worker(rank, eps, args):
+    size = len(eps) + 1
+    partitions = [np.full(1000, rank, dtype="u1") for _ in range(size)]
+    allocator = SpillingAllocator(memory_budget=1000, file_size=4096)
+    received = {}
+
+    def consumer(src, buffer):
+        received[src] = buffer
+
+    await shuffle(rank, eps, partitions, consumer, allocator=allocator)
+    for src, data in received.items():
+        assert bytes(data) == bytes([src]) * 1000
+    assert allocator.stats["total_spilled_nbytes"] == 1000 * (size - 2)
+
+
+def test_shuffle_spill():
+    ucp.utils.run_on_local_network(4, shuffle_worker)
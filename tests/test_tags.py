@@ -35,3 +35,110 @@ async def test_tag_match():
     assert m1 == msg1
     await f2
     assert m2 == msg2
+
+
+@pytest.mark.asyncio
+async def test_recv_any_tag():
+    async def server_node(ep):
+        for i in range(3):
+            await ep.send(bytearray([i]), tag=i)
+        await ep.send(bytearray([3]))
+
+    lf = ucp.create_listener(server_node)
+    ep = await ucp.create_endpoint(ucp.get_address(), lf.port)
+    got = {}
+    for _ in range(4):
+        msg = bytearray(1)
+        tag = await ep.recv_any(msg)
+        got[tag] = msg[0]
+    assert got == {0: 0, 1: 1, 2: 2, None: 3}
+
+
+@pytest.mark.asyncio
+async def test_recv_any_endpoint():
+    n_clients = 3
+    server_eps = []
+
+    async def server_node(ep):
+        server_eps.append(ep)
+
+    lf = ucp.create_listener(server_node)
+    eps = [
+        await ucp.create_endpoint(ucp.get_address(), lf.port) for _ in range(n_clients)
+    ]
+    while len(server_eps) < n_clients:
+        await asyncio.sleep(0.01)
+
+    # Each server endpoint sends its index, which we match from any endpoint
+    await asyncio.gather(
+        *[e.send(bytearray([i]), tag=42) for i, e in enumerate(server_eps)]
+    )
+    senders = set()
+    for _ in range(n_clients):
+        msg = bytearray(1)
+        ep, tag = await ucp.recv_any(msg, tag=42)
+        assert tag == 42
+        assert ep in eps
+        senders.add(msg[0])
+    assert senders == set(range(n_clients))
+
+
+@pytest.mark.asyncio
+async def test_channel():
+    n_channels = 3
+
+    async def server_node(ep):
+        channels = [ep.channel("stream-%d" % i) for i in range(n_channels)]
+        for i in reversed(range(n_channels)):
+            await channels[i].send(bytearray([i]))
+        await ep.send(b"obj", tag="stream-0")
+
+    lf = ucp.create_listener(server_node)
+    ep = await ucp.create_endpoint(ucp.get_address(), lf.port)
+    channels = [ep.channel("stream-%d" % i) for i in range(n_channels)]
+    for i in range(n_channels):
+        msg = bytearray(1)
+        await channels[i].recv(msg)
+        assert msg[0] == i
+    # Channels and tagged messages of the endpoint match each other
+    assert await channels[0].recv_obj() == b"obj"
+    assert channels[0].endpoint is ep
+
+
+def test_user_tag_bits():
+    _user_tag_bits = ucp.core._user_tag_bits
+    assert _user_tag_bits(None) == 0
+    assert ucp.core._decode_user_tag(_user_tag_bits(42)) == 42
+    # The hash of str and bytes tags doesn't depend on the process
+    assert _user_tag_bits("stream") == _user_tag_bits(b"stream")
+    assert _user_tag_bits("stream") == ucp.core.TAG_HASHED_BIT | (
+        (ucp.utils.bytes_hash64(b"stream") % ucp.core.TAG_MAX_USER_TAG + 1)
+        << ucp.core.TAG_USER_SHIFT
+    )
+    # Hashed tags never match integer tags
+    assert ucp.core._decode_user_tag(_user_tag_bits("stream")) > (
+        ucp.core.TAG_MAX_USER_TAG
+    )
+    assert _user_tag_bits("a") != _user_tag_bits("b")
+    for tag in ("stream", -1, 2 ** 40, (1, 2)):
+        assert _user_tag_bits(tag) & ~ucp.core.TAG_USER_MASK == 0
+
+
+def test_new_endpoint_tags_unique(monkeypatch):
+    class FakeEndpoint:
+        _tags = {"ctrl_recv": ucp.core.TAG_CTRL_BIT | 2 << ucp.core.TAG_ENDPOINT_SHIFT}
+
+    class FakeContext:
+        endpoints_by_tag = {1 << ucp.core.TAG_ENDPOINT_SHIFT: FakeEndpoint()}
+
+    # The first draw collides with the message tag of the existing endpoint,
+    # the second with its control tag
+    ids = iter([1, 3, 4, 2, 5, 6])
+    monkeypatch.setattr(
+        ucp.core,
+        "hash64bits",
+        lambda *args: next(ids) << ucp.core.TAG_ENDPOINT_SHIFT,
+    )
+    msg_tag, ctrl_tag = ucp.core._new_endpoint_tags(FakeContext(), 0)
+    assert msg_tag == 5 << ucp.core.TAG_ENDPOINT_SHIFT
+    assert ctrl_tag == ucp.core.TAG_CTRL_BIT | 6 << ucp.core.TAG_ENDPOINT_SHIFT
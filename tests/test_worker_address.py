@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+import ucp
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("guarantee_msg_order", [True, False])
+async def test_worker_address(guarantee_msg_order):
+    # The two workers of the context act as two peers
+    ucp.init(n_workers=2)
+    addresses = [ucp.get_worker_address(i) for i in range(2)]
+    ep0, ep1 = await asyncio.gather(
+        ucp.create_endpoint_from_worker_address(
+            addresses[1], guarantee_msg_order, worker=0
+        ),
+        ucp.create_endpoint_from_worker_address(
+            addresses[0], guarantee_msg_order, worker=1
+        ),
+    )
+    assert ep0._tags["msg_send"] == ep1._tags["msg_recv"]
+    assert ep1._tags["msg_send"] == ep0._tags["msg_recv"]
+
+    msg = bytearray(b"x" * 10)
+    got = bytearray(10)
+    await asyncio.gather(ep0.send(msg), ep1.recv(got))
+    assert msg == got
+    await ep0.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_wireup():
+    ucp.init(n_workers=2)
+    addresses = [ucp.get_worker_address(i) for i in range(2)]
+    first = asyncio.ensure_future(
+        ucp.create_endpoint_from_worker_address(addresses[1], worker=0)
+    )
+    await asyncio.sleep(0)
+    # Only one endpoint to a peer worker can be created at a time
+    with pytest.raises(ucp.exceptions.UCXError, match="already being created"):
+        await ucp.create_endpoint_from_worker_address(addresses[1], worker=0)
+    await asyncio.gather(
+        first, ucp.create_endpoint_from_worker_address(addresses[0], worker=1)
+    )
+
+
+@pytest.mark.asyncio
+async def test_address_directory(tmp_path):
+    ucp.init(n_workers=2)
+    directory = ucp.AddressDirectory(str(tmp_path))
+    for i in range(2):
+        directory.publish(i, ucp.get_worker_address(i))
+    assert directory.names() == ["0", "1"]
+    assert bytes(await directory.lookup(1)) == bytes(ucp.get_worker_address(1))
+
+    eps = await asyncio.gather(
+        directory.connect(1, worker=0), directory.connect(0, worker=1)
+    )
+    msg = bytearray(b"y" * 10)
+    got = bytearray(10)
+    await asyncio.gather(eps[1].send(msg), eps[0].recv(got))
+    assert msg == got
+
+    directory.unpublish(1)
+    with pytest.raises(asyncio.TimeoutError):
+        await directory.lookup(1, timeout=0.05)
+    with pytest.raises(ValueError, match="Invalid name"):
+        directory.publish("../x")
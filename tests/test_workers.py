@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+import ucp
+
+
+async def echo_server(ep):
+    msg = bytearray(10)
+    await ep.recv(msg)
+    await ep.send(msg)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("progress_mode", ["blocking", "non-blocking", "thread"])
+async def test_round_robin(progress_mode):
+    ucp.init(progress_mode=progress_mode, n_workers=3)
+    workers = [w.handle for w in ucp.core._get_ctx().workers]
+    assert len(set(workers)) == 3
+
+    listener = ucp.create_listener(echo_server, worker=0)
+    clients = [
+        await ucp.create_endpoint(ucp.get_address(), listener.port) for _ in range(3)
+    ]
+    assert sorted(c.get_ucp_worker() for c in clients) == sorted(workers)
+
+    for i, client in enumerate(clients):
+        msg = bytearray(b"%10d" % i)
+        await client.send(msg)
+        got = bytearray(10)
+        await client.recv(got)
+        assert msg == got
+
+
+@pytest.mark.asyncio
+async def test_hash_policy():
+    ucp.init(n_workers=4, worker_policy="hash")
+    ctx = ucp.core._get_ctx()
+    listener = ucp.create_listener(echo_server)
+
+    clients = [
+        await ucp.create_endpoint(ucp.get_address(), listener.port) for _ in range(2)
+    ]
+    # Endpoints to the same peer share a worker
+    assert clients[0].get_ucp_worker() == clients[1].get_ucp_worker()
+    assert ctx._select_worker(peer=(ucp.get_address(), listener.port)) == (
+        ctx._select_worker(peer=(ucp.get_address(), listener.port))
+    )
+    await asyncio.gather(*(c.close() for c in clients))
+
+
+def test_worker_args():
+    ucp.reset()
+    with pytest.raises(ValueError, match="Unknown worker policy"):
+        ucp.init(worker_policy="random")
+    with pytest.raises(ValueError, match="must be positive"):
+        ucp.init(n_workers=0)
+    ucp.init(n_workers=2)
+    with pytest.raises(ValueError, match="Invalid worker"):
+        ucp.core._get_ctx()._select_worker(worker=2)
+    ucp.reset()
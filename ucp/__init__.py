@@ -7,6 +7,7 @@ import logging
 import os
 
 from ._version import get_versions as _get_versions
+from .address_directory import AddressDirectory  # noqa
 from .core import *  # noqa
 from .core import get_ucx_version
 from .utils import get_address, get_ucxpy_logger  # noqa
@@ -0,0 +1,53 @@
+import pytest
+
+from ucp._libs import ucx_api
+from ucp._libs.arr import Array
+
+
+def _create_worker(queue_size):
+    ctx = ucx_api.UCXContext(feature_flags=(ucx_api.Feature.TAG,))
+    worker = ucx_api.UCXWorker(ctx)
+    if queue_size:
+        worker.init_completion_queue(queue_size)
+    ep = worker.ep_create_from_worker_address(
+        worker.get_address(), endpoint_error_handling=False
+    )
+    return ctx, worker, ep
+
+
+def test_init_completion_queue():
+    ctx, worker, ep = _create_worker(0)
+    assert worker.completion_queue_size == 0
+    worker.init_completion_queue(100)
+    assert worker.completion_queue_size == 128
+    with pytest.raises(ValueError, match="already initialized"):
+        worker.init_completion_queue(100)
+
+
+@pytest.mark.parametrize("queue_size", [0, 1, 64])
+def test_send_recv_many(queue_size):
+    ctx, worker, ep = _create_worker(queue_size)
+    n, nbytes = 32, 2 ** 16
+    completed = []
+
+    def cb(request, exception, i):
+        assert exception is None
+        completed.append(i)
+
+    recv_msgs = [Array(bytearray(nbytes)) for _ in range(n)]
+    send_msgs = [Array(bytearray([i]) * nbytes) for i in range(n)]
+    reqs = []
+    for i in range(n):
+        reqs.append(
+            ucx_api.tag_recv_nb(
+                worker, recv_msgs[i], nbytes, tag=i, cb_func=cb, cb_args=(i,), ep=ep
+            )
+        )
+    for i in range(n):
+        ucx_api.tag_send_nb(ep, send_msgs[i], nbytes, tag=i, cb_func=cb, cb_args=(-1,))
+
+    pending = sum(r is not None for r in reqs)
+    while len([i for i in completed if i >= 0]) < pending:
+        worker.progress()
+    for i in range(n):
+        assert bytes(recv_msgs[i].obj) == bytes(send_msgs[i].obj)
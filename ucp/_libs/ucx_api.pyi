@@ -1,5 +1,7 @@
 import enum
-from typing import Callable, Iterable, Mapping, Optional
+from typing import Callable, Iterable, Mapping, Optional, Sequence
+
+TAG_MASK_FULL: int
 
 def get_current_options() -> None: ...
 
@@ -32,7 +34,10 @@ class UCXAddress:
 
 class UCXWorker(UCXObject):
     def __init__(self, context: UCXContext): ...
-    def progress(self) -> None: ...
+    def progress(self) -> int: ...
+    def init_completion_queue(self, size: int = ...) -> None: ...
+    @property
+    def completion_queue_size(self) -> int: ...
     def ep_create(
         self, ip_address: str, port: int, endpoint_error_handling: bool
     ) -> UCXEndpoint: ...
@@ -42,6 +47,13 @@ class UCXWorker(UCXObject):
     def ep_create_from_conn_request(
         self, conn_request: int, endpoint_error_handling: bool
     ) -> UCXEndpoint: ...
+    def am_register_handler(
+        self,
+        am_id: int,
+        cb_func: Optional[Callable],
+        cb_args: Optional[tuple] = ...,
+        cb_kwargs: Optional[dict] = ...,
+    ) -> None: ...
 
 class UCXListener(UCXObject):
     port: int
@@ -54,12 +66,50 @@ class UCXListener(UCXObject):
         cb_args: Optional[tuple] = ...,
         cb_kwargs: dict = ...,
     ): ...
+    def reject(self, conn_request: int) -> None: ...
 
 class UCXEndpoint(UCXObject):
     def info(self) -> str: ...
     @property
     def worker(self) -> UCXWorker: ...
 
+class UCXMemoryHandle(UCXObject):
+    def __init__(self, context: UCXContext, buffer: Array): ...
+    @property
+    def address(self) -> int: ...
+    @property
+    def length(self) -> int: ...
+    @property
+    def buffer(self): ...
+    def pack_rkey(self) -> bytes: ...
+
+class UCXRkey(UCXObject):
+    def __init__(self, ep: UCXEndpoint, rkey_buffer): ...
+    @property
+    def ep(self) -> UCXEndpoint: ...
+
+def put_nb(
+    ep: UCXEndpoint,
+    buffer: Array,
+    nbytes: int,
+    remote_addr: int,
+    rkey: UCXRkey,
+    cb_func: Callable,
+    cb_args: Optional[tuple] = ...,
+    cb_kwargs: Optional[dict] = ...,
+    name: Optional[str] = ...,
+): ...
+def get_nb(
+    ep: UCXEndpoint,
+    buffer: Array,
+    nbytes: int,
+    remote_addr: int,
+    rkey: UCXRkey,
+    cb_func: Callable,
+    cb_args: Optional[tuple] = ...,
+    cb_kwargs: Optional[dict] = ...,
+    name: Optional[str] = ...,
+): ...
 def tag_send_nb(
     ep: UCXEndpoint,
     buffer,
@@ -76,6 +126,7 @@ def tag_recv_nb(
     nbytes: int,
     tag: int,
     cb_func: Callable,
+    tag_mask: int = ...,
     cb_args: Optional[tuple] = ...,
     cb_kwargs: Optional[dict] = ...,
     name: Optional[str] = ...,
@@ -99,3 +150,58 @@ def stream_recv_nb(
     cb_kwargs: Optional[dict] = ...,
     name: Optional[str] = ...,
 ): ...
+
+class UCXRequestBatch:
+    @property
+    def pending(self) -> int: ...
+
+def tag_send_nb_many(
+    ep: UCXEndpoint,
+    buffers: Sequence,
+    nbytes: Sequence[int],
+    tags: Sequence[int],
+    cb_func: Callable,
+    cb_args: Optional[tuple] = ...,
+    cb_kwargs: Optional[dict] = ...,
+    name: Optional[str] = ...,
+) -> Optional[UCXRequestBatch]: ...
+def tag_send_iov_nb(
+    ep: UCXEndpoint,
+    buffers: Sequence,
+    tag: int,
+    cb_func: Callable,
+    cb_args: Optional[tuple] = ...,
+    cb_kwargs: Optional[dict] = ...,
+    name: Optional[str] = ...,
+): ...
+def am_send_nb(
+    ep: UCXEndpoint,
+    am_id: int,
+    buffers: Sequence,
+    cb_func: Callable,
+    cb_args: Optional[tuple] = ...,
+    cb_kwargs: Optional[dict] = ...,
+    name: Optional[str] = ...,
+): ...
+def tag_recv_probe_nb(
+    worker: UCXWorker,
+    tag: int,
+    allocator: Callable,
+    cb_func: Callable,
+    tag_mask: int = ...,
+    cb_args: Optional[tuple] = ...,
+    cb_kwargs: Optional[dict] = ...,
+    name: Optional[str] = ...,
+    ep: Optional[UCXEndpoint] = ...,
+) -> None: ...
+def tag_recv_nb_many(
+    worker: UCXWorker,
+    buffers: Sequence,
+    nbytes: Sequence[int],
+    tags: Sequence[int],
+    cb_func: Callable,
+    cb_args: Optional[tuple] = ...,
+    cb_kwargs: Optional[dict] = ...,
+    name: Optional[str] = ...,
+    ep: Optional[UCXEndpoint] = ...,
+) -> Optional[UCXRequestBatch]: ...
@@ -13,8 +13,9 @@ import weakref
 from posix.stdio cimport open_memstream
 
 from cpython.buffer cimport PyBUF_FORMAT, PyBUF_ND, PyBUF_READ, PyBUF_WRITABLE
-from cpython.ref cimport Py_DECREF, Py_INCREF, PyObject
-from libc.stdint cimport uint16_t, uintptr_t
+from cpython.memoryview cimport PyMemoryView_FromMemory
+from cpython.ref cimport Py_DECREF, Py_INCREF, Py_XDECREF, PyObject
+from libc.stdint cimport int64_t, uint16_t, uintptr_t
 from libc.stdio cimport (
     FILE,
     SEEK_END,
@@ -26,7 +27,7 @@ from libc.stdio cimport (
     rewind,
     tmpfile,
 )
-from libc.stdlib cimport free
+from libc.stdlib cimport free, malloc
 from libc.string cimport memcpy, memset
 
 from .arr cimport Array
@@ -74,25 +75,113 @@ cdef unicode decode_text_fd(FILE * text_fd):
     return py_text
 
 
+cdef struct ucx_py_completion_queue
+
+
 # Struct used as requests by UCX
+#
+# UCX allocates `request_size` bytes for every request from its own memory pool,
+# thus all per-request state is kept in this fixed-layout struct rather than in
+# Python objects that must be allocated and torn down for every message.
 cdef struct ucx_py_request:
     bint finished  # Used by downstream projects such as cuML
     unsigned int uid
-    PyObject *info
+    bint completed  # The UCX call-back function has been called
+    ucs_status_t status  # The status given to the UCX call-back function
+    int64_t received  # Number of bytes received or -1 when not a receive
+    int64_t expected_receive
+    ucp_tag_t sender_tag  # The tag of the matched message of a tag receive
+    # The following references are NULL until the request is registered by
+    # `_handle_status()` and are released by `UCXRequest.close()`
+    PyObject *cb_func
+    PyObject *cb_args
+    PyObject *cb_kwargs
+    PyObject *name
+    PyObject *inflight_msgs
+    PyObject *py_req  # The UCXRequest registered in `inflight_msgs`
+    # The completion queue of the worker, set by `_handle_status()`
+    ucx_py_completion_queue *queue
 
 
 # This function will be called by UCX only on the very first time
 # a request memory is initialized
-cdef void ucx_py_request_reset(void* request):
+cdef void ucx_py_request_reset(void* request) nogil:
     cdef ucx_py_request *req = <ucx_py_request*> request
     req.finished = False
     req.uid = 0
-    req.info = NULL
+    req.completed = False
+    req.status = UCS_OK
+    req.received = -1
+    req.expected_receive = 0
+    req.sender_tag = 0
+    req.cb_func = NULL
+    req.cb_args = NULL
+    req.cb_kwargs = NULL
+    req.name = NULL
+    req.inflight_msgs = NULL
+    req.py_req = NULL
+    req.queue = NULL
+
+
+# Release the references held by a request and make it ready for reuse by UCX
+cdef void ucx_py_request_clear(ucx_py_request *req):
+    Py_XDECREF(req.cb_func)
+    Py_XDECREF(req.cb_args)
+    Py_XDECREF(req.cb_kwargs)
+    Py_XDECREF(req.name)
+    Py_XDECREF(req.inflight_msgs)
+    Py_XDECREF(req.py_req)
+    ucx_py_request_reset(req)
 
 # Counter used as UCXRequest UIDs
 cdef unsigned int _ucx_py_request_counter = 0
 
 
+# Ring buffer of completed requests of a worker in completion queue mode (see
+# `UCXWorker.init_completion_queue()`). The UCX call-back functions push the
+# completed requests without touching Python objects and `UCXWorker.progress()`
+# pops them and invokes their Python call-back functions in one pass.
+cdef struct ucx_py_completion_queue:
+    ucx_py_request **ring  # NULL when the completion queue mode is disabled
+    size_t mask  # The capacity of `ring` minus one, the capacity is a power of 2
+    size_t head  # The number of pushed requests
+    size_t tail  # The number of popped requests
+    pthread_mutex_t lock
+
+
+# Record the completion of a request in the completion queue of its worker.
+# Returns False if the request doesn't use a completion queue or it is full.
+cdef bint ucx_py_completion_queue_push(
+    ucx_py_request *req, ucs_status_t status, int64_t received
+) nogil:
+    cdef ucx_py_completion_queue *queue = req.queue
+    if queue == NULL:
+        return False
+    cdef bint ret = False
+    pthread_mutex_lock(&queue.lock)
+    if queue.ring != NULL and queue.head - queue.tail <= queue.mask:
+        req.status = status
+        req.received = received
+        queue.ring[queue.head & queue.mask] = req
+        queue.head += 1
+        ret = True
+    pthread_mutex_unlock(&queue.lock)
+    return ret
+
+
+# Returns the oldest completed request of the queue or NULL if it is empty
+cdef ucx_py_request *ucx_py_completion_queue_pop(
+    ucx_py_completion_queue *queue
+) nogil:
+    cdef ucx_py_request *req = NULL
+    pthread_mutex_lock(&queue.lock)
+    if queue.tail != queue.head:
+        req = queue.ring[queue.tail & queue.mask]
+        queue.tail += 1
+    pthread_mutex_unlock(&queue.lock)
+    return req
+
+
 logger = logging.getLogger("ucx")
 
 
@@ -235,7 +324,8 @@ cdef class UCXObject:
 
 
 def _ucx_context_handle_finalizer(uintptr_t handle):
-    ucp_cleanup(<ucp_context_h> handle)
+    with nogil:
+        ucp_cleanup(<ucp_context_h> handle)
 
 
 class Feature(enum.Enum):
@@ -249,6 +339,10 @@ class Feature(enum.Enum):
     AM = UCP_FEATURE_AM
 
 
+# Tag mask that matches all bits of a tag, which is the default of `tag_recv_nb()`
+TAG_MASK_FULL = 0xFFFFFFFFFFFFFFFF
+
+
 cdef class UCXContext(UCXObject):
     """Python representation of `ucp_context_h`
 
@@ -323,11 +417,12 @@ cdef class UCXContext(UCXObject):
         assert self.initialized
 
         cdef FILE *text_fd = create_text_fd()
-        ucp_context_print_info(self._handle, text_fd)
+        with nogil:
+            ucp_context_print_info(self._handle, text_fd)
         return decode_text_fd(text_fd)
 
 
-cdef void _ib_err_cb(void *arg, ucp_ep_h ep, ucs_status_t status):
+cdef void _ib_err_cb(void *arg, ucp_ep_h ep, ucs_status_t status) with gil:
     cdef str status_str = ucs_status_string(status).decode("utf-8")
     cdef str msg = (
         "Endpoint %s failed with status %d: %s" % (
@@ -353,23 +448,41 @@ cdef ucp_err_handler_cb_t _get_error_callback(
 
 
 def _ucx_worker_handle_finalizer(
-    uintptr_t handle_as_int, UCXContext ctx, set inflight_msgs
+    uintptr_t handle_as_int,
+    UCXContext ctx,
+    set inflight_msgs,
+    list tag_probes,
+    uintptr_t queue_as_int
 ):
     assert ctx.initialized
     cdef ucp_worker_h handle = <ucp_worker_h>handle_as_int
+    cdef ucx_py_completion_queue *queue = <ucx_py_completion_queue*>queue_as_int
+
+    # Cancel all pending probes
+    cdef _TagProbe probe
+    for probe in list(tag_probes):
+        probe.cancel()
+    tag_probes.clear()
 
     # Cancel all inflight messages
     cdef UCXRequest req
-    cdef dict req_info
-    cdef str name
     for req in list(inflight_msgs):
         assert not req.closed()
-        req_info = <dict>req._handle.info
-        name = req_info["name"]
-        logger.debug("Future cancelling: %s" % name)
-        ucp_request_cancel(handle, <void*>req._handle)
-
-    ucp_worker_destroy(handle)
+        logger.debug("Future cancelling: %s" % <str>req._handle.name)
+        with nogil:
+            ucp_request_cancel(handle, <void*>req._handle)
+    _drain_completion_queue(queue)
+
+    # Requests completed while destroying the worker invoke their call-back
+    # functions directly
+    pthread_mutex_lock(&queue.lock)
+    free(queue.ring)
+    queue.ring = NULL
+    pthread_mutex_unlock(&queue.lock)
+    with nogil:
+        ucp_worker_destroy(handle)
+    pthread_mutex_destroy(&queue.lock)
+    free(queue)
 
 
 cdef class UCXWorker(UCXObject):
@@ -378,6 +491,9 @@ cdef class UCXWorker(UCXObject):
         ucp_worker_h _handle
         UCXContext _context
         set _inflight_msgs
+        list _tag_probes
+        dict _am_handlers
+        ucx_py_completion_queue *_queue
 
     def __init__(self, UCXContext context):
         cdef ucp_params_t ucp_params
@@ -391,15 +507,67 @@ cdef class UCXWorker(UCXObject):
         status = ucp_worker_create(context._handle, &worker_params, &self._handle)
         assert_ucs_status(status)
         self._inflight_msgs = set()
+        self._tag_probes = []
+        self._am_handlers = {}
+        self._queue = <ucx_py_completion_queue*>malloc(
+            sizeof(ucx_py_completion_queue)
+        )
+        if self._queue == NULL:
+            with nogil:
+                ucp_worker_destroy(self._handle)
+            raise MemoryError("Failed allocation of the completion queue")
+        memset(self._queue, 0, sizeof(ucx_py_completion_queue))
+        pthread_mutex_init(&self._queue.lock, NULL)
 
         self.add_handle_finalizer(
             _ucx_worker_handle_finalizer,
             int(<uintptr_t>self._handle),
             self._context,
-            self._inflight_msgs
+            self._inflight_msgs,
+            self._tag_probes,
+            int(<uintptr_t>self._queue)
         )
         context.add_child(self)
 
+    def init_completion_queue(self, size_t size=4096):
+        """Enable the completion queue mode
+
+        In completion queue mode, the UCX call-back functions of the requests
+        posted hereafter only record the completed requests in a ring buffer
+        without acquiring the GIL. `progress()` then invokes the call-back
+        functions of all completed requests in one pass after UCX has been
+        progressed. If the ring buffer is full, the call-back functions are
+        invoked directly.
+
+        Parameters
+        ----------
+        size: int, optional
+            The capacity of the ring buffer, which is rounded up to a power of 2
+        """
+        assert self.initialized
+        if self._queue.ring != NULL:
+            raise ValueError("The completion queue is already initialized")
+        if size == 0:
+            raise ValueError("The size of the completion queue must be positive")
+        cdef size_t capacity = 1
+        while capacity < size:
+            capacity <<= 1
+        cdef ucx_py_request **ring = <ucx_py_request**>malloc(
+            capacity * sizeof(ucx_py_request*)
+        )
+        if ring == NULL:
+            raise MemoryError("Failed allocation of the completion queue")
+        pthread_mutex_lock(&self._queue.lock)
+        self._queue.mask = capacity - 1
+        self._queue.ring = ring
+        pthread_mutex_unlock(&self._queue.lock)
+
+    @property
+    def completion_queue_size(self):
+        """The capacity of the completion queue or zero when it is disabled"""
+        assert self.initialized
+        return 0 if self._queue.ring == NULL else self._queue.mask + 1
+
     def init_blocking_progress_mode(self):
         assert self.initialized
         # In blocking progress mode, we create an epoll file
@@ -427,7 +595,8 @@ cdef class UCXWorker(UCXObject):
     cpdef bint arm(self) except *:
         assert self.initialized
         cdef ucs_status_t status
-        status = ucp_worker_arm(self._handle)
+        with nogil:
+            status = ucp_worker_arm(self._handle)
         if status == UCS_ERR_BUSY:
             return False
         assert_ucs_status(status)
@@ -439,10 +608,77 @@ cdef class UCXWorker(UCXObject):
 
         Warning, it is illegal to call this from a call-back function such as
         the call-back function given to UCXListener, tag_send_nb, and tag_recv_nb.
+
+        Returns
+        -------
+        int
+            The number of communication events progressed, which is zero
+            if there was nothing to progress.
         """
         assert self.initialized
-        while ucp_worker_progress(self._handle) != 0:
-            pass
+        cdef unsigned n
+        cdef Py_ssize_t count = 0
+        # Notice, the GIL is released since a progress thread might be
+        # progressing the worker concurrently (see `ThreadMode`)
+        with nogil:
+            while True:
+                n = ucp_worker_progress(self._handle)
+                if n == 0:
+                    break
+                count += n
+        if self._queue.ring != NULL:
+            _drain_completion_queue(self._queue)
+        # New messages only arrive when the worker progresses thus the pending
+        # probes are only retried then
+        if count > 0 and self._tag_probes:
+            count += self._progress_tag_probes()
+        return count
+
+    cdef Py_ssize_t _progress_tag_probes(
+        self, _TagProbe overlapping=None
+    ) except -1:
+        """Retry the pending probes of `tag_recv_probe_nb()` in posting order
+
+        If `overlapping` is given, only the probes that might match the same
+        messages as `overlapping` are retried.
+
+        Returns the number of matched probes
+        """
+        cdef _TagProbe probe
+        cdef Py_ssize_t matched = 0
+        # Notice, `try_recv()` releases the GIL thus probes might be posted or
+        # cancelled concurrently by another thread (see `ThreadMode`)
+        for probe in tuple(self._tag_probes):
+            if not probe.pending:
+                continue  # Cancelled or matched by another thread
+            if overlapping is not None and not _tag_probes_overlap(
+                probe, overlapping
+            ):
+                continue
+            if probe.try_recv(self):
+                probe.pending = False
+                matched += 1
+        if matched:
+            self._tag_probes[:] = [
+                probe for probe in self._tag_probes if probe.pending
+            ]
+        return matched
+
+    cpdef void _cancel_tag_probes(self, set inflight_msgs) except *:
+        """Cancel the pending probes registered at `inflight_msgs`"""
+        cdef _TagProbe probe
+        cdef list cancelled = [
+            probe for probe in self._tag_probes
+            if probe.inflight_msgs is inflight_msgs
+        ]
+        # The probes are removed before calling their call-back functions
+        for probe in cancelled:
+            probe.pending = False
+        self._tag_probes[:] = [
+            probe for probe in self._tag_probes if probe.pending
+        ]
+        for probe in cancelled:
+            probe.cancel()
 
     @property
     def handle(self):
@@ -455,7 +691,69 @@ cdef class UCXWorker(UCXObject):
 
         # Notice, `ucp_request_cancel()` calls the send/recv callback function,
         # which will handle the request cleanup.
-        ucp_request_cancel(self._handle, req._handle)
+        with nogil:
+            ucp_request_cancel(self._handle, req._handle)
+        if self._queue.ring != NULL:
+            _drain_completion_queue(self._queue)
+
+    def am_register_handler(
+        self,
+        uint16_t am_id,
+        cb_func,
+        tuple cb_args=None,
+        dict cb_kwargs=None
+    ):
+        """Register a call-back function for Active Messages with the ID `am_id`
+
+        The call-back function is called with a read-only memoryview of the
+        message as the first argument. The memoryview is only valid during the
+        call thus the call-back function must copy the data it wants to keep.
+        Registering a handler for an ID replaces the previous handler.
+
+        Warning, like other call-back functions, the call-back function is
+        called while the worker progresses and must not progress the worker.
+
+        Parameters
+        ----------
+        am_id: int
+            The Active Message ID
+        cb_func: callable or None
+            The call-back function, which must accept the message as the first
+            argument. Use None to remove the handler.
+        cb_args: tuple, optional
+            Extra arguments to the call-back function
+        cb_kwargs: dict, optional
+            Extra keyword arguments to the call-back function
+        """
+        assert self.initialized
+        if Feature.AM not in self._context._feature_flags:
+            raise ValueError("UCXContext must be created with `Feature.AM`")
+        if cb_args is None:
+            cb_args = ()
+        if cb_kwargs is None:
+            cb_kwargs = {}
+        cdef ucs_status_t status
+        cdef tuple handler
+        if cb_func is None:
+            with nogil:
+                status = ucp_worker_set_am_handler(
+                    self._handle, am_id, NULL, NULL, UCP_AM_FLAG_WHOLE_MSG
+                )
+            assert_ucs_status(status)
+            self._am_handlers.pop(am_id, None)
+            return
+        # The worker keeps `handler` alive, which is given to UCX as `arg`
+        handler = (cb_func, cb_args, cb_kwargs)
+        with nogil:
+            status = ucp_worker_set_am_handler(
+                self._handle,
+                am_id,
+                <ucp_am_callback_t>_am_recv_callback,
+                <void*>handler,
+                UCP_AM_FLAG_WHOLE_MSG
+            )
+        assert_ucs_status(status)
+        self._am_handlers[am_id] = handler
 
     def ep_create(self, str ip_address, uint16_t port, bint endpoint_error_handling):
         assert self.initialized
@@ -482,7 +780,9 @@ cdef class UCXWorker(UCXObject):
             raise MemoryError("Failed allocation of sockaddr")
 
         cdef ucp_ep_h ucp_ep
-        cdef ucs_status_t status = ucp_ep_create(self._handle, &params, &ucp_ep)
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_ep_create(self._handle, &params, &ucp_ep)
         c_util_sockaddr_free(&params.sockaddr)
         assert_ucs_status(status)
         return UCXEndpoint(self, <uintptr_t>ucp_ep)
@@ -509,7 +809,9 @@ cdef class UCXWorker(UCXObject):
         params.address = address._address
 
         cdef ucp_ep_h ucp_ep
-        cdef ucs_status_t status = ucp_ep_create(self._handle, &params, &ucp_ep)
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_ep_create(self._handle, &params, &ucp_ep)
         assert_ucs_status(status)
         return UCXEndpoint(self, <uintptr_t>ucp_ep)
 
@@ -538,12 +840,16 @@ cdef class UCXWorker(UCXObject):
         params.conn_request = <ucp_conn_request_h> conn_request
 
         cdef ucp_ep_h ucp_ep
-        cdef ucs_status_t status = ucp_ep_create(self._handle, &params, &ucp_ep)
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_ep_create(self._handle, &params, &ucp_ep)
         assert_ucs_status(status)
         return UCXEndpoint(self, <uintptr_t>ucp_ep)
 
     cpdef ucs_status_t fence(self) except *:
-        cdef ucs_status_t status = ucp_worker_fence(self._handle)
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_worker_fence(self._handle)
         assert_ucs_status(status)
         return status
 
@@ -555,9 +861,11 @@ cdef class UCXWorker(UCXObject):
         cdef ucs_status_ptr_t req
         cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
 
-        cdef ucs_status_ptr_t status = ucp_worker_flush_nb(self._handle, 0, _send_cb)
+        cdef ucs_status_ptr_t status
+        with nogil:
+            status = ucp_worker_flush_nb(self._handle, 0, _send_cb)
         return _handle_status(
-            status, 0, cb_func, cb_args, cb_kwargs, 'flush', self._inflight_msgs
+            status, 0, cb_func, cb_args, cb_kwargs, 'flush', self._inflight_msgs, self
         )
 
     def get_address(self):
@@ -567,7 +875,8 @@ cdef class UCXWorker(UCXObject):
         assert self.initialized
 
         cdef FILE *text_fd = create_text_fd()
-        ucp_worker_print_info(self._handle, text_fd)
+        with nogil:
+            ucp_worker_print_info(self._handle, text_fd)
         return decode_text_fd(text_fd)
 
 
@@ -598,12 +907,14 @@ cdef class UCXAddress:
         cdef ucp_worker_h ucp_worker = worker._handle
         cdef ucp_address_t *address
         cdef size_t length
-        status = ucp_worker_get_address(ucp_worker, &address, &length)
+        with nogil:
+            status = ucp_worker_get_address(ucp_worker, &address, &length)
         assert_ucs_status(status)
         try:
             return UCXAddress(int(<uintptr_t>address), length)
         finally:
-            ucp_worker_release_address(ucp_worker, address)
+            with nogil:
+                ucp_worker_release_address(ucp_worker, address)
 
     @property
     def address(self):
@@ -649,26 +960,32 @@ def _ucx_endpoint_finalizer(uintptr_t handle_as_int, worker, set inflight_msgs):
     cdef ucp_ep_h handle = <ucp_ep_h>handle_as_int
     cdef ucs_status_ptr_t status
 
+    # Cancel all pending probes
+    worker._cancel_tag_probes(inflight_msgs)
+
     # Cancel all inflight messages
     cdef UCXRequest req
-    cdef dict req_info
-    cdef str name
     for req in list(inflight_msgs):
         assert not req.closed()
-        req_info = <dict>req._handle.info
-        name = req_info["name"]
-        logger.debug("Future cancelling: %s" % name)
+        logger.debug("Future cancelling: %s" % <str>req._handle.name)
         # Notice, `request_cancel()` evoke the send/recv callback functions
         worker.request_cancel(req)
 
     # Close the endpoint
     # TODO: Support UCP_EP_CLOSE_MODE_FORCE
     cdef str msg
-    status = ucp_ep_close_nb(handle, UCP_EP_CLOSE_MODE_FLUSH)
+    with nogil:
+        status = ucp_ep_close_nb(handle, UCP_EP_CLOSE_MODE_FLUSH)
+    cdef ucs_status_t req_status
     if UCS_PTR_IS_PTR(status):
-        while ucp_request_check_status(status) == UCS_INPROGRESS:
+        while True:
+            with nogil:
+                req_status = ucp_request_check_status(status)
+            if req_status != UCS_INPROGRESS:
+                break
             worker.progress()
-        ucp_request_free(status)
+        with nogil:
+            ucp_request_free(status)
     elif UCS_PTR_STATUS(status) != UCS_OK:
         msg = ucs_status_string(UCS_PTR_STATUS(status)).decode("utf-8")
         raise UCXError("Error while closing endpoint: %s" % msg)
@@ -702,7 +1019,8 @@ cdef class UCXEndpoint(UCXObject):
         assert self.initialized
 
         cdef FILE *text_fd = create_text_fd()
-        ucp_ep_print_info(self._handle, text_fd)
+        with nogil:
+            ucp_ep_print_info(self._handle, text_fd)
         return decode_text_fd(text_fd)
 
     @property
@@ -718,13 +1036,159 @@ cdef class UCXEndpoint(UCXObject):
         cdef ucs_status_ptr_t req
         cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
 
-        cdef ucs_status_ptr_t status = ucp_ep_flush_nb(self._handle, 0, _send_cb)
+        cdef ucs_status_ptr_t status
+        with nogil:
+            status = ucp_ep_flush_nb(self._handle, 0, _send_cb)
         return _handle_status(
-            status, 0, cb_func, cb_args, cb_kwargs, 'flush', self._inflight_msgs
+            status, 0, cb_func, cb_args, cb_kwargs, 'flush', self._inflight_msgs,
+            self.worker
+        )
+
+
+def _ucx_mem_handle_finalizer(uintptr_t handle_as_int, UCXContext ctx):
+    assert ctx.initialized
+    cdef ucp_context_h ctx_handle = ctx._handle
+    cdef ucs_status_t status
+    with nogil:
+        status = ucp_mem_unmap(ctx_handle, <ucp_mem_h>handle_as_int)
+    assert_ucs_status(status)
+
+
+cdef class UCXMemoryHandle(UCXObject):
+    """Python representation of `ucp_mem_h`
+
+    Registers (maps) a buffer for remote memory access. The buffer is kept
+    alive until the memory handle is closed.
+
+    Parameters
+    ----------
+    context: UCXContext
+        The context to register the buffer at
+    buffer: Array
+        The buffer to register, which must be contiguous and writable
+    """
+    cdef:
+        ucp_mem_h _handle
+        UCXContext _context
+        Array _buffer
+
+    def __init__(self, UCXContext context, Array buffer):
+        assert context.initialized
+        if Feature.RMA not in context._feature_flags:
+            raise ValueError("UCXContext must be created with `Feature.RMA`")
+        if buffer.readonly:
+            raise ValueError("Cannot register a readonly buffer")
+        if not buffer._contiguous():
+            raise ValueError("Array must be C or F contiguous")
+        self._context = context
+        self._buffer = buffer
+        cdef ucp_mem_map_params_t params
+        memset(&params, 0, sizeof(params))
+        params.field_mask = (
+            UCP_MEM_MAP_PARAM_FIELD_ADDRESS |
+            UCP_MEM_MAP_PARAM_FIELD_LENGTH
+        )
+        params.address = <void*>buffer.ptr
+        params.length = buffer._nbytes()
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_mem_map(
+                context._handle, &params, &self._handle
+            )
+        assert_ucs_status(status)
+        self.add_handle_finalizer(
+            _ucx_mem_handle_finalizer, int(<uintptr_t>self._handle), context
         )
+        context.add_child(self)
+
+    @property
+    def handle(self):
+        assert self.initialized
+        return int(<uintptr_t>self._handle)
+
+    @property
+    def address(self):
+        """The address of the registered buffer"""
+        return int(self._buffer.ptr)
+
+    @property
+    def length(self):
+        """The size of the registered buffer in bytes"""
+        return int(self._buffer._nbytes())
+
+    @property
+    def buffer(self):
+        """The registered buffer"""
+        return self._buffer.obj
+
+    def pack_rkey(self):
+        """Pack the remote key of the registered buffer
+
+        Returns
+        -------
+        bytes
+            The packed remote key, which a peer unpacks with `UCXRkey`
+        """
+        assert self.initialized
+        cdef void *rkey_buffer
+        cdef size_t size
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_rkey_pack(
+                self._context._handle, self._handle, &rkey_buffer, &size
+            )
+        assert_ucs_status(status)
+        try:
+            return (<char*>rkey_buffer)[:size]
+        finally:
+            ucp_rkey_buffer_release(rkey_buffer)
+
 
+def _ucx_rkey_finalizer(uintptr_t handle_as_int, UCXEndpoint ep):
+    with nogil:
+        ucp_rkey_destroy(<ucp_rkey_h>handle_as_int)
 
-cdef void _listener_callback(ucp_conn_request_h conn_request, void *args):
+
+cdef class UCXRkey(UCXObject):
+    """Python representation of `ucp_rkey_h`
+
+    The remote key of a buffer registered by a peer, which is only valid
+    for the endpoint it was unpacked at.
+
+    Parameters
+    ----------
+    ep: UCXEndpoint
+        The endpoint connected to the peer that packed the remote key
+    rkey_buffer: bytes-like
+        The packed remote key (see `UCXMemoryHandle.pack_rkey()`)
+    """
+    cdef:
+        ucp_rkey_h _handle
+
+    cdef readonly:
+        UCXEndpoint ep
+
+    def __init__(self, UCXEndpoint ep, rkey_buffer):
+        assert ep.initialized
+        cdef Array buf = Array(rkey_buffer)
+        assert buf.c_contiguous
+        self.ep = ep
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_ep_rkey_unpack(
+                ep._handle, <void*>buf.ptr, &self._handle
+            )
+        assert_ucs_status(status)
+        self.add_handle_finalizer(_ucx_rkey_finalizer, int(<uintptr_t>self._handle), ep)
+        ep.add_child(self)
+
+    @property
+    def handle(self):
+        assert self.initialized
+        return int(<uintptr_t>self._handle)
+
+
+cdef void _listener_callback(ucp_conn_request_h conn_request, void *args) with gil:
     """Callback function used by UCXListener"""
     cdef dict cb_data = <dict> args
 
@@ -737,7 +1201,8 @@ cdef void _listener_callback(ucp_conn_request_h conn_request, void *args):
 
 
 def _ucx_listener_handle_finalizer(uintptr_t handle):
-    ucp_listener_destroy(<ucp_listener_h> handle)
+    with nogil:
+        ucp_listener_destroy(<ucp_listener_h> handle)
 
 
 cdef class UCXListener(UCXObject):
@@ -808,16 +1273,19 @@ cdef class UCXListener(UCXObject):
         if c_util_set_sockaddr(&params.sockaddr, NULL, port):
             raise MemoryError("Failed allocation of sockaddr")
 
-        cdef ucs_status_t status = ucp_listener_create(
-            worker._handle, &params, &self._handle
-        )
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_listener_create(
+                worker._handle, &params, &self._handle
+            )
         c_util_sockaddr_free(&params.sockaddr)
         assert_ucs_status(status)
 
         attr.field_mask = UCP_LISTENER_ATTR_FIELD_SOCKADDR
-        status = ucp_listener_query(self._handle, &attr)
-        if status != UCS_OK:
-            ucp_listener_destroy(self._handle)
+        with nogil:
+            status = ucp_listener_query(self._handle, &attr)
+            if status != UCS_OK:
+                ucp_listener_destroy(self._handle)
         assert_ucs_status(status)
 
         DEF MAX_STR_LEN = 50
@@ -842,6 +1310,20 @@ cdef class UCXListener(UCXObject):
         assert self.initialized
         return int(<uintptr_t>self._handle)
 
+    def reject(self, uintptr_t conn_request):
+        """Reject an incoming connection request
+
+        The client sees its endpoint fail to connect. Notice, the
+        connection request must not be used after rejection.
+        """
+        assert self.initialized
+        cdef ucs_status_t status
+        with nogil:
+            status = ucp_listener_reject(
+                self._handle, <ucp_conn_request_h>conn_request
+            )
+        assert_ucs_status(status)
+
 
 cdef class UCXRequest:
     """Python wrapper of UCX request handle.
@@ -864,16 +1346,12 @@ cdef class UCXRequest:
         assert req != NULL
         self._handle = req
 
-        cdef dict info = {"status": "pending"}
-        if self._handle.info == NULL:  # First time we are wrapping this UCX request
-            Py_INCREF(info)
-            self._handle.info = <PyObject*> info
+        if req.uid == 0:  # First time we are wrapping this UCX request
             _ucx_py_request_counter += 1
-            self._uid = _ucx_py_request_counter
-            assert self._handle.uid == 0
-            self._handle.uid = _ucx_py_request_counter
-        else:
-            self._uid = self._handle.uid
+            if _ucx_py_request_counter == 0:  # Zero is reserved for unwrapped
+                _ucx_py_request_counter = 1
+            req.uid = _ucx_py_request_counter
+        self._uid = req.uid
 
     cpdef bint closed(self):
         return self._handle == NULL or self._uid != self._handle.uid
@@ -884,17 +1362,39 @@ cdef class UCXRequest:
         this request will make progress internally, however no further notifications or
         callbacks will be invoked for this request. """
 
+        cdef ucx_py_request *req
         if not self.closed():
-            Py_DECREF(<object>self._handle.info)
-            self._handle.info = NULL
-            self._handle.uid = 0
-            ucp_request_free(self._handle)
+            req = self._handle
             self._handle = NULL
+            ucx_py_request_clear(req)
+            # Freeing takes the worker lock, which the progress thread might
+            # hold while waiting for the GIL
+            with nogil:
+                ucp_request_free(req)
 
     @property
     def info(self):
+        """A dict describing the state of the request, created on demand"""
+        assert not self.closed()
+        cdef ucx_py_request *req = self._handle
+        cdef dict ret = {"status": "finished" if req.completed else "pending"}
+        if req.name != NULL:
+            ret["name"] = <str>req.name
+            ret["expected_receive"] = req.expected_receive
+        if req.completed and req.received != -1:
+            ret["received"] = req.received
+            ret["sender_tag"] = req.sender_tag
+        return ret
+
+    @property
+    def sender_tag(self):
+        """The tag of the message matched by a finished tag receive
+
+        Use this in the call-back function of `tag_recv_nb()` to find the
+        actual tag of the message when receiving with a `tag_mask`.
+        """
         assert not self.closed()
-        return <dict> self._handle.info
+        return int(self._handle.sender_tag)
 
     @property
     def handle(self):
@@ -927,7 +1427,8 @@ cdef UCXRequest _handle_status(
     cb_args,
     cb_kwargs,
     unicode name,
-    set inflight_msgs
+    set inflight_msgs,
+    UCXWorker worker
 ):
     if UCS_PTR_STATUS(status) == UCS_OK:
         return
@@ -938,16 +1439,18 @@ cdef UCXRequest _handle_status(
         )
         msg = "<%s>: %s" % (name, ucx_status_msg)
         raise UCXError(msg)
+    # Notice, no Python code is executed from here until the request has been
+    # registered thus the call-back function, which requires the GIL, cannot
+    # run concurrently in a progress thread (see `ThreadMode`)
     cdef UCXRequest req = UCXRequest(<uintptr_t><void*> status)
     assert not req.closed()
-    cdef dict req_info = <dict>req._handle.info
-    if req_info["status"] == "finished":
+    cdef ucx_py_request *handle = req._handle
+    if handle.completed:
         try:
             # The callback function has already handled the request
-            received = req_info.get("received", None)
-            if received is not None and received != expected_receive:
+            if handle.received != -1 and handle.received != expected_receive:
                 msg = "<%s>: length mismatch: %d (got) != %d (expected)" % (
-                    name, received, expected_receive
+                    name, handle.received, expected_receive
                 )
                 raise UCXMsgTruncated(msg)
             else:
@@ -956,57 +1459,100 @@ cdef UCXRequest _handle_status(
         finally:
             req.close()
     else:
-        req_info["cb_func"] = cb_func
-        req_info["cb_args"] = cb_args
-        req_info["cb_kwargs"] = cb_kwargs
-        req_info["expected_receive"] = expected_receive
-        req_info["name"] = name
+        if cb_args is None:
+            cb_args = ()
+        if cb_kwargs is None:
+            cb_kwargs = {}
+        Py_INCREF(cb_func)
+        handle.cb_func = <PyObject*>cb_func
+        Py_INCREF(cb_args)
+        handle.cb_args = <PyObject*>cb_args
+        Py_INCREF(cb_kwargs)
+        handle.cb_kwargs = <PyObject*>cb_kwargs
+        Py_INCREF(name)
+        handle.name = <PyObject*>name
+        Py_INCREF(inflight_msgs)
+        handle.inflight_msgs = <PyObject*>inflight_msgs
+        Py_INCREF(req)
+        handle.py_req = <PyObject*>req
+        handle.expected_receive = expected_receive
         inflight_msgs.add(req)
-        req_info["inflight_msgs"] = inflight_msgs
+        # Notice, the queue is set last since the UCX call-back function reads
+        # it without holding the GIL
+        handle.queue = worker._queue
         return req
 
 
-cdef void _send_callback(void *request, ucs_status_t status):
-    cdef UCXRequest req
-    cdef dict req_info
-    cdef str name, ucx_status_msg, msg
-    cdef set inflight_msgs
-    cdef tuple cb_args
-    cdef dict cb_kwargs
-    with log_errors():
-        req = UCXRequest(<uintptr_t><void*> request)
-        assert not req.closed()
-        req_info = <dict>req._handle.info
-        req_info["status"] = "finished"
+cdef void _request_completed(
+    ucx_py_request *handle, ucs_status_t status, int64_t received
+) except *:
+    """Common part of the UCX call-back functions
 
-        if "cb_func" not in req_info:
-            # This callback function was called before ucp_tag_send_nb() returned
-            return
+    Records the outcome of the request and, if the request has been registered
+    by `_handle_status()`, invokes the user call-back function and closes
+    the request.
+    """
+    handle.completed = True
+    handle.status = status
+    handle.received = received
 
-        exception = None
-        if status == UCS_ERR_CANCELED:
-            name = req_info["name"]
-            msg = "<%s>: " % name
-            exception = UCXCanceled(msg)
-        elif status != UCS_OK:
-            name = req_info["name"]
-            ucx_status_msg = ucs_status_string(status).decode("utf-8")
-            msg = "<%s>: %s" % (name, ucx_status_msg)
-            exception = UCXError(msg)
+    if handle.cb_func == NULL:
+        # This callback function was called before the request was registered
+        # by `_handle_status()`, which will handle the request
+        return
+
+    cdef UCXRequest req = <UCXRequest>handle.py_req
+    cdef str ucx_status_msg, msg
+    exception = None
+    if status == UCS_ERR_CANCELED:
+        msg = "<%s>: " % <str>handle.name
+        exception = UCXCanceled(msg)
+    elif status != UCS_OK:
+        ucx_status_msg = ucs_status_string(status).decode("utf-8")
+        msg = "<%s>: %s" % (<str>handle.name, ucx_status_msg)
+        exception = UCXError(msg)
+    elif received != -1 and received != handle.expected_receive:
+        msg = "<%s>: length mismatch: %d (got) != %d (expected)" % (
+            <str>handle.name, received, handle.expected_receive
+        )
+        exception = UCXMsgTruncated(msg)
+    try:
+        (<set>handle.inflight_msgs).discard(req)
+        cb_func = <object>handle.cb_func
+        if cb_func is not None:
+            cb_func(
+                req, exception, *<tuple>handle.cb_args, **<dict>handle.cb_kwargs
+            )
+    finally:
+        req.close()
+
+
+cdef Py_ssize_t _drain_completion_queue(ucx_py_completion_queue *queue) except -1:
+    """Invoke the call-back functions of the requests in the completion queue
+
+    Returns the number of completed requests
+    """
+    cdef ucx_py_request *req
+    cdef Py_ssize_t count = 0
+    while True:
+        req = ucx_py_completion_queue_pop(queue)
+        if req == NULL:
+            return count
+        count += 1
         try:
-            inflight_msgs = req_info["inflight_msgs"]
-            inflight_msgs.discard(req)
-            cb_func = req_info["cb_func"]
-            if cb_func is not None:
-                cb_args = req_info["cb_args"]
-                if cb_args is None:
-                    cb_args = ()
-                cb_kwargs = req_info["cb_kwargs"]
-                if cb_kwargs is None:
-                    cb_kwargs = {}
-                cb_func(req, exception, *cb_args, **cb_kwargs)
-        finally:
-            req.close()
+            _request_completed(req, req.status, req.received)
+        except BaseException as e:
+            logger.exception(e)
+
+
+cdef void _send_callback(void *request, ucs_status_t status) nogil:
+    if ucx_py_completion_queue_push(<ucx_py_request*>request, status, -1):
+        return
+    with gil:
+        try:
+            _request_completed(<ucx_py_request*>request, status, -1)
+        except BaseException as e:
+            logger.exception(e)
 
 
 def tag_send_nb(
@@ -1076,68 +1622,146 @@ def tag_send_nb(
     if not buffer._contiguous():
         raise ValueError("Array must be C or F contiguous")
     cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
-    cdef ucs_status_ptr_t status = ucp_tag_send_nb(
-        ep._handle,
-        <void*>buffer.ptr,
-        nbytes,
-        ucp_dt_make_contig(1),
-        tag,
-        _send_cb
-    )
+    cdef ucs_status_ptr_t status
+    with nogil:
+        status = ucp_tag_send_nb(
+            ep._handle,
+            <void*>buffer.ptr,
+            nbytes,
+            ucp_dt_make_contig(1),
+            tag,
+            _send_cb
+        )
     return _handle_status(
-        status, nbytes, cb_func, cb_args, cb_kwargs, name, ep._inflight_msgs
+        status, nbytes, cb_func, cb_args, cb_kwargs, name, ep._inflight_msgs, ep.worker
     )
 
 
-cdef void _tag_recv_callback(
-    void *request, ucs_status_t status, ucp_tag_recv_info_t *info
+cdef class _IOVector:
+    """A scatter-gather list of host buffers
+
+    The list must be kept alive until the operation using it completes.
+    """
+    cdef:
+        ucp_dt_iov_t *iov
+        size_t count
+        size_t nbytes
+        list buffers
+        object cb_func
+        tuple cb_args
+        dict cb_kwargs
+
+    def __cinit__(self):
+        self.iov = NULL
+
+    def __init__(self, buffers):
+        self.buffers = list(buffers)
+        self.count = len(self.buffers)
+        self.nbytes = 0
+        self.iov = <ucp_dt_iov_t*>malloc(sizeof(ucp_dt_iov_t) * max(self.count, 1))
+        if self.iov == NULL:
+            raise MemoryError()
+        cdef Array buf
+        cdef size_t i
+        for i in range(self.count):
+            buf = self.buffers[i]
+            if buf.cuda:
+                raise ValueError("Scatter-gather lists only support host memory")
+            if not buf._contiguous():
+                raise ValueError("Array must be C or F contiguous")
+            self.iov[i].buffer = <void*>buf.ptr
+            self.iov[i].length = buf._nbytes()
+            self.nbytes += self.iov[i].length
+
+    def __dealloc__(self):
+        free(self.iov)
+
+
+def _iov_callback(request, exception, _IOVector iov):
+    iov.cb_func(request, exception, *iov.cb_args, **iov.cb_kwargs)
+
+
+def tag_send_iov_nb(
+    UCXEndpoint ep,
+    buffers,
+    ucp_tag_t tag,
+    cb_func,
+    tuple cb_args=None,
+    dict cb_kwargs=None,
+    str name=None
 ):
-    cdef UCXRequest req
-    cdef dict req_info
-    cdef str name, ucx_status_msg, msg
-    cdef set inflight_msgs
-    cdef tuple cb_args
-    cdef dict cb_kwargs
-    with log_errors():
-        req = UCXRequest(<uintptr_t><void*> request)
-        assert not req.closed()
-        req_info = <dict>req._handle.info
-        req_info["status"] = "finished"
+    """ This routine sends a scatter-gather list of buffers as one message
 
-        if "cb_func" not in req_info:
-            # This callback function was called before ucp_tag_recv_nb() returned
-            return
+    The buffers are sent back to back as a single message to the destination
+    endpoint, which receives them into one contiguous buffer. The routine is
+    non-blocking and therefore returns immediately, however the actual send
+    operation may be delayed. The send operation is considered completed when
+    it is safe to reuse the source buffers.
 
-        exception = None
-        if status == UCS_ERR_CANCELED:
-            name = req_info["name"]
-            msg = "<%s>: " % name
-            exception = UCXCanceled(msg)
-        elif status != UCS_OK:
-            name = req_info["name"]
-            ucx_status_msg = ucs_status_string(status).decode("utf-8")
-            msg = "<%s>: %s" % (name, ucx_status_msg)
-            exception = UCXError(msg)
-        elif info.length != <size_t>req_info["expected_receive"]:
-            name = req_info["name"]
-            msg = "<%s>: length mismatch: %d (got) != %d (expected)" % (
-                name, info.length, req_info["expected_receive"]
-            )
-            exception = UCXMsgTruncated(msg)
+    Note
+    ----
+    Only host memory is supported.
+
+    Parameters
+    ----------
+    ep: UCXEndpoint
+        The destination endpoint
+    buffers: sequence of Array
+        The buffers to send
+    tag: int
+        The tag of the message
+    cb_func: callable
+        The call-back function, which must accept `request` and `exception` as the
+        first two arguments.
+    cb_args: tuple, optional
+        Extra arguments to the call-back function
+    cb_kwargs: dict, optional
+        Extra keyword arguments to the call-back function
+    name: str, optional
+        Descriptive name of the operation
+    """
+    if cb_args is None:
+        cb_args = ()
+    if cb_kwargs is None:
+        cb_kwargs = {}
+    if name is None:
+        name = "tag_send_iov_nb"
+    if Feature.TAG not in ep.worker._context._feature_flags:
+        raise ValueError("UCXContext must be created with `Feature.TAG`")
+    cdef _IOVector iov = _IOVector(buffers)
+    iov.cb_func = cb_func
+    iov.cb_args = cb_args
+    iov.cb_kwargs = cb_kwargs
+    cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
+    cdef ucs_status_ptr_t status
+    with nogil:
+        status = ucp_tag_send_nb(
+            ep._handle,
+            <void*>iov.iov,
+            iov.count,
+            ucp_dt_make_iov(),
+            tag,
+            _send_cb
+        )
+    # Notice, `iov` is given to the call-back function in order to keep
+    # it alive until the send finishes
+    return _handle_status(
+        status, iov.nbytes, _iov_callback, (iov,), {}, name, ep._inflight_msgs,
+        ep.worker
+    )
+
+
+cdef void _tag_recv_callback(
+    void *request, ucs_status_t status, ucp_tag_recv_info_t *info
+) nogil:
+    (<ucx_py_request*>request).sender_tag = info.sender_tag
+    if ucx_py_completion_queue_push(<ucx_py_request*>request, status, info.length):
+        return
+    with gil:
         try:
-            inflight_msgs = req_info["inflight_msgs"]
-            inflight_msgs.discard(req)
-            cb_func = req_info["cb_func"]
-            if cb_func is not None:
-                cb_args = req_info["cb_args"]
-                if cb_args is None:
-                    cb_args = ()
-                cb_kwargs = req_info["cb_kwargs"]
-                if cb_kwargs is None:
-                    cb_kwargs = {}
-                cb_func(req, exception, *cb_args, **cb_kwargs)
-        finally:
-            req.close()
+            _request_completed(<ucx_py_request*>request, status, info.length)
+        except BaseException as e:
+            logger.exception(e)
 
 
 def tag_recv_nb(
@@ -1183,7 +1807,9 @@ def tag_recv_nb(
         first two arguments.
     tag_mask: int, optional
         Bit mask that indicates the bits that are used for the matching of the
-        incoming tag against the expected tag.
+        incoming tag against the expected tag. The actual tag of the matched
+        message is available through `request.sender_tag` in the call-back
+        function.
     cb_args: tuple, optional
         Extra arguments to the call-back function
     cb_kwargs: dict, optional
@@ -1225,27 +1851,754 @@ def tag_recv_nb(
     cdef ucp_tag_recv_callback_t _tag_recv_cb = (
         <ucp_tag_recv_callback_t>_tag_recv_callback
     )
-    cdef ucs_status_ptr_t status = ucp_tag_recv_nb(
-        worker._handle,
-        <void*>buffer.ptr,
-        nbytes,
-        ucp_dt_make_contig(1),
-        tag,
-        -1,
-        _tag_recv_cb
-    )
+    cdef ucs_status_ptr_t status
+    with nogil:
+        status = ucp_tag_recv_nb(
+            worker._handle,
+            <void*>buffer.ptr,
+            nbytes,
+            ucp_dt_make_contig(1),
+            tag,
+            tag_mask,
+            _tag_recv_cb
+        )
     cdef set inflight_msgs = (
         worker._inflight_msgs if ep is None else ep._inflight_msgs
     )
     return _handle_status(
-        status, nbytes, cb_func, cb_args, cb_kwargs, name, inflight_msgs
+        status, nbytes, cb_func, cb_args, cb_kwargs, name, inflight_msgs, worker
     )
 
 
-def stream_send_nb(
+cdef class UCXRequestBatch:
+    """Completion state of a batch of requests posted by a single call.
+
+    Don't create this class directly, `tag_send_nb_many()` and
+    `tag_recv_nb_many()` return UCXRequestBatch objects.
+
+    The batch counts the requests that haven't finished yet and invokes the
+    user call-back function once, when the last of them finishes. The
+    exception given to the call-back function is the first exception raised
+    by any of the requests in the batch.
+    """
+    cdef:
+        Py_ssize_t _pending
+        object _exception
+        object _cb_func
+        tuple _cb_args
+        dict _cb_kwargs
+
+    def __init__(self, cb_func, tuple cb_args, dict cb_kwargs):
+        # `_pending` starts at one, which is released by `_seal()` when all
+        # requests have been posted. This makes sure that the call-back
+        # function isn't invoked while we are still posting requests.
+        self._pending = 1
+        self._exception = None
+        self._cb_func = cb_func
+        self._cb_args = cb_args
+        self._cb_kwargs = cb_kwargs
+
+    cdef void _add(self):
+        self._pending += 1
+
+    cdef void _done(self, exception) except *:
+        if exception is not None and self._exception is None:
+            self._exception = exception
+        self._pending -= 1
+        if self._pending == 0 and self._cb_func is not None:
+            self._cb_func(self, self._exception, *self._cb_args, **self._cb_kwargs)
+
+    cdef bint _seal(self) except *:
+        """Release the posting guard
+
+        Returns True if some requests are still in flight, in which case the
+        call-back function will be invoked later. Returns False if all
+        requests have finished, in which case the call-back function
+        **is not invoked** and the first exception (if any) is raised.
+        """
+        self._pending -= 1
+        if self._pending > 0:
+            return True
+        if self._exception is not None:
+            raise self._exception
+        return False
+
+    @property
+    def pending(self):
+        """Number of requests in the batch that haven't finished yet"""
+        return int(self._pending)
+
+
+def _request_batch_callback(request, exception, UCXRequestBatch batch):
+    batch._done(exception)
+
+
+cdef tuple _fill_batch_arrays(
+    buffers, nbytes, tags, bint writable, bint cuda_support,
+    uintptr_t **ptrs, size_t **sizes, ucp_tag_t **ucp_tags
+):
+    """Validate `buffers` and copy the pointers, sizes, and tags of a batch
+    into newly allocated C arrays, which must be freed by the caller.
+
+    Returns the tuple of `Array`s, which must be kept alive while the
+    arrays are in use.
+    """
+    cdef tuple arrays = tuple(buffers)
+    cdef Py_ssize_t n = len(arrays)
+    cdef Py_ssize_t i
+    cdef Array buf
+    if len(nbytes) != n or len(tags) != n:
+        raise ValueError("`buffers`, `nbytes`, and `tags` must have the same length")
+
+    ptrs[0] = <uintptr_t*>malloc(sizeof(uintptr_t) * n)
+    sizes[0] = <size_t*>malloc(sizeof(size_t) * n)
+    ucp_tags[0] = <ucp_tag_t*>malloc(sizeof(ucp_tag_t) * n)
+    if n > 0 and (ptrs[0] == NULL or sizes[0] == NULL or ucp_tags[0] == NULL):
+        free(ptrs[0])
+        free(sizes[0])
+        free(ucp_tags[0])
+        raise MemoryError("Failed allocation of the batch arrays")
+
+    try:
+        for i in range(n):
+            buf = arrays[i]
+            if writable and buf.readonly:
+                raise ValueError("writing to readonly buffer!")
+            if buf.cuda and not cuda_support:
+                raise ValueError(
+                    "UCX is not configured with CUDA support, please add "
+                    "`cuda_copy` and/or `cuda_ipc` to the UCX_TLS environment"
+                    "variable and that the ucx-proc=*=gpu package is "
+                    "installed. See "
+                    "https://ucx-py.readthedocs.io/en/latest/install.html for "
+                    "more information."
+                )
+            if not buf._contiguous():
+                raise ValueError("Array must be C or F contiguous")
+            ptrs[0][i] = buf.ptr
+            sizes[0][i] = nbytes[i]
+            ucp_tags[0][i] = tags[i]
+    except Exception:
+        free(ptrs[0])
+        free(sizes[0])
+        free(ucp_tags[0])
+        raise
+    return arrays
+
+
+def tag_send_nb_many(
     UCXEndpoint ep,
-    Array buffer,
-    size_t nbytes,
+    buffers,
+    nbytes,
+    tags,
+    cb_func,
+    tuple cb_args=None,
+    dict cb_kwargs=None,
+    str name=None
+):
+    """ This routine posts a batch of messages to a destination endpoint
+
+    All sends are posted from a single call, using the arrays of pointers,
+    sizes, and tags extracted from `buffers`, `nbytes`, and `tags`. The batch
+    is considered completed when all its send operations are completed. If all
+    send operations are completed immediately the routine returns None and the
+    call-back function **is not invoked**. Otherwise, the routine returns an
+    `UCXRequestBatch` and the call-back function is invoked once, when the last
+    send operation completes.
+
+    Note
+    ----
+    The user should not modify any part of the buffers after this operation is
+    called, until the operation completes.
+
+    Parameters
+    ----------
+    ep: UCXEndpoint
+        The destination endpoint
+    buffers: sequence of Array
+        ``Array``s wrapping user-provided array-like objects
+    nbytes: sequence of int
+        Size of each buffer to use. Must be equal or less than the size of the
+        buffer
+    tags: sequence of int
+        The tag of each message
+    cb_func: callable
+        The call-back function, which must accept `request` and `exception` as the
+        first two arguments.
+    cb_args: tuple, optional
+        Extra arguments to the call-back function
+    cb_kwargs: dict, optional
+        Extra keyword arguments to the call-back function
+    name: str, optional
+        Descriptive name of the operation
+    """
+    if cb_args is None:
+        cb_args = ()
+    if cb_kwargs is None:
+        cb_kwargs = {}
+    if name is None:
+        name = "tag_send_nb_many"
+    if Feature.TAG not in ep.worker._context._feature_flags:
+        raise ValueError("UCXContext must be created with `Feature.TAG`")
+
+    cdef uintptr_t *ptrs
+    cdef size_t *sizes
+    cdef ucp_tag_t *ucp_tags
+    cdef tuple arrays = _fill_batch_arrays(
+        buffers, nbytes, tags, False, ep.worker._context.cuda_support,
+        &ptrs, &sizes, &ucp_tags
+    )
+    cdef Py_ssize_t i
+    cdef ucs_status_ptr_t status
+    cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
+    cdef UCXRequestBatch batch = UCXRequestBatch(cb_func, cb_args, cb_kwargs)
+    try:
+        for i in range(len(arrays)):
+            with nogil:
+                status = ucp_tag_send_nb(
+                    ep._handle,
+                    <void*>ptrs[i],
+                    sizes[i],
+                    ucp_dt_make_contig(1),
+                    ucp_tags[i],
+                    _send_cb
+                )
+            if UCS_PTR_STATUS(status) == UCS_OK:
+                continue
+            batch._add()
+            try:
+                _handle_status(
+                    status, sizes[i], _request_batch_callback, (batch,), {},
+                    name, ep._inflight_msgs, ep.worker
+                )
+            except Exception as e:
+                batch._done(e)
+                break
+    finally:
+        free(ptrs)
+        free(sizes)
+        free(ucp_tags)
+    if batch._seal():
+        return batch
+
+
+def tag_recv_nb_many(
+    UCXWorker worker,
+    buffers,
+    nbytes,
+    tags,
+    cb_func,
+    tuple cb_args=None,
+    dict cb_kwargs=None,
+    str name=None,
+    UCXEndpoint ep=None
+):
+    """ This routine posts a batch of receives on a worker
+
+    All receives are posted from a single call, using the arrays of pointers,
+    sizes, and tags extracted from `buffers`, `nbytes`, and `tags`. The batch
+    is considered completed when all its receive operations are completed,
+    at which point the call-back function is invoked once. If all receive
+    operations are completed immediately the routine returns None and the
+    call-back function **is not invoked**.
+
+    Parameters
+    ----------
+    worker: UCXWorker
+        The worker that is used for the receive operations
+    buffers: sequence of Array
+        ``Array``s wrapping user-provided array-like objects
+    nbytes: sequence of int
+        Size of each buffer to use. Must be equal or less than the size of the
+        buffer
+    tags: sequence of int
+        Message tag to expect for each buffer
+    cb_func: callable
+        The call-back function, which must accept `request` and `exception` as the
+        first two arguments.
+    cb_args: tuple, optional
+        Extra arguments to the call-back function
+    cb_kwargs: dict, optional
+        Extra keyword arguments to the call-back function
+    name: str, optional
+        Descriptive name of the operation
+    ep: UCXEndpoint, optional
+        Registrate the inflight messages at `ep` instead of `worker`, which
+        guarantee that the messages are cancelled when `ep` closes as opposed to
+        when the `worker` closes.
+    """
+    if cb_args is None:
+        cb_args = ()
+    if cb_kwargs is None:
+        cb_kwargs = {}
+    if name is None:
+        name = "tag_recv_nb_many"
+    if Feature.TAG not in worker._context._feature_flags:
+        raise ValueError("UCXContext must be created with `Feature.TAG`")
+
+    cdef uintptr_t *ptrs
+    cdef size_t *sizes
+    cdef ucp_tag_t *ucp_tags
+    cdef tuple arrays = _fill_batch_arrays(
+        buffers, nbytes, tags, True, worker._context.cuda_support,
+        &ptrs, &sizes, &ucp_tags
+    )
+    cdef set inflight_msgs = (
+        worker._inflight_msgs if ep is None else ep._inflight_msgs
+    )
+    cdef Py_ssize_t i
+    cdef ucs_status_ptr_t status
+    cdef ucp_tag_recv_callback_t _tag_recv_cb = (
+        <ucp_tag_recv_callback_t>_tag_recv_callback
+    )
+    cdef UCXRequestBatch batch = UCXRequestBatch(cb_func, cb_args, cb_kwargs)
+    try:
+        for i in range(len(arrays)):
+            with nogil:
+                status = ucp_tag_recv_nb(
+                    worker._handle,
+                    <void*>ptrs[i],
+                    sizes[i],
+                    ucp_dt_make_contig(1),
+                    ucp_tags[i],
+                    -1,
+                    _tag_recv_cb
+                )
+            if UCS_PTR_STATUS(status) == UCS_OK:
+                continue
+            batch._add()
+            try:
+                _handle_status(
+                    status, sizes[i], _request_batch_callback, (batch,), {},
+                    name, inflight_msgs, worker
+                )
+            except Exception as e:
+                batch._done(e)
+                break
+    finally:
+        free(ptrs)
+        free(sizes)
+        free(ucp_tags)
+    if batch._seal():
+        return batch
+
+
+cdef class _TagProbe:
+    """A pending receive of `tag_recv_probe_nb()`
+
+    The probe is retried every time the worker has progressed until
+    a matching message arrives.
+    """
+    cdef:
+        bint pending
+        ucp_tag_t tag
+        ucp_tag_t tag_mask
+        object allocator
+        object cb_func
+        tuple cb_args
+        dict cb_kwargs
+        str name
+        set inflight_msgs
+
+    cdef bint try_recv(self, UCXWorker worker) except *:
+        """Probe for a matching message and post its receive
+
+        Returns False if no matching message has arrived yet
+        """
+        cdef ucp_tag_recv_info_t info
+        cdef ucp_tag_message_h message
+        with nogil:
+            message = ucp_tag_probe_nb(
+                worker._handle, self.tag, self.tag_mask, 1, &info
+            )
+        if message == NULL:
+            return False
+
+        cdef Array buf
+        cdef str msg
+        exception = None
+        try:
+            obj = self.allocator(info.length)
+            buf = obj if isinstance(obj, Array) else Array(obj)
+            if buf.readonly:
+                raise ValueError("writing to readonly buffer!")
+            if buf.cuda and not worker._context.cuda_support:
+                raise ValueError(
+                    "UCX is not configured with CUDA support, please add "
+                    "`cuda_copy` and/or `cuda_ipc` to the UCX_TLS environment"
+                    "variable and that the ucx-proc=*=gpu package is "
+                    "installed. See "
+                    "https://ucx-py.readthedocs.io/en/latest/install.html for "
+                    "more information."
+                )
+            if not buf._contiguous():
+                raise ValueError("Array must be C or F contiguous")
+            if buf._nbytes() < <Py_ssize_t>info.length:
+                msg = "<%s>: allocated %d bytes but the message is %d bytes" % (
+                    self.name, buf._nbytes(), info.length
+                )
+                raise ValueError(msg)
+        except Exception as e:
+            # The message has been removed from the unexpected queue thus we
+            # still have to receive it
+            exception = e
+            buf = Array(bytearray(info.length))
+
+        cdef ucp_tag_recv_callback_t _tag_recv_cb = (
+            <ucp_tag_recv_callback_t>_tag_recv_callback
+        )
+        cdef ucs_status_ptr_t status
+        with nogil:
+            status = ucp_tag_msg_recv_nb(
+                worker._handle,
+                <void*>buf.ptr,
+                info.length,
+                ucp_dt_make_contig(1),
+                message,
+                _tag_recv_cb
+            )
+        try:
+            # Notice, `buf` is given to the call-back function in order to keep
+            # it alive until the receive finishes
+            req = _handle_status(
+                status, info.length, _tag_probe_callback, (self, buf, exception),
+                {}, self.name, self.inflight_msgs, worker
+            )
+            if req is None and UCS_PTR_STATUS(status) == UCS_OK:
+                _tag_probe_callback(None, None, self, buf, exception)
+        except Exception as e:
+            self.cb_func(None, e, *self.cb_args, **self.cb_kwargs)
+        return True
+
+    cdef void cancel(self) except *:
+        logger.debug("Future cancelling: %s" % self.name)
+        if self.cb_func is not None:
+            self.cb_func(
+                None, UCXCanceled("<%s>: " % self.name),
+                *self.cb_args, **self.cb_kwargs
+            )
+
+
+cdef inline bint _tag_probes_overlap(_TagProbe a, _TagProbe b):
+    """Whether a message might match both probes"""
+    return ((a.tag ^ b.tag) & a.tag_mask & b.tag_mask) == 0
+
+
+def _tag_probe_callback(request, exception, _TagProbe probe, buf, alloc_exception):
+    if exception is None:
+        exception = alloc_exception
+    if probe.cb_func is not None:
+        probe.cb_func(request, exception, *probe.cb_args, **probe.cb_kwargs)
+
+
+def tag_recv_probe_nb(
+    UCXWorker worker,
+    ucp_tag_t tag,
+    allocator,
+    cb_func,
+    ucp_tag_t tag_mask=-1,
+    tuple cb_args=None,
+    dict cb_kwargs=None,
+    str name=None,
+    UCXEndpoint ep=None
+):
+    """ This routine receives a message of unknown size on a worker
+
+    The routine probes for a message that matches the tag and tag_mask values.
+    When the message arrives, a buffer of the size of the message is allocated
+    by calling `allocator(nbytes)` and the message is received into it. If no
+    matching message has arrived yet, the probe is retried every time the worker
+    has progressed. Probes that might match the same messages are matched in the
+    order they are posted. The routine is non-blocking and therefore returns
+    immediately. The call-back function is invoked when the message is delivered
+    to the buffer, which makes it possible to send objects of unknown size as
+    a single message.
+
+    Note
+    ----
+    Messages are only probed after they have been matched against posted
+    receives thus pending probes and `tag_recv_nb()` shouldn't be used
+    concurrently with the same tag.
+
+    Parameters
+    ----------
+    worker: UCXWorker
+        The worker that is used for the receive operation
+    tag: int
+        Message tag to expect
+    allocator: callable
+        Function that takes the number of bytes of the message and returns
+        a new buffer of at least that size, either an ``Array`` or an object
+        exposing the buffer protocol or the cuda interface.
+    cb_func: callable
+        The call-back function, which must accept `request` and `exception` as the
+        first two arguments.
+    tag_mask: int, optional
+        Bit mask that indicates the bits that are used for the matching of the
+        incoming tag against the expected tag.
+    cb_args: tuple, optional
+        Extra arguments to the call-back function
+    cb_kwargs: dict, optional
+        Extra keyword arguments to the call-back function
+    name: str, optional
+        Descriptive name of the operation
+    ep: UCXEndpoint, optional
+        Registrate the inflight message at `ep` instead of `worker`, which
+        guarantee that the message is cancelled when `ep` closes as opposed to
+        when the `worker` closes.
+    """
+    if cb_args is None:
+        cb_args = ()
+    if cb_kwargs is None:
+        cb_kwargs = {}
+    if name is None:
+        name = "tag_recv_probe_nb"
+    if Feature.TAG not in worker._context._feature_flags:
+        raise ValueError("UCXContext must be created with `Feature.TAG`")
+    cdef _TagProbe probe = _TagProbe()
+    probe.tag = tag
+    probe.tag_mask = tag_mask
+    probe.allocator = allocator
+    probe.cb_func = cb_func
+    probe.cb_args = cb_args
+    probe.cb_kwargs = cb_kwargs
+    probe.name = name
+    probe.inflight_msgs = worker._inflight_msgs if ep is None else ep._inflight_msgs
+    # The new probe is tried right away but the earlier probes that might match
+    # the same messages are retried first, which matches them in posting order
+    if worker._tag_probes:
+        worker._progress_tag_probes(probe)
+    if not probe.try_recv(worker):
+        probe.pending = True
+        worker._tag_probes.append(probe)
+
+
+cdef ucs_status_t _am_recv_callback(
+    void *arg, void *data, size_t length, ucp_ep_h reply_ep, unsigned flags
+) with gil:
+    cdef tuple handler = <tuple>arg
+    cb_func, cb_args, cb_kwargs = handler
+    cdef object msg = PyMemoryView_FromMemory(<char*>data, length, PyBUF_READ)
+    try:
+        cb_func(msg, *cb_args, **cb_kwargs)
+    except Exception as e:
+        logger.exception("am_recv_callback(): %s" % e)
+    finally:
+        msg.release()
+    # UCX releases `data` when the call-back returns UCS_OK
+    return UCS_OK
+
+
+def am_send_nb(
+    UCXEndpoint ep,
+    uint16_t am_id,
+    buffers,
+    cb_func,
+    tuple cb_args=None,
+    dict cb_kwargs=None,
+    str name=None
+):
+    """ This routine sends an Active Message to an endpoint
+
+    The buffers are sent back to back as a single message, which is delivered
+    to the call-back function registered by `UCXWorker.am_register_handler()`
+    on the destination worker. As opposed to tag messages, the receiver doesn't
+    have to post a matching receive. The routine is non-blocking and therefore
+    returns immediately, however the actual send operation may be delayed.
+
+    Note
+    ----
+    Only host memory is supported.
+
+    Parameters
+    ----------
+    ep: UCXEndpoint
+        The destination endpoint
+    am_id: int
+        The Active Message ID
+    buffers: sequence of Array
+        The buffers to send
+    cb_func: callable
+        The call-back function, which must accept `request` and `exception` as the
+        first two arguments.
+    cb_args: tuple, optional
+        Extra arguments to the call-back function
+    cb_kwargs: dict, optional
+        Extra keyword arguments to the call-back function
+    name: str, optional
+        Descriptive name of the operation
+    """
+    if cb_args is None:
+        cb_args = ()
+    if cb_kwargs is None:
+        cb_kwargs = {}
+    if name is None:
+        name = "am_send_nb"
+    if Feature.AM not in ep.worker._context._feature_flags:
+        raise ValueError("UCXContext must be created with `Feature.AM`")
+    cdef _IOVector iov = _IOVector(buffers)
+    iov.cb_func = cb_func
+    iov.cb_args = cb_args
+    iov.cb_kwargs = cb_kwargs
+    cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
+    cdef ucs_status_ptr_t status
+    with nogil:
+        status = ucp_am_send_nb(
+            ep._handle,
+            am_id,
+            <void*>iov.iov,
+            iov.count,
+            ucp_dt_make_iov(),
+            _send_cb,
+            0
+        )
+    # Notice, `iov` is given to the call-back function in order to keep
+    # it alive until the send finishes
+    return _handle_status(
+        status, iov.nbytes, _iov_callback, (iov,), {}, name, ep._inflight_msgs,
+        ep.worker
+    )
+
+
+cdef _check_rma_args(UCXEndpoint ep, Array buffer, UCXRkey rkey):
+    if Feature.RMA not in ep.worker._context._feature_flags:
+        raise ValueError("UCXContext must be created with `Feature.RMA`")
+    if not rkey.initialized or rkey.ep is not ep:
+        raise ValueError("The remote key must be unpacked at the same endpoint")
+    if buffer.cuda and not ep.worker._context.cuda_support:
+        raise ValueError(
+            "UCX is not configured with CUDA support, please add "
+            "`cuda_copy` and/or `cuda_ipc` to the UCX_TLS environment"
+            "variable and that the ucx-proc=*=gpu package is "
+            "installed. See "
+            "https://ucx-py.readthedocs.io/en/latest/install.html for "
+            "more information."
+        )
+    if not buffer._contiguous():
+        raise ValueError("Array must be C or F contiguous")
+
+
+def put_nb(
+    UCXEndpoint ep,
+    Array buffer,
+    size_t nbytes,
+    uint64_t remote_addr,
+    UCXRkey rkey,
+    cb_func,
+    tuple cb_args=None,
+    dict cb_kwargs=None,
+    str name=None
+):
+    """ This routine writes a local buffer into remote memory
+
+    The routine is non-blocking and therefore returns immediately, however
+    the actual operation may be delayed. The operation is considered completed
+    when it is safe to reuse the local buffer, use `UCXEndpoint.flush()` to
+    wait for the data to be written into the remote memory.
+
+    Parameters
+    ----------
+    ep: UCXEndpoint
+        The endpoint connected to the owner of the remote memory
+    buffer: Array
+        The buffer to write from
+    nbytes: int
+        Size of the buffer to use. Must be equal or less than the size of buffer
+    remote_addr: int
+        The remote address to write into
+    rkey: UCXRkey
+        The remote key of the remote memory
+    cb_func: callable
+        The call-back function, which must accept `request` and `exception` as the
+        first two arguments.
+    cb_args: tuple, optional
+        Extra arguments to the call-back function
+    cb_kwargs: dict, optional
+        Extra keyword arguments to the call-back function
+    name: str, optional
+        Descriptive name of the operation
+    """
+    if cb_args is None:
+        cb_args = ()
+    if cb_kwargs is None:
+        cb_kwargs = {}
+    if name is None:
+        name = "put_nb"
+    _check_rma_args(ep, buffer, rkey)
+    cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
+    cdef ucs_status_ptr_t status
+    with nogil:
+        status = ucp_put_nb(
+            ep._handle, <void*>buffer.ptr, nbytes, remote_addr, rkey._handle, _send_cb
+        )
+    return _handle_status(
+        status, nbytes, cb_func, cb_args, cb_kwargs, name, ep._inflight_msgs, ep.worker
+    )
+
+
+def get_nb(
+    UCXEndpoint ep,
+    Array buffer,
+    size_t nbytes,
+    uint64_t remote_addr,
+    UCXRkey rkey,
+    cb_func,
+    tuple cb_args=None,
+    dict cb_kwargs=None,
+    str name=None
+):
+    """ This routine reads remote memory into a local buffer
+
+    The routine is non-blocking and therefore returns immediately, however
+    the actual operation may be delayed. The call-back function is invoked
+    when the data has been written into the local buffer.
+
+    Parameters
+    ----------
+    ep: UCXEndpoint
+        The endpoint connected to the owner of the remote memory
+    buffer: Array
+        The buffer to read into
+    nbytes: int
+        Size of the buffer to use. Must be equal or less than the size of buffer
+    remote_addr: int
+        The remote address to read from
+    rkey: UCXRkey
+        The remote key of the remote memory
+    cb_func: callable
+        The call-back function, which must accept `request` and `exception` as the
+        first two arguments.
+    cb_args: tuple, optional
+        Extra arguments to the call-back function
+    cb_kwargs: dict, optional
+        Extra keyword arguments to the call-back function
+    name: str, optional
+        Descriptive name of the operation
+    """
+    if cb_args is None:
+        cb_args = ()
+    if cb_kwargs is None:
+        cb_kwargs = {}
+    if name is None:
+        name = "get_nb"
+    if buffer.readonly:
+        raise ValueError("writing to readonly buffer!")
+    _check_rma_args(ep, buffer, rkey)
+    cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
+    cdef ucs_status_ptr_t status
+    with nogil:
+        status = ucp_get_nb(
+            ep._handle, <void*>buffer.ptr, nbytes, remote_addr, rkey._handle, _send_cb
+        )
+    return _handle_status(
+        status, nbytes, cb_func, cb_args, cb_kwargs, name, ep._inflight_msgs, ep.worker
+    )
+
+
+def stream_send_nb(
+    UCXEndpoint ep,
+    Array buffer,
+    size_t nbytes,
     cb_func,
     tuple cb_args=None,
     dict cb_kwargs=None,
@@ -1305,68 +2658,31 @@ def stream_send_nb(
     if not buffer._contiguous():
         raise ValueError("Array must be C or F contiguous")
     cdef ucp_send_callback_t _send_cb = <ucp_send_callback_t>_send_callback
-    cdef ucs_status_ptr_t status = ucp_stream_send_nb(
-        ep._handle,
-        <void*>buffer.ptr,
-        nbytes,
-        ucp_dt_make_contig(1),
-        _send_cb,
-        0
-    )
+    cdef ucs_status_ptr_t status
+    with nogil:
+        status = ucp_stream_send_nb(
+            ep._handle,
+            <void*>buffer.ptr,
+            nbytes,
+            ucp_dt_make_contig(1),
+            _send_cb,
+            0
+        )
     return _handle_status(
-        status, nbytes, cb_func, cb_args, cb_kwargs, name, ep._inflight_msgs
+        status, nbytes, cb_func, cb_args, cb_kwargs, name, ep._inflight_msgs, ep.worker
     )
 
 
 cdef void _stream_recv_callback(
     void *request, ucs_status_t status, size_t length
-):
-    cdef UCXRequest req
-    cdef dict req_info
-    cdef str name, ucx_status_msg, msg
-    cdef set inflight_msgs
-    cdef tuple cb_args
-    cdef dict cb_kwargs
-    with log_errors():
-        req = UCXRequest(<uintptr_t><void*> request)
-        assert not req.closed()
-        req_info = <dict>req._handle.info
-        req_info["status"] = "finished"
-
-        if "cb_func" not in req_info:
-            # This callback function was called before ucp_tag_recv_nb() returned
-            return
-
-        exception = None
-        if status == UCS_ERR_CANCELED:
-            name = req_info["name"]
-            msg = "<%s>: " % name
-            exception = UCXCanceled(msg)
-        elif status != UCS_OK:
-            name = req_info["name"]
-            ucx_status_msg = ucs_status_string(status).decode("utf-8")
-            msg = "<%s>: %s" % (name, ucx_status_msg)
-            exception = UCXError(msg)
-        elif length != req_info["expected_receive"]:
-            name = req_info["name"]
-            msg = "<%s>: length mismatch: %d (got) != %d (expected)" % (
-                name, length, req_info["expected_receive"]
-            )
-            exception = UCXMsgTruncated(msg)
+) nogil:
+    if ucx_py_completion_queue_push(<ucx_py_request*>request, status, length):
+        return
+    with gil:
         try:
-            inflight_msgs = req_info["inflight_msgs"]
-            inflight_msgs.discard(req)
-            cb_func = req_info["cb_func"]
-            if cb_func is not None:
-                cb_args = req_info["cb_args"]
-                if cb_args is None:
-                    cb_args = ()
-                cb_kwargs = req_info["cb_kwargs"]
-                if cb_kwargs is None:
-                    cb_kwargs = {}
-                cb_func(req, exception, *cb_args, **cb_kwargs)
-        finally:
-            req.close()
+            _request_completed(<ucx_py_request*>request, status, length)
+        except BaseException as e:
+            logger.exception(e)
 
 
 def stream_recv_nb(
@@ -1431,15 +2747,17 @@ def stream_recv_nb(
     cdef ucp_stream_recv_callback_t _stream_recv_cb = (
         <ucp_stream_recv_callback_t>_stream_recv_callback
     )
-    cdef ucs_status_ptr_t status = ucp_stream_recv_nb(
-        ep._handle,
-        <void*>buffer.ptr,
-        nbytes,
-        ucp_dt_make_contig(1),
-        _stream_recv_cb,
-        &length,
-        UCP_STREAM_RECV_FLAG_WAITALL,
-    )
+    cdef ucs_status_ptr_t status
+    with nogil:
+        status = ucp_stream_recv_nb(
+            ep._handle,
+            <void*>buffer.ptr,
+            nbytes,
+            ucp_dt_make_contig(1),
+            _stream_recv_cb,
+            &length,
+            UCP_STREAM_RECV_FLAG_WAITALL,
+        )
     return _handle_status(
-        status, nbytes, cb_func, cb_args, cb_kwargs, name, ep._inflight_msgs
+        status, nbytes, cb_func, cb_args, cb_kwargs, name, ep._inflight_msgs, ep.worker
     )
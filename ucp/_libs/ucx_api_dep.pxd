@@ -13,6 +13,16 @@ from libc.stdlib cimport free, malloc
 from libc.string cimport memset
 
 
+cdef extern from "<pthread.h>" nogil:
+    ctypedef struct pthread_mutex_t:
+        pass
+
+    int pthread_mutex_init(pthread_mutex_t *mutex, const void *attr)
+    int pthread_mutex_destroy(pthread_mutex_t *mutex)
+    int pthread_mutex_lock(pthread_mutex_t *mutex)
+    int pthread_mutex_unlock(pthread_mutex_t *mutex)
+
+
 cdef extern from "sys/socket.h":
     ctypedef struct sockaddr_storage_t:
         pass
@@ -35,7 +45,7 @@ cdef extern from "src/c_util.h":
                                          size_t max_size)
 
 
-cdef extern from "ucp/api/ucp.h":
+cdef extern from "ucp/api/ucp.h" nogil:
     ctypedef struct ucp_context:
         pass
 
@@ -218,12 +228,23 @@ cdef extern from "ucp/api/ucp.h":
 
     ucp_datatype_t ucp_dt_make_contig(size_t elem_size)
 
+    ctypedef struct ucp_dt_iov_t:
+        void *buffer
+        size_t length
+
+    ucp_datatype_t ucp_dt_make_iov()
+
     unsigned ucp_worker_progress(ucp_worker_h worker)
 
     ctypedef struct ucp_tag_recv_info_t:
         ucp_tag_t sender_tag
         size_t length
 
+    ctypedef struct ucp_recv_desc:
+        pass
+
+    ctypedef ucp_recv_desc* ucp_tag_message_h
+
     ctypedef void (*ucp_tag_recv_callback_t)(void *request,  # noqa
                                              ucs_status_t status,
                                              ucp_tag_recv_info_t *info)
@@ -233,6 +254,15 @@ cdef extern from "ucp/api/ucp.h":
                                      ucp_tag_t tag, ucp_tag_t tag_mask,
                                      ucp_tag_recv_callback_t cb)
 
+    ucp_tag_message_h ucp_tag_probe_nb(ucp_worker_h worker, ucp_tag_t tag,
+                                       ucp_tag_t tag_mask, int remove,
+                                       ucp_tag_recv_info_t *info)
+
+    ucs_status_ptr_t ucp_tag_msg_recv_nb(ucp_worker_h worker, void *buffer,
+                                         size_t count, ucp_datatype_t datatype,
+                                         ucp_tag_message_h message,
+                                         ucp_tag_recv_callback_t cb)
+
     ctypedef void (*ucp_stream_recv_callback_t)(void *request,  # noqa
                                                 ucs_status_t status,
                                                 size_t length)
@@ -247,6 +277,22 @@ cdef extern from "ucp/api/ucp.h":
                                         ucp_stream_recv_callback_t cb,
                                         size_t *length, unsigned flags)
 
+    unsigned UCP_AM_FLAG_WHOLE_MSG
+    ctypedef ucs_status_t (*ucp_am_callback_t)(void *arg,  # noqa
+                                               void *data,
+                                               size_t length,
+                                               ucp_ep_h reply_ep,
+                                               unsigned flags)
+
+    ucs_status_t ucp_worker_set_am_handler(ucp_worker_h worker, uint16_t id,
+                                           ucp_am_callback_t cb, void *arg,
+                                           uint32_t flags)
+
+    ucs_status_ptr_t ucp_am_send_nb(ucp_ep_h ep, uint16_t id,
+                                    const void *buffer, size_t count,
+                                    ucp_datatype_t datatype,
+                                    ucp_send_callback_t cb, unsigned flags)
+
     void ucp_request_free(void *request)
 
     void ucp_ep_print_info(ucp_ep_h ep, FILE *stream)
@@ -255,6 +301,8 @@ cdef extern from "ucp/api/ucp.h":
     ucs_status_t ucp_worker_arm(ucp_worker_h worker)
 
     void ucp_listener_destroy(ucp_listener_h listener)
+    ucs_status_t ucp_listener_reject(ucp_listener_h listener,
+                                     ucp_conn_request_h conn_request)
 
     const char *ucs_status_string(ucs_status_t status)
 
@@ -293,6 +341,45 @@ cdef extern from "ucp/api/ucp.h":
                                      unsigned flags,
                                      ucp_send_callback_t cb)
 
+    ctypedef struct ucp_mem:
+        pass
+
+    ctypedef ucp_mem* ucp_mem_h
+
+    ctypedef struct ucp_rkey:
+        pass
+
+    ctypedef ucp_rkey* ucp_rkey_h
+
+    int UCP_MEM_MAP_PARAM_FIELD_ADDRESS
+    int UCP_MEM_MAP_PARAM_FIELD_LENGTH
+    int UCP_MEM_MAP_PARAM_FIELD_FLAGS
+
+    ctypedef struct ucp_mem_map_params_t:
+        uint64_t field_mask
+        void *address
+        size_t length
+        unsigned flags
+
+    ucs_status_t ucp_mem_map(ucp_context_h context,
+                             const ucp_mem_map_params_t *params,
+                             ucp_mem_h *memh_p)
+    ucs_status_t ucp_mem_unmap(ucp_context_h context, ucp_mem_h memh)
+
+    ucs_status_t ucp_rkey_pack(ucp_context_h context, ucp_mem_h memh,
+                               void **rkey_buffer_p, size_t *size_p)
+    void ucp_rkey_buffer_release(void *rkey_buffer)
+    ucs_status_t ucp_ep_rkey_unpack(ucp_ep_h ep, const void *rkey_buffer,
+                                    ucp_rkey_h *rkey_p)
+    void ucp_rkey_destroy(ucp_rkey_h rkey)
+
+    ucs_status_ptr_t ucp_put_nb(ucp_ep_h ep, const void *buffer,
+                                size_t length, uint64_t remote_addr,
+                                ucp_rkey_h rkey, ucp_send_callback_t cb)
+    ucs_status_ptr_t ucp_get_nb(ucp_ep_h ep, void *buffer,
+                                size_t length, uint64_t remote_addr,
+                                ucp_rkey_h rkey, ucp_send_callback_t cb)
+
 cdef extern from "sys/epoll.h":
 
     cdef enum:
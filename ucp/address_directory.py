@@ -0,0 +1,130 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+# See file LICENSE for terms.
+
+import asyncio
+import os
+import time
+
+from . import core
+from ._libs import ucx_api
+
+
+class AddressDirectory:
+    """Directory of worker addresses on a shared file system.
+
+    Out-of-band exchange of worker addresses for
+    `create_endpoint_from_worker_address()`. Every process publishes the
+    address of its worker under a name, such as its rank, and looks up the
+    addresses of its peers, which might not have been published yet.
+
+    Parameters
+    ----------
+    path: str
+        The directory, which is created if it doesn't exist. All processes
+        must use the same directory e.g. on a tmpfs for processes on the
+        same node or on a network file system.
+
+    Example
+    -------
+    >>> directory = ucp.AddressDirectory("/dev/shm/my-job")
+    >>> directory.publish(rank)
+    >>> eps = await asyncio.gather(
+    ...     *(directory.connect(peer) for peer in range(size) if peer != rank)
+    ... )
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _file(self, name):
+        name = str(name)
+        if not name or name.startswith(".") or os.sep in name:
+            raise ValueError("Invalid name: %r" % name)
+        return os.path.join(self.path, name)
+
+    def publish(self, name, address=None):
+        """Publish a worker address under `name`
+
+        The address is written atomically thus peers never read a partial
+        address.
+
+        Parameters
+        ----------
+        name: str or int
+            The name of the address, which is used as a file name
+        address: UCXAddress or bytes, optional
+            The address to publish. If None, the address of the first worker
+            of the current context.
+        """
+        if address is None:
+            address = core.get_worker_address()
+        filename = self._file(name)
+        tmp = os.path.join(
+            self.path, ".%s.%d.tmp" % (os.path.basename(filename), os.getpid())
+        )
+        with open(tmp, "wb") as f:
+            f.write(bytes(address))
+        os.replace(tmp, filename)
+
+    def unpublish(self, name):
+        """Remove the address published under `name`, if any"""
+        try:
+            os.remove(self._file(name))
+        except FileNotFoundError:
+            pass
+
+    def names(self):
+        """List the names of all published addresses"""
+        return sorted(n for n in os.listdir(self.path) if not n.startswith("."))
+
+    async def lookup(self, name, timeout=None, interval=0.01):
+        """Get the address published under `name`, waiting for it if needed
+
+        Parameters
+        ----------
+        name: str or int
+            The name of the address
+        timeout: float, optional
+            Seconds to wait for the address to be published. If None, wait
+            forever.
+        interval: float, optional
+            Seconds between checks of whether the address has been published
+
+        Returns
+        -------
+        UCXAddress
+            The published address
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If the address isn't published within `timeout`
+        """
+        filename = self._file(name)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                with open(filename, "rb") as f:
+                    return ucx_api.UCXAddress.from_buffer(bytearray(f.read()))
+            except FileNotFoundError:
+                pass
+            if deadline is not None and time.monotonic() >= deadline:
+                raise asyncio.TimeoutError(
+                    "Address %r not published within %s seconds" % (name, timeout)
+                )
+            await asyncio.sleep(interval)
+
+    async def connect(self, name, timeout=None, **kwargs):
+        """Create an endpoint to the worker published under `name`
+
+        The peer must connect to our address simultaneously. The keyword
+        arguments are passed to `create_endpoint_from_worker_address()`.
+
+        Returns
+        -------
+        Endpoint
+            The new endpoint
+        """
+        address = await self.lookup(name, timeout=timeout)
+        return await core.create_endpoint_from_worker_address(address, **kwargs)
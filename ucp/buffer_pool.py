@@ -0,0 +1,117 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+# See file LICENSE for terms.
+
+import weakref
+
+import numpy as np
+
+
+class _PoolBuffer:
+    """Owner of a buffer handed out by `BufferPool`
+
+    All arrays and memoryviews derived from the allocated array reference
+    this object thus the block is only returned to the pool when all of
+    them have been deleted.
+    """
+
+    def __init__(self, block, nbytes):
+        self.block = block
+        self.__array_interface__ = {
+            "data": (block.ctypes.data, False),
+            "shape": (nbytes,),
+            "typestr": "|u1",
+            "version": 3,
+        }
+
+
+class BufferPool:
+    """Pool of reusable, uninitialized host buffers.
+
+    Buffers are allocated from power-of-two size classes and are returned
+    to the pool when they are deleted, or explicitly by `release()`. The pool
+    can be used as the `allocator` argument of `Endpoint.recv_obj()` and
+    `Endpoint.recv_frames()`.
+
+    Parameters
+    ----------
+    max_bytes: int, optional
+        The maximum number of bytes of idle buffers kept by the pool. Buffers
+        returned when the pool is full, and buffers larger than `max_bytes`,
+        are freed. If None, the pool is unlimited.
+    min_size: int, optional
+        The size of the smallest size class.
+    """
+
+    def __init__(self, max_bytes=None, min_size=64):
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self._free = {}  # Size class -> list of idle blocks
+        self.nbytes = 0  # Bytes of idle blocks
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        """Dict of the pool statistics"""
+        return {"hits": self.hits, "misses": self.misses, "nbytes": self.nbytes}
+
+    def _size_class(self, nbytes):
+        return max(self.min_size, 1 << max(nbytes - 1, 0).bit_length())
+
+    def allocate(self, nbytes):
+        """Allocate an uninitialized buffer
+
+        Parameters
+        ----------
+        nbytes: int
+            The size of the buffer in bytes
+
+        Returns
+        -------
+        numpy.ndarray
+            A uint8 array of `nbytes` elements
+        """
+        size = self._size_class(nbytes)
+        blocks = self._free.get(size)
+        if blocks:
+            self.hits += 1
+            block = blocks.pop()
+            self.nbytes -= size
+        else:
+            self.misses += 1
+            block = np.empty(size, dtype=np.uint8)
+        owner = _PoolBuffer(block, nbytes)
+        owner.finalizer = weakref.finalize(owner, self._return, block)
+        return np.asarray(owner)
+
+    __call__ = allocate
+
+    def release(self, buffer):
+        """Return `buffer` to the pool immediately
+
+        Warning, `buffer` and all views of it must not be used afterwards.
+
+        Parameters
+        ----------
+        buffer: numpy.ndarray
+            A buffer returned by `allocate()`
+        """
+        owner = buffer
+        while isinstance(owner, np.ndarray):
+            owner = owner.base
+        if not isinstance(owner, _PoolBuffer):
+            raise ValueError("The buffer wasn't allocated by a BufferPool")
+        if owner.finalizer.detach() is not None:
+            self._return(owner.block)
+
+    def clear(self):
+        """Free all idle buffers"""
+        self._free.clear()
+        self.nbytes = 0
+
+    def _return(self, block):
+        size = block.nbytes
+        if self.max_bytes is not None and self.nbytes + size > self.max_bytes:
+            return
+        self._free.setdefault(size, []).append(block)
+        self.nbytes += size
@@ -0,0 +1,465 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+# See file LICENSE for terms.
+
+"""Collective operations over the endpoints of a group of ranks"""
+
+import asyncio
+
+import numpy as np
+
+ALGORITHMS = ("ring", "recursive_doubling")
+BROADCAST_ALGORITHMS = ("chain", "binomial")
+
+# The reduction operations by name
+REDUCE_OPS = {
+    "sum": np.add,
+    "prod": np.multiply,
+    "min": np.minimum,
+    "max": np.maximum,
+}
+
+
+def _get_reduce_op(op):
+    if isinstance(op, np.ufunc):
+        return op
+    try:
+        return REDUCE_OPS[op]
+    except KeyError:
+        raise ValueError(
+            "Unknown reduction op %r, expected a numpy ufunc or one of %s"
+            % (op, tuple(REDUCE_OPS))
+        )
+
+
+def _is_power_of_two(n):
+    return n & (n - 1) == 0
+
+
+def _binomial_subtree(vrank, size):
+    """The end of the subtree and the children of `vrank` in a binomial tree
+
+    The tree is rooted at virtual rank 0 and the subtree of `vrank` covers
+    the virtual ranks [vrank, end). The children are in ascending order.
+    """
+    lowbit = vrank & -vrank if vrank else size
+    end = min(vrank + lowbit, size)
+    children = []
+    mask = 1
+    while mask < lowbit and vrank + mask < size:
+        children.append(vrank + mask)
+        mask <<= 1
+    return end, children
+
+
+class Communicator:
+    """Collective operations over the endpoints of a group of ranks.
+
+    All ranks must call the same collectives in the same order with buffers
+    of the same shape and dtype, and the same `segment_size`. A rank must not
+    run collectives of a communicator concurrently.
+
+    Large messages are split into segments of `segment_size` bytes, which
+    are reduced or forwarded as they arrive. Messages up to
+    `small_message_size` bytes use the latency-optimal recursive doubling
+    algorithm, larger messages use the bandwidth-optimal ring algorithm.
+
+    Parameters
+    ----------
+    rank: int
+        The rank of this process
+    eps: dict
+        The endpoints to all other ranks by rank, e.g. as given to
+        `worker_func` by `ucp.utils.run_on_local_network()`. The ranks must
+        be the integers in [0, size).
+    tag: hashable, optional
+        The tag of all messages of the collectives. Other messages on the
+        endpoints must not use this tag.
+    segment_size: int, optional
+        The size of the segments of large messages in bytes
+    small_message_size: int, optional
+        The largest message size in bytes for which the recursive doubling
+        algorithm is selected by default
+
+    Example
+    -------
+    >>> async def worker(rank, eps, args):
+    ...     comm = Communicator(rank, eps)
+    ...     return await comm.allreduce(np.arange(10.0))
+    >>> ucp.utils.run_on_local_network(4, worker)
+    """
+
+    def __init__(
+        self,
+        rank,
+        eps,
+        tag="ucp.collectives",
+        segment_size=2 ** 20,
+        small_message_size=2 ** 16,
+    ):
+        self.rank = int(rank)
+        self.size = len(eps) + 1
+        if sorted([int(peer) for peer in eps] + [self.rank]) != list(range(self.size)):
+            raise ValueError("The ranks must be the integers in [0, %d)" % self.size)
+        self._channels = {int(peer): ep.channel(tag) for peer, ep in eps.items()}
+        if segment_size < 1:
+            raise ValueError("segment_size must be positive")
+        self.segment_size = segment_size
+        self.small_message_size = small_message_size
+
+    def _select_algorithm(self, algorithm, nbytes, algorithms=ALGORITHMS):
+        """Select an algorithm of `algorithms`, which are ordered as (large, small)
+
+        If `algorithm` is None, the second algorithm is selected for messages
+        up to `small_message_size` and the first for larger messages.
+        """
+        if algorithm is None:
+            return algorithms[1 if nbytes <= self.small_message_size else 0]
+        if algorithm not in algorithms:
+            raise ValueError(
+                "Unknown algorithm %r, expected one of %s" % (algorithm, algorithms)
+            )
+        return algorithm
+
+    def _segments(self, buffer):
+        """Split the 1-D `buffer` into views of at most `segment_size` bytes"""
+        n = max(1, self.segment_size // buffer.itemsize)
+        return [buffer[i : i + n] for i in range(0, len(buffer), n)]
+
+    async def _send(self, peer, buffer):
+        channel = self._channels[peer]
+        await asyncio.gather(*(channel.send(s) for s in self._segments(buffer)))
+
+    async def _recv(self, peer, buffer, reduce_into=None, op=None):
+        """Receive into `buffer`, optionally reducing segments as they arrive
+
+        If `reduce_into` is given, every segment is reduced into the same
+        segment of `reduce_into` as soon as it has been received.
+        """
+        channel = self._channels[peer]
+        segments = self._segments(buffer)
+        # The receives are posted in order, which matches the order of sends
+        futures = [asyncio.ensure_future(channel.recv(s)) for s in segments]
+        try:
+            if reduce_into is None:
+                await asyncio.gather(*futures)
+                return
+            for future, segment, acc in zip(
+                futures, segments, self._segments(reduce_into)
+            ):
+                await future
+                op(acc, segment, out=acc)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    async def _sendrecv(
+        self, dst, send_buffer, src, recv_buffer, reduce_into=None, op=None
+    ):
+        await asyncio.gather(
+            self._send(dst, send_buffer),
+            self._recv(src, recv_buffer, reduce_into, op),
+        )
+
+    async def _ring_reduce_scatter(self, chunks, op):
+        """Reduce `chunks` such that the chunk of this rank is fully reduced
+
+        In step `s`, chunk `rank - s - 1` is sent to the right neighbor while
+        chunk `rank - s - 2` is received from the left neighbor and reduced.
+        """
+        n, r = self.size, self.rank
+        right, left = (r + 1) % n, (r - 1) % n
+        tmp = np.empty(max(len(c) for c in chunks), dtype=chunks[0].dtype)
+        for s in range(n - 1):
+            send_chunk = chunks[(r - s - 1) % n]
+            recv_chunk = chunks[(r - s - 2) % n]
+            await self._sendrecv(
+                right,
+                send_chunk,
+                left,
+                tmp[: len(recv_chunk)],
+                reduce_into=recv_chunk,
+                op=op,
+            )
+
+    async def _ring_allgather(self, chunks):
+        """Gather `chunks`, of which this rank has the chunk `rank`"""
+        n, r = self.size, self.rank
+        right, left = (r + 1) % n, (r - 1) % n
+        for s in range(n - 1):
+            await self._sendrecv(
+                right, chunks[(r - s) % n], left, chunks[(r - s - 1) % n]
+            )
+
+    async def _recursive_doubling_allreduce(self, buffer, op):
+        """Allreduce `buffer` in log2(size) exchanges of the full buffer
+
+        When the size isn't a power of two, the ranks beyond the largest
+        power of two first hand over their buffer to a partner rank and
+        receive the result from it at the end.
+        """
+        n, r = self.size, self.rank
+        p2 = 1 << (n.bit_length() - 1)
+        if r >= p2:
+            await self._send(r - p2, buffer)
+            await self._recv(r - p2, buffer)
+            return
+        tmp = np.empty_like(buffer)
+        if r + p2 < n:
+            await self._recv(r + p2, tmp, reduce_into=buffer, op=op)
+        mask = 1
+        while mask < p2:
+            peer = r ^ mask
+            # The buffer is reduced after the send completed, which might
+            # still read from the buffer
+            await self._sendrecv(peer, buffer, peer, tmp)
+            op(buffer, tmp, out=buffer)
+            mask <<= 1
+        if r + p2 < n:
+            await self._send(r + p2, buffer)
+
+    async def allreduce(self, buffer, op="sum", algorithm=None):
+        """Reduce `buffer` of all ranks and return the result on all ranks
+
+        Parameters
+        ----------
+        buffer: numpy.ndarray
+            The contribution of this rank
+        op: str or numpy.ufunc, optional
+            The reduction operation: "sum", "prod", "min", "max" or a binary
+            numpy ufunc, which must be commutative and associative.
+        algorithm: str, optional
+            "ring" or "recursive_doubling". If None, the algorithm is
+            selected by the size of `buffer`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The reduction of all buffers, which is identical on all ranks
+        """
+        op = _get_reduce_op(op)
+        ret = np.array(buffer, order="C")
+        algorithm = self._select_algorithm(algorithm, ret.nbytes)
+        if self.size == 1:
+            return ret
+        flat = ret.reshape(-1)
+        if algorithm == "ring" and len(flat) >= self.size:
+            # Reduce-scatter followed by allgather, which sends and receives
+            # 2 * (size - 1) / size times the buffer per rank
+            chunks = np.array_split(flat, self.size)
+            await self._ring_reduce_scatter(chunks, op)
+            await self._ring_allgather(chunks)
+        else:
+            await self._recursive_doubling_allreduce(flat, op)
+        return ret
+
+    async def reduce_scatter(self, buffer, op="sum"):
+        """Reduce `buffer` of all ranks and scatter the result
+
+        The flattened result is split into `size` chunks, of which rank `i`
+        gets chunk `i` (see `numpy.array_split()`).
+
+        Parameters
+        ----------
+        buffer: numpy.ndarray
+            The contribution of this rank
+        op: str or numpy.ufunc, optional
+            The reduction operation (see `allreduce()`)
+
+        Returns
+        -------
+        numpy.ndarray
+            The 1-D chunk of the reduction of this rank
+        """
+        op = _get_reduce_op(op)
+        flat = np.array(buffer, order="C").reshape(-1)
+        chunks = np.array_split(flat, self.size)
+        if self.size > 1:
+            await self._ring_reduce_scatter(chunks, op)
+        return chunks[self.rank]
+
+    async def allgather(self, buffer, algorithm=None):
+        """Gather `buffer` of all ranks on all ranks
+
+        Parameters
+        ----------
+        buffer: numpy.ndarray
+            The contribution of this rank
+        algorithm: str, optional
+            "ring" or "recursive_doubling", which requires the number of
+            ranks to be a power of two. If None, the algorithm is selected
+            by the total size.
+
+        Returns
+        -------
+        numpy.ndarray
+            The buffers of all ranks stacked by rank, with shape
+            `(size,) + buffer.shape`
+        """
+        buffer = np.asarray(buffer)
+        ret = np.empty((self.size,) + buffer.shape, dtype=buffer.dtype)
+        ret[self.rank] = buffer
+        algorithm = self._select_algorithm(algorithm, ret.nbytes)
+        if self.size == 1:
+            return ret
+        rows = ret.reshape(self.size, -1)
+        if algorithm == "recursive_doubling" and _is_power_of_two(self.size):
+            # In the step of `mask`, the ranks exchange the blocks of `mask`
+            # rows they have gathered so far
+            mask = 1
+            while mask < self.size:
+                peer = self.rank ^ mask
+                mine = self.rank & ~(mask - 1)
+                theirs = peer & ~(mask - 1)
+                await self._sendrecv(
+                    peer,
+                    rows[mine : mine + mask].reshape(-1),
+                    peer,
+                    rows[theirs : theirs + mask].reshape(-1),
+                )
+                mask <<= 1
+        else:
+            await self._ring_allgather(list(rows))
+        return ret
+
+    async def _tree_broadcast(self, buffer, parent, children):
+        """Receive `buffer` from `parent` and forward it to `children`
+
+        Every segment is forwarded as soon as it has been received thus the
+        ranks of the tree receive and send at the same time.
+        """
+        if parent is None:
+            await asyncio.gather(*(self._send(c, buffer) for c in children))
+            return
+        channel = self._channels[parent]
+        segments = self._segments(buffer)
+        recvs = [asyncio.ensure_future(channel.recv(s)) for s in segments]
+        sends = []
+        try:
+            for future, segment in zip(recvs, segments):
+                await future
+                for c in children:
+                    sends.append(asyncio.ensure_future(self._channels[c].send(segment)))
+            await asyncio.gather(*sends)
+        except BaseException:
+            for future in recvs + sends:
+                future.cancel()
+            raise
+
+    async def broadcast(self, buffer, root=0, algorithm=None):
+        """Broadcast `buffer` of `root` to all ranks
+
+        Parameters
+        ----------
+        buffer: numpy.ndarray
+            The data to broadcast at `root` and the C-contiguous buffer to
+            receive into at the other ranks
+        root: int, optional
+            The rank that broadcasts
+        algorithm: str, optional
+            "chain" or "binomial". The pipelined chain takes about the time of
+            sending `buffer` once regardless of the number of ranks, which is
+            best for large buffers. The binomial tree takes log2(size) steps,
+            which is best for small buffers. If None, the algorithm is
+            selected by the size of `buffer`.
+
+        Returns
+        -------
+        numpy.ndarray
+            The broadcasted data, which is `buffer`
+        """
+        buffer = np.asarray(buffer)
+        algorithm = self._select_algorithm(
+            algorithm, buffer.nbytes, BROADCAST_ALGORITHMS
+        )
+        if self.size == 1:
+            return buffer
+        if self.rank == root:
+            flat = np.ascontiguousarray(buffer).reshape(-1)
+        elif not buffer.flags.c_contiguous or not buffer.flags.writeable:
+            raise ValueError("broadcast() requires a writable C-contiguous buffer")
+        else:
+            flat = buffer.reshape(-1)
+
+        n = self.size
+        vrank = (self.rank - root) % n
+        if algorithm == "chain":
+            parent = vrank - 1 if vrank > 0 else None
+            children = [vrank + 1] if vrank + 1 < n else []
+        else:
+            _, children = _binomial_subtree(vrank, n)
+            parent = vrank - (vrank & -vrank) if vrank else None
+        await self._tree_broadcast(
+            flat,
+            None if parent is None else (parent + root) % n,
+            [(c + root) % n for c in children],
+        )
+        return buffer
+
+    async def scatter(self, buffer, root=0):
+        """Scatter the rows of `buffer` of `root` to all ranks
+
+        Uses a binomial tree in which every rank forwards the rows of its
+        subtree as soon as they have been received.
+
+        Parameters
+        ----------
+        buffer: numpy.ndarray
+            At `root`, the data to scatter with shape `(size,) + shape`, of
+            which rank `i` gets row `i`. At the other ranks, the C-contiguous
+            buffer of shape `shape` to receive into.
+        root: int, optional
+            The rank that scatters
+
+        Returns
+        -------
+        numpy.ndarray
+            The row of this rank
+        """
+        n = self.size
+        buffer = np.asarray(buffer)
+        vrank = (self.rank - root) % n
+        end, children = _binomial_subtree(vrank, n)
+
+        if self.rank == root:
+            if buffer.shape[:1] != (n,):
+                raise ValueError("scatter() requires a buffer of %d rows" % n)
+            rows = np.ascontiguousarray(buffer).reshape(n, -1)
+            # Row `j` of the subtree of child `c` is the row of virtual rank `j`
+            await asyncio.gather(
+                *(
+                    self._send((c + root) % n, rows[(j + root) % n])
+                    for c, c_end in ((c, _binomial_subtree(c, n)[0]) for c in children)
+                    for j in range(c, c_end)
+                )
+            )
+            return buffer[root].copy()
+
+        if not buffer.flags.c_contiguous or not buffer.flags.writeable:
+            raise ValueError("scatter() requires a writable C-contiguous buffer")
+        parent = (vrank - (vrank & -vrank) + root) % n
+        # The rows of this subtree arrive in order: our own row followed by
+        # the rows of the subtree of each child
+        rows = [buffer.reshape(-1)]
+        rows.extend(np.empty_like(rows[0]) for _ in range(vrank + 1, end))
+        recvs = [asyncio.ensure_future(self._recv(parent, r)) for r in rows]
+        sends = []
+        try:
+            child_ends = [(c, _binomial_subtree(c, n)[0]) for c in children]
+            for j, (future, row) in enumerate(zip(recvs, rows), start=vrank):
+                await future
+                for c, c_end in child_ends:
+                    if c <= j < c_end:
+                        sends.append(
+                            asyncio.ensure_future(self._send((c + root) % n, row))
+                        )
+            await asyncio.gather(*sends)
+        except BaseException:
+            for future in recvs + sends:
+                future.cancel()
+            raise
+        return buffer
+
+    async def barrier(self):
+        """Wait until all ranks have entered the barrier"""
+        await self.allreduce(np.zeros(1, dtype="u1"), algorithm="recursive_doubling")
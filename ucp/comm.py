@@ -3,17 +3,100 @@
 # See file LICENSE for terms.
 
 import asyncio
+import threading
 
 from ._libs import arr, ucx_api
 
+# The calls deferred by the progress thread of the current thread, if any
+_deferred = threading.local()
 
-def _cb_func(request, exception, event_loop, future):
+
+def _defer_calls(event_loop):
+    """Defer the calls of `_call_soon()` made in the current thread
+
+    Used by progress threads (see `ThreadMode`), which must not touch the
+    event loops they progress. The deferred calls are scheduled in batches
+    by `_flush_deferred()`.
+
+    Parameters
+    ----------
+    event_loop: asyncio.EventLoop
+        The event loop progressed by the current thread
+    """
+    _deferred.event_loop = event_loop
+    _deferred.calls = {}
+
+
+def _flush_deferred():
+    """Schedule the calls deferred by the current thread
+
+    The calls are scheduled using a single `call_soon_threadsafe()` per
+    event loop.
+
+    Returns
+    -------
+    int
+        The number of scheduled calls
+    """
+    calls = _deferred.calls
+    if not calls:
+        return 0
+    _deferred.calls = {}
+    count = 0
+    for event_loop, batch in calls.items():
+        try:
+            event_loop.call_soon_threadsafe(_run_batch, batch)
+        except RuntimeError:
+            pass  # The event loop has been closed
+        count += len(batch)
+    return count
+
+
+def _run_batch(batch):
+    for func, args in batch:
+        func(*args)
+
+
+def _call_soon(event_loop, func, *args):
+    """Call `func(*args)` in the thread of `event_loop`
+
+    In a progress thread, the call is deferred until the thread calls
+    `_flush_deferred()`. Otherwise, the call is made immediately.
+
+    Parameters
+    ----------
+    event_loop: asyncio.EventLoop
+        The event loop to call `func` in. If None, the event loop progressed
+        by the current thread is used.
+    func: callable
+        The function to call
+    """
+    calls = getattr(_deferred, "calls", None)
+    if calls is None:
+        func(*args)
+    else:
+        if event_loop is None:
+            event_loop = _deferred.event_loop
+        calls.setdefault(event_loop, []).append((func, args))
+
+
+def _set_future(event_loop, future, exception, result):
     if event_loop.is_closed() or future.done():
         return
     if exception is not None:
         future.set_exception(exception)
     else:
-        future.set_result(True)
+        future.set_result(result)
+
+
+def _cb_func(request, exception, event_loop, future):
+    _call_soon(event_loop, _set_future, event_loop, future, exception, True)
+
+
+def _cb_func_sender_tag(request, exception, event_loop, future):
+    # Notice, the sender tag must be read before the request is closed
+    sender_tag = None if exception is not None else request.sender_tag
+    _call_soon(event_loop, _set_future, event_loop, future, exception, sender_tag)
 
 
 def _call_ucx_api(event_loop, func, *args, **kwargs):
@@ -46,6 +129,74 @@ def tag_send(
     )
 
 
+def tag_send_many(
+    ep: ucx_api.UCXEndpoint,
+    buffers: list,
+    nbytes: list,
+    tags: list,
+    name="tag_send_many",
+    event_loop=None,
+) -> asyncio.Future:
+
+    return _call_ucx_api(
+        event_loop, ucx_api.tag_send_nb_many, ep, buffers, nbytes, tags, name=name
+    )
+
+
+def tag_send_iov(
+    ep: ucx_api.UCXEndpoint,
+    buffers: list,
+    tag: int,
+    name="tag_send_iov",
+    event_loop=None,
+) -> asyncio.Future:
+
+    return _call_ucx_api(
+        event_loop, ucx_api.tag_send_iov_nb, ep, buffers, tag, name=name
+    )
+
+
+def am_send(
+    ep: ucx_api.UCXEndpoint,
+    am_id: int,
+    buffers: list,
+    name="am_send",
+    event_loop=None,
+) -> asyncio.Future:
+
+    return _call_ucx_api(event_loop, ucx_api.am_send_nb, ep, am_id, buffers, name=name)
+
+
+def put(
+    ep: ucx_api.UCXEndpoint,
+    buffer: arr.Array,
+    nbytes: int,
+    remote_addr: int,
+    rkey: ucx_api.UCXRkey,
+    name="put",
+    event_loop=None,
+) -> asyncio.Future:
+
+    return _call_ucx_api(
+        event_loop, ucx_api.put_nb, ep, buffer, nbytes, remote_addr, rkey, name=name
+    )
+
+
+def get(
+    ep: ucx_api.UCXEndpoint,
+    buffer: arr.Array,
+    nbytes: int,
+    remote_addr: int,
+    rkey: ucx_api.UCXRkey,
+    name="get",
+    event_loop=None,
+) -> asyncio.Future:
+
+    return _call_ucx_api(
+        event_loop, ucx_api.get_nb, ep, buffer, nbytes, remote_addr, rkey, name=name
+    )
+
+
 def stream_send(
     ep: ucx_api.UCXEndpoint,
     buffer: arr.Array,
@@ -66,6 +217,7 @@ def tag_recv(
     tag: int,
     name="tag_recv",
     event_loop=None,
+    tag_mask=ucx_api.TAG_MASK_FULL,
 ) -> asyncio.Future:
 
     return _call_ucx_api(
@@ -75,6 +227,98 @@ def tag_recv(
         buffer,
         nbytes,
         tag,
+        tag_mask=tag_mask,
+        name=name,
+        ep=ep,
+    )
+
+
+def tag_recv_masked(
+    worker: ucx_api.UCXWorker,
+    buffer: arr.Array,
+    nbytes: int,
+    tag: int,
+    tag_mask: int,
+    name="tag_recv_masked",
+    event_loop=None,
+    ep: ucx_api.UCXEndpoint = None,
+) -> asyncio.Future:
+    """Receive a message matching `tag` on the bits set in `tag_mask`
+
+    As opposed to `tag_recv()`, the returned future resolves to
+    the full tag of the matched message.
+    """
+    event_loop = event_loop if event_loop else asyncio.get_event_loop()
+    ret = event_loop.create_future()
+    ucx_api.tag_recv_nb(
+        worker,
+        buffer,
+        nbytes,
+        tag,
+        cb_func=_cb_func_sender_tag,
+        tag_mask=tag_mask,
+        cb_args=(event_loop, ret),
+        name=name,
+        ep=ep,
+    )
+    return ret
+
+
+def _cb_func_probe(request, exception, event_loop, future, cell):
+    _call_soon(event_loop, _set_future, event_loop, future, exception, cell[0])
+
+
+def tag_recv_probe(
+    ep: ucx_api.UCXEndpoint,
+    tag: int,
+    allocator,
+    name="tag_recv_probe",
+    event_loop=None,
+    tag_mask=ucx_api.TAG_MASK_FULL,
+) -> asyncio.Future:
+    """Receive a message of unknown size
+
+    The returned future resolves to the buffer returned by
+    `allocator(nbytes)`, which is called when the message arrives. Notice,
+    in the "thread" progress mode `allocator` is called in the progress thread.
+    """
+    event_loop = event_loop if event_loop else asyncio.get_event_loop()
+    ret = event_loop.create_future()
+    cell = [None]
+
+    def allocate(nbytes):
+        cell[0] = allocator(nbytes)
+        return cell[0]
+
+    ucx_api.tag_recv_probe_nb(
+        ep.worker,
+        tag,
+        allocate,
+        cb_func=_cb_func_probe,
+        tag_mask=tag_mask,
+        cb_args=(event_loop, ret, cell),
+        name=name,
+        ep=ep,
+    )
+    return ret
+
+
+def tag_recv_many(
+    ep: ucx_api.UCXEndpoint,
+    buffers: list,
+    nbytes: list,
+    tags: list,
+    name="tag_recv_many",
+    event_loop=None,
+) -> asyncio.Future:
+
+    return _call_ucx_api(
+        event_loop,
+        ucx_api.tag_recv_nb_many,
+        ep.worker,
+        buffers,
+        nbytes,
+        tags,
         name=name,
         ep=ep,
     )
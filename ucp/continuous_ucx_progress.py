@@ -2,9 +2,17 @@
 # See file LICENSE for terms.
 
 import asyncio
+import logging
+import select
 import socket
+import threading
+import time
 import weakref
 
+from . import comm
+
+logger = logging.getLogger("ucx")
+
 
 class ProgressTask(object):
     def __init__(self, worker, event_loop):
@@ -109,3 +117,207 @@ class BlockingMode(ProgressTask):
                 # At this point we know that asyncio's next state is
                 # epoll wait.
                 break
+
+
+class AdaptiveMode(ProgressTask):
+    def __init__(
+        self,
+        worker,
+        event_loop,
+        epoll_fd,
+        spin_time=None,
+        min_spin_time=1e-5,
+        max_spin_time=1e-2,
+    ):
+        """Progress by spinning during activity and blocking when idle
+
+        After a wakeup, the worker is progressed continuously like
+        NonBlockingMode until no events have been progressed for `spin_time`
+        seconds. Then the worker is armed and progress blocks on the epoll
+        file descriptor like BlockingMode.
+
+        Parameters
+        ----------
+        worker: UCXWorker
+            The UCX worker context to progress
+        event_loop: asyncio.EventLoop
+            The event loop to do progress in.
+        epoll_fd: int
+            The epoll file descriptor of the worker
+        spin_time: float, optional
+            The number of idle seconds before blocking. If None, the spin
+            time is self-tuned between `min_spin_time` and `max_spin_time`:
+            it is doubled when the worker wakes up within the spin time after
+            blocking, which means it blocked in the middle of a burst, and
+            halved when the worker stays blocked for a long time.
+        """
+        super().__init__(worker, event_loop)
+        self.self_tuned = spin_time is None
+        self.spin_time = min_spin_time * 10 if spin_time is None else spin_time
+        self.min_spin_time = min_spin_time
+        self.max_spin_time = max_spin_time
+        self.mode = "blocking"
+        self.transitions = 0  # Number of mode transitions
+        self._blocked_at = None
+
+        # See BlockingMode
+        self.rsock, wsock = socket.socketpair()
+        self.rsock.setblocking(0)
+        wsock.setblocking(0)
+        wsock.close()
+        event_loop.add_reader(epoll_fd, self._fd_reader_callback)
+        weakref.finalize(self, event_loop.remove_reader, epoll_fd)
+        weakref.finalize(self, self.rsock.close)
+
+    def _set_mode(self, mode):
+        if mode != self.mode:
+            self.transitions += 1
+            logger.debug(
+                "AdaptiveMode: %s -> %s (spin time: %.1e s)"
+                % (self.mode, mode, self.spin_time)
+            )
+            self.mode = mode
+
+    def _tune_spin_time(self):
+        blocked = time.monotonic() - self._blocked_at
+        if blocked < self.spin_time:
+            self.spin_time = min(self.spin_time * 2, self.max_spin_time)
+        elif blocked > self.spin_time * 100:
+            self.spin_time = max(self.spin_time / 2, self.min_spin_time)
+
+    def _fd_reader_callback(self):
+        worker = self.weakref_worker()
+        if worker is None or not worker.initialized:
+            return
+        worker.progress()
+        if self.asyncio_task is not None and not self.asyncio_task.done():
+            return  # Already spinning
+        if self.self_tuned and self._blocked_at is not None:
+            self._tune_spin_time()
+        self._set_mode("spinning")
+        self.asyncio_task = self.event_loop.create_task(self._spin())
+
+    async def _spin(self):
+        last_activity = time.monotonic()
+        while True:
+            worker = self.weakref_worker()
+            if worker is None or not worker.initialized:
+                return
+            if worker.progress() > 0:
+                last_activity = time.monotonic()
+            del worker
+            if time.monotonic() - last_activity < self.spin_time:
+                # Give other co-routines a chance to run.
+                await asyncio.sleep(0)
+                continue
+
+            # Idle, thus we try to arm the worker like BlockingMode, which
+            # requires all non-IO tasks to be finished.
+            await self.event_loop.sock_recv(self.rsock, 1)
+            worker = self.weakref_worker()
+            if worker is None or not worker.initialized:
+                return
+            if worker.arm():
+                self._blocked_at = time.monotonic()
+                self._set_mode("blocking")
+                return
+            last_activity = time.monotonic()
+
+
+# The bounds of the sleep between iterations of an idle progress thread
+_MIN_BACKOFF = 1e-6
+_MAX_BACKOFF = 1e-4
+
+
+def _progress_thread(weakref_worker, event_loop, epoll_fd, stop, spin_time, timeout):
+    """The loop of the progress thread of `ThreadMode`
+
+    Notice, the thread only holds a reference to the worker while progressing.
+    """
+    comm._defer_calls(event_loop)
+    last_activity = time.monotonic()
+    backoff = 0
+    while not stop.is_set():
+        worker = weakref_worker()
+        if worker is None or not worker.initialized:
+            return
+        # The GIL is released while UCX progresses
+        if worker.progress() > 0:
+            last_activity = time.monotonic()
+            backoff = 0
+        # All completions of a progress iteration are handed to the event
+        # loop at once
+        comm._flush_deferred()
+        if time.monotonic() - last_activity < spin_time:
+            del worker
+            # Sleeping releases the GIL to the event loop. The sleep grows
+            # while nothing is progressed, thus an idle spin doesn't keep
+            # competing with the event loop for the GIL.
+            time.sleep(backoff)
+            backoff = min(max(2 * backoff, _MIN_BACKOFF), _MAX_BACKOFF)
+            continue
+        armed = worker.arm()
+        del worker
+        if armed:
+            # Idle, thus we wait on the epoll file descriptor, which releases
+            # the GIL. The timeout makes sure that `stop` is checked.
+            readable, _, _ = select.select([epoll_fd], [], [], timeout)
+            if readable:
+                last_activity = time.monotonic()
+
+
+def _stop_progress_thread(stop, thread):
+    stop.set()
+    if thread is not threading.current_thread():
+        thread.join()
+
+
+class ThreadMode(ProgressTask):
+    def __init__(self, worker, event_loop, epoll_fd, spin_time=1e-3, timeout=1e-2):
+        """Progress in a background thread
+
+        The worker is progressed by a daemon thread, which releases the GIL
+        while UCX progresses thus communication continues while the event loop
+        runs Python code. Like AdaptiveMode, the thread progresses continuously
+        during activity and blocks on the epoll file descriptor when idle.
+
+        UCX call-back functions are called in the progress thread, which defers
+        the completion of futures and other calls that must run in the event
+        loop (see `comm._call_soon()`). The deferred calls of a progress
+        iteration are scheduled using a single `call_soon_threadsafe()`.
+
+        Parameters
+        ----------
+        worker: UCXWorker
+            The UCX worker context to progress
+        event_loop: asyncio.EventLoop
+            The event loop to complete futures in.
+        epoll_fd: int
+            The epoll file descriptor of the worker
+        spin_time: float, optional
+            The number of idle seconds before blocking
+        timeout: float, optional
+            The maximum number of seconds to block at a time, which bounds
+            the time it takes to stop the thread.
+        """
+        super().__init__(worker, event_loop)
+        self._stop = threading.Event()
+        # Notice, the thread must not reference `self`
+        self.thread = threading.Thread(
+            target=_progress_thread,
+            args=(
+                self.weakref_worker,
+                event_loop,
+                epoll_fd,
+                self._stop,
+                spin_time,
+                timeout,
+            ),
+            name="ucx-progress",
+            daemon=True,
+        )
+        self.thread.start()
+
+        # Stop the thread on finalization, which must happen before
+        # the epoll file descriptor is closed
+        weakref.finalize(self, _stop_progress_thread, self._stop, self.thread)
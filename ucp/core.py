@@ -2,23 +2,39 @@
 # Copyright (c) 2020       UT-Battelle, LLC. All rights reserved.
 # See file LICENSE for terms.
 
-import array
 import asyncio
+import collections
+import functools
 import gc
 import logging
 import os
 import re
 import struct
+import time
 import weakref
 from functools import partial
 from os import close as close_fd
 
+import numpy as np
+
 from . import comm
 from ._libs import ucx_api
 from ._libs.arr import Array
-from .continuous_ucx_progress import BlockingMode, NonBlockingMode
-from .exceptions import UCXCanceled, UCXCloseError, UCXError
-from .utils import hash64bits, nvtx_annotate
+from .buffer_pool import BufferPool
+from .continuous_ucx_progress import (
+    AdaptiveMode,
+    BlockingMode,
+    NonBlockingMode,
+    ThreadMode,
+)
+from .exceptions import (
+    UCXCanceled,
+    UCXCloseError,
+    UCXConnectionError,
+    UCXError,
+)
+from .registration_cache import RegistrationCache
+from .utils import bytes_hash64, hash64bits, nvtx_annotate
 
 logger = logging.getLogger("ucx")
 
@@ -35,41 +51,156 @@ def _get_ctx():
     return _ctx
 
 
-async def exchange_peer_info(
-    endpoint, msg_tag, ctrl_tag, guarantee_msg_order, listener
-):
-    """Help function that exchange endpoint information"""
+# Layout of the 64-bit UCX tags used by endpoints:
+#
+#   bit  63     : Set for control messages such as shutdown
+#   bits 62..35 : Endpoint ID, picked by the receiving side of the endpoint
+#   bit  34     : Set when the user tag is hashed
+#   bits 33..14 : User tag, zero when no tag is given
+#   bits 13..0  : Sequence number, used when `guarantee_msg_order=True`
+#
+# The fields make it possible to match messages using a tag mask e.g. any
+# user tag on an endpoint or any endpoint on the worker. The user tag mask
+# includes the hashed bit thus hashed tags never match integer tags.
+#
+# Notice, hashed tags are only 20 bits thus out of N distinct hashed tags
+# used on an endpoint, two collide with a probability of about N**2 / 2**21
+# (e.g. 4% for 300 tags). Also, with `guarantee_msg_order=True` at most
+# 2**14 messages of the same tag may be in flight before the sequence
+# number wraps around.
+TAG_CTRL_BIT = 1 << 63
+TAG_ENDPOINT_SHIFT = 35
+TAG_ENDPOINT_MASK = ((1 << 28) - 1) << TAG_ENDPOINT_SHIFT
+TAG_HASHED_BIT = 1 << 34
+TAG_USER_SHIFT = 14
+TAG_USER_MASK = TAG_HASHED_BIT | ((1 << 20) - 1) << TAG_USER_SHIFT
+TAG_SEQUENCE_MASK = (1 << TAG_USER_SHIFT) - 1
+TAG_MAX_USER_TAG = (1 << 20) - 1
+
+
+def _new_endpoint_tags(ctx, handle):
+    """Generate the message and control tags of a new endpoint
+
+    The tags are redrawn until neither is used by another endpoint of `ctx`
+    """
+    ctrl_tags = {ep._tags["ctrl_recv"] for ep in ctx.endpoints_by_tag.values()}
+    while True:
+        seed = os.urandom(16)
+        msg_tag = hash64bits("msg_tag", seed, handle) & TAG_ENDPOINT_MASK
+        ctrl_tag = hash64bits("ctrl_tag", seed, handle) & TAG_ENDPOINT_MASK
+        # Endpoint ID zero is reserved
+        if msg_tag == 0 or ctrl_tag == 0:
+            continue
+        ctrl_tag |= TAG_CTRL_BIT
+        if msg_tag not in ctx.endpoints_by_tag and ctrl_tag not in ctrl_tags:
+            return msg_tag, ctrl_tag
+
+
+def _user_tag_bits(tag):
+    """Encode a user tag into its tag field
+
+    Integer tags in the range [0, TAG_MAX_USER_TAG) are encoded exactly
+    whereas other hashable tags are hashed into the field and flagged by
+    `TAG_HASHED_BIT`. Notice, str and bytes tags are hashed the same in all
+    processes but the hash of other tags is based on `hash()`, which might
+    be randomized (see PYTHONHASHSEED).
+    """
+    if tag is None:
+        return 0
+    if isinstance(tag, int) and 0 <= tag < TAG_MAX_USER_TAG:
+        return (tag + 1) << TAG_USER_SHIFT
+    if isinstance(tag, str):
+        data = tag.encode()
+    elif isinstance(tag, bytes):
+        data = tag
+    else:
+        data = (hash(tag) & 0xFFFFFFFFFFFFFFFF).to_bytes(8, "little")
+    return _hashed_user_tag_bits(data)
 
-    # Pack peer information incl. a checksum
-    fmt = "QQ?Q"
-    my_info = struct.pack(
-        fmt,
+
+@functools.lru_cache(maxsize=4096)
+def _hashed_user_tag_bits(data):
+    """The tag field of the hashed user tag encoded as the bytes `data`"""
+    field = bytes_hash64(data) % TAG_MAX_USER_TAG + 1
+    return TAG_HASHED_BIT | field << TAG_USER_SHIFT
+
+
+def _decode_user_tag(ucx_tag):
+    """Extract the user tag of a matched UCX tag
+
+    Returns None for messages sent without a tag. Notice, only integer
+    tags in the range [0, TAG_MAX_USER_TAG) are recovered exactly,
+    other tags are returned as their hash, which is outside of that range.
+    """
+    field = (ucx_tag & TAG_USER_MASK) >> TAG_USER_SHIFT
+    return None if field == 0 else field - 1
+
+
+def _ucx_tag(endpoint_tag, tag, seq=None):
+    """Compose the UCX tag of a message"""
+    ret = endpoint_tag | _user_tag_bits(tag)
+    if seq is not None:
+        ret |= seq & TAG_SEQUENCE_MASK
+    return ret
+
+
+# Header of `Endpoint.send_chunked()`: the total size and the chunk size
+_CHUNK_HEADER = struct.Struct("QQ")
+
+
+def _chunk_size(nbytes):
+    """The default chunk size of `Endpoint.send_chunked()`
+
+    Aims at 16 chunks of at least 1MB and at most 64MB.
+    """
+    return min(max(nbytes // 16, 2 ** 20), 2 ** 26)
+
+
+class _ArrayRange:
+    """A byte range of an `Array`, which keeps the array alive"""
+
+    def __init__(self, array, start, stop):
+        self.array = array
+        iface = {
+            "data": (array.ptr + start, array.readonly),
+            "shape": (stop - start,),
+            "typestr": "|u1",
+            "version": 2,
+        }
+        if array.cuda:
+            self.__cuda_array_interface__ = iface
+        else:
+            self.__array_interface__ = iface
+
+    def as_array(self):
+        if self.array.cuda:
+            return Array(self)
+        return Array(np.asarray(self))
+
+
+# Peer information of the endpoint setup: the message and control tags,
+# guarantee_msg_order and a checksum
+_PEER_INFO = struct.Struct("QQ?Q")
+
+
+def _pack_peer_info(msg_tag, ctrl_tag, guarantee_msg_order):
+    return _PEER_INFO.pack(
         msg_tag,
         ctrl_tag,
         guarantee_msg_order,
         hash64bits(msg_tag, ctrl_tag, guarantee_msg_order),
     )
-    peer_info = bytearray(len(my_info))
-    my_info_arr = Array(my_info)
-    peer_info_arr = Array(peer_info)
 
-    # Send/recv peer information. Notice, we force an `await` between the two
-    # streaming calls (see <https://github.com/rapidsai/ucx-py/pull/509>)
-    if listener is True:
-        await comm.stream_send(endpoint, my_info_arr, my_info_arr.nbytes)
-        await comm.stream_recv(endpoint, peer_info_arr, peer_info_arr.nbytes)
-    else:
-        await comm.stream_recv(endpoint, peer_info_arr, peer_info_arr.nbytes)
-        await comm.stream_send(endpoint, my_info_arr, my_info_arr.nbytes)
 
-    # Unpacking and sanity check of the peer information
+def _unpack_peer_info(peer_info, guarantee_msg_order):
+    """Unpacking and sanity check of the peer information"""
     ret = {}
     (
         ret["msg_tag"],
         ret["ctrl_tag"],
         ret["guarantee_msg_order"],
         ret["checksum"],
-    ) = struct.unpack(fmt, peer_info)
+    ) = _PEER_INFO.unpack(peer_info)
 
     expected_checksum = hash64bits(
         ret["msg_tag"], ret["ctrl_tag"], ret["guarantee_msg_order"]
@@ -86,6 +217,85 @@ async def exchange_peer_info(
     return ret
 
 
+async def exchange_peer_info(
+    endpoint, msg_tag, ctrl_tag, guarantee_msg_order, listener
+):
+    """Help function that exchange endpoint information"""
+
+    # Pack peer information incl. a checksum
+    my_info = _pack_peer_info(msg_tag, ctrl_tag, guarantee_msg_order)
+    peer_info = bytearray(len(my_info))
+    my_info_arr = Array(my_info)
+    peer_info_arr = Array(peer_info)
+
+    # Send/recv peer information. Notice, we force an `await` between the two
+    # streaming calls (see <https://github.com/rapidsai/ucx-py/pull/509>)
+    if listener is True:
+        await comm.stream_send(endpoint, my_info_arr, my_info_arr.nbytes)
+        await comm.stream_recv(endpoint, peer_info_arr, peer_info_arr.nbytes)
+    else:
+        await comm.stream_recv(endpoint, peer_info_arr, peer_info_arr.nbytes)
+        await comm.stream_send(endpoint, my_info_arr, my_info_arr.nbytes)
+
+    return _unpack_peer_info(peer_info, guarantee_msg_order)
+
+
+# Hash of the address of the sending worker, which prefixes the peer
+# information exchanged by `exchange_peer_info_by_address()`
+_WIREUP_SENDER = struct.Struct("Q")
+
+
+def _wireup_tag(address):
+    """The tag of the peer information sent by the worker of `address`
+
+    Wireup messages set both the control bit and all user tag bits, which
+    no other message does, and the endpoint and sequence fields are a 42 bit
+    hash of the address of the sending worker.
+    """
+    h = bytes_hash64(bytes(address))
+    return (
+        TAG_CTRL_BIT
+        | TAG_USER_MASK
+        | ((h << TAG_ENDPOINT_SHIFT) & TAG_ENDPOINT_MASK)
+        | ((h >> 28) & TAG_SEQUENCE_MASK)
+    )
+
+
+async def exchange_peer_info_by_address(
+    endpoint, msg_tag, ctrl_tag, guarantee_msg_order, my_address, peer_address
+):
+    """Help function that exchange endpoint information over tag messages
+
+    Unlike `exchange_peer_info()`, this works on endpoints created from a
+    worker address, which have no stream connection to the peer. The peer
+    must create an endpoint to `my_address` and exchange its information
+    simultaneously.
+
+    The tags of the messages are hashes of the worker addresses thus the
+    sender of the received information is checked against `peer_address`.
+    """
+    my_info = _WIREUP_SENDER.pack(hash64bits(bytes(my_address)))
+    my_info += _pack_peer_info(msg_tag, ctrl_tag, guarantee_msg_order)
+    peer_info = bytearray(len(my_info))
+    my_info_arr = Array(my_info)
+    peer_info_arr = Array(peer_info)
+    await asyncio.gather(
+        comm.tag_send(
+            endpoint, my_info_arr, my_info_arr.nbytes, _wireup_tag(my_address)
+        ),
+        comm.tag_recv(
+            endpoint,
+            peer_info_arr,
+            peer_info_arr.nbytes,
+            _wireup_tag(peer_address),
+        ),
+    )
+    (sender,) = _WIREUP_SENDER.unpack_from(peer_info)
+    if sender != hash64bits(bytes(peer_address)):
+        raise UCXError("Received the peer information of another worker")
+    return _unpack_peer_info(peer_info[_WIREUP_SENDER.size :], guarantee_msg_order)
+
+
 class CtrlMsg:
     """Implementation of control messages
 
@@ -106,18 +316,20 @@ class CtrlMsg:
         return struct.unpack(CtrlMsg.fmt, serialized_bytes)
 
     @staticmethod
-    def handle_ctrl_msg(ep_weakref, log, msg, future):
+    def handle_ctrl_msg(ep_weakref, log, msg, pool, future):
         """Function that is called when receiving the control message"""
         try:
             future.result()
         except UCXCanceled:
+            pool.release(msg)
             return  # The ctrl signal was canceled
         logger.debug(log)
+        opcode, close_after_n_recv = CtrlMsg.deserialize(msg)
+        pool.release(msg)
         ep = ep_weakref()
         if ep is None or ep.closed():
             return  # The endpoint is closed
 
-        opcode, close_after_n_recv = CtrlMsg.deserialize(msg)
         if opcode == 1:
             ep.close_after_n_recv(close_after_n_recv, count_from_ep_creation=True)
         else:
@@ -130,41 +342,48 @@ class CtrlMsg:
             hex(ep.uid),
             hex(ep._tags["ctrl_recv"]),
         )
-        msg = bytearray(CtrlMsg.nbytes)
+        pool = ep._ctx.buffer_pool
+        msg = pool.allocate(CtrlMsg.nbytes)
         msg_arr = Array(msg)
         shutdown_fut = comm.tag_recv(
             ep._ep, msg_arr, msg_arr.nbytes, ep._tags["ctrl_recv"], name=log,
         )
 
         shutdown_fut.add_done_callback(
-            partial(CtrlMsg.handle_ctrl_msg, weakref.ref(ep), log, msg)
+            partial(CtrlMsg.handle_ctrl_msg, weakref.ref(ep), log, msg, pool)
         )
 
 
-async def _listener_handler_coroutine(
-    conn_request, ctx, func, guarantee_msg_order, endpoint_error_handling
-):
-    # We create the Endpoint in five steps:
-    #  1) Create endpoint from conn_request
-    #  2) Generate unique IDs to use as tags
-    #  3) Exchange endpoint info such as tags
-    #  4) Setup control receive callback
-    #  5) Execute the listener's callback function
-    endpoint = ctx.worker.ep_create_from_conn_request(
-        conn_request, endpoint_error_handling
-    )
-
-    seed = os.urandom(16)
-    msg_tag = hash64bits("msg_tag", seed, endpoint.handle)
-    ctrl_tag = hash64bits("ctrl_tag", seed, endpoint.handle)
+async def _setup_endpoint(ctx, ucx_ep, guarantee_msg_order, listener, addresses=None):
+    """Create an Endpoint from a connected UCX endpoint
 
-    peer_info = await exchange_peer_info(
-        endpoint=endpoint,
-        msg_tag=msg_tag,
-        ctrl_tag=ctrl_tag,
-        guarantee_msg_order=guarantee_msg_order,
-        listener=True,
-    )
+    We create the Endpoint in four steps:
+     1) Generate unique IDs to use as tags
+     2) Exchange endpoint info such as tags, over tag messages if the
+        endpoint was created from the worker address in `addresses`
+     3) Use the info to create an endpoint
+     4) Setup control receive callback
+    """
+    msg_tag, ctrl_tag = _new_endpoint_tags(ctx, ucx_ep.handle)
+    if addresses is None:
+        peer_info = await exchange_peer_info(
+            endpoint=ucx_ep,
+            msg_tag=msg_tag,
+            ctrl_tag=ctrl_tag,
+            guarantee_msg_order=guarantee_msg_order,
+            listener=listener,
+        )
+        name = "_listener_handler() server" if listener else "create_endpoint() client"
+    else:
+        peer_info = await exchange_peer_info_by_address(
+            endpoint=ucx_ep,
+            msg_tag=msg_tag,
+            ctrl_tag=ctrl_tag,
+            guarantee_msg_order=guarantee_msg_order,
+            my_address=addresses[0],
+            peer_address=addresses[1],
+        )
+        name = "create_endpoint_from_worker_address()"
     tags = {
         "msg_send": peer_info["msg_tag"],
         "msg_recv": msg_tag,
@@ -172,14 +391,15 @@ async def _listener_handler_coroutine(
         "ctrl_recv": ctrl_tag,
     }
     ep = Endpoint(
-        endpoint=endpoint, ctx=ctx, guarantee_msg_order=guarantee_msg_order, tags=tags
+        endpoint=ucx_ep, ctx=ctx, guarantee_msg_order=guarantee_msg_order, tags=tags
     )
 
     logger.debug(
-        "_listener_handler() server: %s, msg-tag-send: %s, "
+        "%s: %s, msg-tag-send: %s, "
         "msg-tag-recv: %s, ctrl-tag-send: %s, ctrl-tag-recv: %s"
         % (
-            hex(endpoint.handle),
+            name,
+            hex(ucx_ep.handle),
             hex(ep._tags["msg_send"]),
             hex(ep._tags["msg_recv"]),
             hex(ep._tags["ctrl_send"]),
@@ -187,39 +407,267 @@ async def _listener_handler_coroutine(
         )
     )
 
-    # Setup the control receive
     CtrlMsg.setup_ctrl_recv(ep)
+    return ep
 
-    # Removing references here to avoid delayed clean up
-    del ctx
 
-    # Finally, we call `func`
-    if asyncio.iscoroutinefunction(func):
-        await func(ep)
-    else:
-        func(ep)
+ACCEPT_MODES = ("callback", "queue")
 
 
-def _listener_handler(
-    conn_request, callback_func, ctx, guarantee_msg_order, endpoint_error_handling
+class _Acceptor:
+    """Admission control and metrics of the connections of a listener
+
+    A connection is pending from its arrival until it is handed over: when
+    the listener's callback function returns or, in the "queue" accept mode,
+    when the endpoint is returned by `Listener.accept()`.
+    """
+
+    def __init__(self, accept, max_pending):
+        if accept not in ACCEPT_MODES:
+            raise ValueError(
+                "Unknown accept mode %r, expected one of %s" % (accept, ACCEPT_MODES)
+            )
+        if max_pending is not None and max_pending < 1:
+            raise ValueError("max_pending must be positive")
+        self.accept = accept
+        self.max_pending = max_pending
+        self.queue = collections.deque()  # Accepted endpoints: (Endpoint, arrival)
+        self.waiters = collections.deque()  # Futures of `Listener.accept()`
+        self.listener = None  # Weak reference to the Listener
+        self.closed = False
+        self.pending = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def admit(self):
+        if self.max_pending is not None and self.pending >= self.max_pending:
+            self.rejected += 1
+            return False
+        self.pending += 1
+        return True
+
+    def handed_over(self, arrival):
+        self.pending -= 1
+        self.accepted += 1
+        latency = time.monotonic() - arrival
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def put(self, ep, arrival):
+        """Hand over `ep` to a waiting `Listener.accept()` or queue it"""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                self.handed_over(arrival)
+                waiter.set_result(ep)
+                return
+        self.queue.append((ep, arrival))
+        self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+
+    def close(self):
+        self.closed = True
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(UCXCloseError("Listener closed"))
+
+
+async def _listener_handler_coroutine(
+    conn_request,
+    ctx,
+    worker,
+    func,
+    guarantee_msg_order,
+    endpoint_error_handling,
+    prologue,
+    acceptor,
+    arrival,
 ):
+    # We create the Endpoint in four steps:
+    #  1) Create endpoint from conn_request
+    #  2) Run the prologue, which might take over the connection
+    #  3) Setup the Endpoint
+    #  4) Execute the listener's callback function or queue the endpoint
+    try:
+        endpoint = worker.ep_create_from_conn_request(
+            conn_request, endpoint_error_handling
+        )
+        if prologue is not None and not await prologue(endpoint):
+            acceptor.pending -= 1
+            return
+        ep = await _setup_endpoint(ctx, endpoint, guarantee_msg_order, listener=True)
+    except BaseException:
+        acceptor.pending -= 1
+        acceptor.failed += 1
+        raise
+
+    # Removing references here to avoid delayed clean up
+    del ctx, worker
+
+    if acceptor.accept == "queue":
+        acceptor.put(ep, arrival)
+        return
+
+    # Finally, we call `func`
+    try:
+        if asyncio.iscoroutinefunction(func):
+            await func(ep)
+        else:
+            func(ep)
+    finally:
+        acceptor.handed_over(arrival)
+
+
+def _accept_conn_request(
+    acceptor,
+    arrival,
+    conn_request,
+    ctx,
+    worker,
+    func,
+    guarantee_msg_order,
+    endpoint_error_handling,
+    prologue,
+):
+    """Start the handling of a connection request or reject it if overloaded"""
+    if not acceptor.admit():
+        listener = acceptor.listener and acceptor.listener()
+        if listener is not None and not listener.closed():
+            logger.debug("Listener overloaded, rejecting connection request")
+            listener._b.reject(conn_request)
+        else:
+            # The UCX listener is gone thus the connection request is released
+            # by closing an endpoint created from it
+            logger.debug("Listener closed, rejecting connection request")
+            worker.ep_create_from_conn_request(
+                conn_request, endpoint_error_handling
+            ).close()
+        return
     asyncio.ensure_future(
         _listener_handler_coroutine(
             conn_request,
             ctx,
-            callback_func,
+            worker,
+            func,
             guarantee_msg_order,
             endpoint_error_handling,
+            prologue,
+            acceptor,
+            arrival,
         )
     )
 
 
-def _epoll_fd_finalizer(epoll_fd, progress_tasks):
-    assert epoll_fd >= 0
+def _listener_handler(
+    conn_request,
+    callback_func,
+    ctx,
+    worker,
+    guarantee_msg_order,
+    endpoint_error_handling,
+    prologue,
+    acceptor,
+):
+    comm._call_soon(
+        None,
+        _accept_conn_request,
+        acceptor,
+        time.monotonic(),
+        conn_request,
+        ctx,
+        worker,
+        callback_func,
+        guarantee_msg_order,
+        endpoint_error_handling,
+        prologue,
+    )
+
+
+# Active Message ID of `Endpoint.am_send()`. The message starts with a header
+# containing the receive tag of the destination endpoint.
+_AM_ID_ENDPOINT = 0
+_AM_HEADER = struct.Struct("Q")
+
+
+def _am_handler(msg, ctx_ref):
+    """Deliver an Active Message sent by `Endpoint.am_send()`"""
+    ctx = ctx_ref()
+    if ctx is None:
+        return
+    (ep_tag,) = _AM_HEADER.unpack_from(msg)
+    buffer = ctx._am_allocator(msg.nbytes - _AM_HEADER.size)
+    memoryview(buffer).cast("B")[:] = msg[_AM_HEADER.size :]
+    # `msg` is only valid in this function but the delivery might be deferred
+    comm._call_soon(None, _am_route, ctx_ref, ep_tag, buffer)
+
+
+def _am_route(ctx_ref, ep_tag, buffer):
+    ctx = ctx_ref()
+    if ctx is None:
+        return
+    ep = ctx.endpoints_by_tag.get(ep_tag)
+    if ep is None:
+        # The message might arrive before its endpoint has been created
+        ctx._am_push_unmatched(ep_tag, buffer)
+    else:
+        # Messages of closed endpoints are dropped
+        ep._am_deliver(buffer)
+
+
+PROGRESS_MODES = ("blocking", "non-blocking", "adaptive", "thread")
+
+
+def _get_progress_mode(blocking_progress_mode, progress_mode):
+    """Resolve the progress mode from the arguments and environment variables"""
+    if progress_mode is None:
+        if blocking_progress_mode is not None:
+            return "blocking" if blocking_progress_mode else "non-blocking"
+        if "UCXPY_PROGRESS_MODE" in os.environ:
+            progress_mode = os.environ["UCXPY_PROGRESS_MODE"]
+        elif "UCXPY_NON_BLOCKING_MODE" in os.environ:
+            return "non-blocking"
+        else:
+            return "blocking"
+    elif blocking_progress_mode is not None:
+        raise ValueError("Cannot set both blocking_progress_mode and progress_mode")
+    if progress_mode not in PROGRESS_MODES:
+        raise ValueError(
+            "Unknown progress mode %r, must be one of %s"
+            % (progress_mode, ", ".join(PROGRESS_MODES))
+        )
+    return progress_mode
+
+
+WORKER_POLICIES = ("round-robin", "hash")
+
+
+def _get_worker_policy(n_workers, worker_policy):
+    """Resolve the number of workers and the worker policy"""
+    if n_workers is None:
+        n_workers = int(os.environ.get("UCXPY_N_WORKERS", 1))
+    if n_workers < 1:
+        raise ValueError("The number of workers must be positive: %d" % n_workers)
+    if worker_policy is None:
+        worker_policy = os.environ.get("UCXPY_WORKER_POLICY", "round-robin")
+    if worker_policy not in WORKER_POLICIES:
+        raise ValueError(
+            "Unknown worker policy %r, must be one of %s"
+            % (worker_policy, ", ".join(WORKER_POLICIES))
+        )
+    return n_workers, worker_policy
+
+
+def _epoll_fd_finalizer(epoll_fds, progress_tasks):
     # Notice, progress_tasks must be cleared before we close
-    # epoll_fd
+    # the epoll_fds
     progress_tasks.clear()
-    close_fd(epoll_fd)
+    for epoll_fd in epoll_fds:
+        assert epoll_fd >= 0
+        close_fd(epoll_fd)
 
 
 class ApplicationContext:
@@ -227,32 +675,127 @@ class ApplicationContext:
     The context of the Asyncio interface of UCX.
     """
 
-    def __init__(self, config_dict={}, blocking_progress_mode=None):
+    def __init__(
+        self,
+        config_dict={},
+        blocking_progress_mode=None,
+        progress_mode=None,
+        n_workers=None,
+        worker_policy=None,
+    ):
+        self.progress_mode = _get_progress_mode(blocking_progress_mode, progress_mode)
+        self.blocking_progress_mode = self.progress_mode != "non-blocking"
+        n_workers, self.worker_policy = _get_worker_policy(n_workers, worker_policy)
+        self._next_worker = 0  # The next worker of the round-robin policy
         self.progress_tasks = []
+        # Endpoints by the endpoint ID of their receive tag, which makes it
+        # possible to find the endpoint of a message received by `recv_any()`
+        self.endpoints_by_tag = weakref.WeakValueDictionary()
+        # The (worker index, peer worker address) of the endpoints being
+        # created by `create_endpoint_from_worker_address()`
+        self._wireups = set()
+
+        self.context = ucx_api.UCXContext(
+            config_dict,
+            feature_flags=(
+                ucx_api.Feature.TAG,
+                ucx_api.Feature.WAKEUP,
+                ucx_api.Feature.STREAM,
+                ucx_api.Feature.AM,
+                ucx_api.Feature.RMA,
+            ),
+        )
+        # Each worker has its own progress engine. Endpoints and listeners
+        # are assigned to a worker by `_select_worker()` and the first worker
+        # is used by the context-wide operations such as `recv_any()`.
+        self.workers = [ucx_api.UCXWorker(self.context) for _ in range(n_workers)]
+        self.worker = self.workers[0]
+
+        # In completion queue mode, the completions are delivered in batches by
+        # the progress of the workers. The capacity of the queue is set by the
+        # environment variable `UCXPY_COMPLETION_QUEUE_SIZE` (disabled by default)
+        queue_size = int(os.environ.get("UCXPY_COMPLETION_QUEUE_SIZE", 0))
+        if queue_size > 0:
+            for worker in self.workers:
+                worker.init_completion_queue(queue_size)
+
+        # Active Messages are received into buffers from `_am_allocator`.
+        # Notice, the handler only references this context weakly to avoid
+        # a reference cycle through the worker.
+        self._am_allocator = bytearray
+        # Active Messages of unknown endpoints as (arrival time, endpoint tag,
+        # buffer) in arrival order. At most `UCXPY_AM_UNMATCHED_MAX` messages
+        # are kept for `UCXPY_AM_UNMATCHED_TIMEOUT` seconds.
+        self._am_unmatched = collections.deque()
+        self._am_unmatched_max = int(os.environ.get("UCXPY_AM_UNMATCHED_MAX", 1024))
+        self._am_unmatched_timeout = float(
+            os.environ.get("UCXPY_AM_UNMATCHED_TIMEOUT", 60)
+        )
+        for worker in self.workers:
+            worker.am_register_handler(
+                _AM_ID_ENDPOINT, _am_handler, (weakref.ref(self),)
+            )
 
-        # For now, a application context only has one worker
-        self.context = ucx_api.UCXContext(config_dict)
-        self.worker = ucx_api.UCXWorker(self.context)
+        # Cache of the registrations of `mem_map(..., cache=True)`, the size
+        # budget in bytes is set by the environment variable
+        # `UCXPY_REGISTRATION_CACHE_SIZE` (unlimited by default)
+        cache_size = os.environ.get("UCXPY_REGISTRATION_CACHE_SIZE")
+        self.registration_cache = RegistrationCache(
+            self.context, max_bytes=None if cache_size is None else int(cache_size)
+        )
 
-        if blocking_progress_mode is not None:
-            self.blocking_progress_mode = blocking_progress_mode
-        elif "UCXPY_NON_BLOCKING_MODE" in os.environ:
-            self.blocking_progress_mode = False
-        else:
-            self.blocking_progress_mode = True
+        # Pool of receive buffers, the size budget of idle buffers in bytes is
+        # set by the environment variable `UCXPY_BUFFER_POOL_SIZE`
+        self.buffer_pool = BufferPool(
+            max_bytes=int(os.environ.get("UCXPY_BUFFER_POOL_SIZE", 2 ** 28))
+        )
 
         if self.blocking_progress_mode:
-            self.epoll_fd = self.worker.init_blocking_progress_mode()
+            self.epoll_fds = [w.init_blocking_progress_mode() for w in self.workers]
+            self.epoll_fd = self.epoll_fds[0]
             weakref.finalize(
-                self, _epoll_fd_finalizer, self.epoll_fd, self.progress_tasks
+                self, _epoll_fd_finalizer, self.epoll_fds, self.progress_tasks
             )
 
+    def _select_worker(self, worker=None, peer=None):
+        """Select the worker of a new endpoint or listener
+
+        Parameters
+        ----------
+        worker: int, optional
+            The index of the worker to select explicitly. If None, the
+            worker is selected by the worker policy of this context.
+        peer: tuple, optional
+            The address of the peer, which the "hash" policy hashes.
+            If None, the worker is selected round-robin.
+
+        Returns
+        -------
+        int
+            The index of the selected worker
+        """
+        if worker is not None:
+            if not 0 <= worker < len(self.workers):
+                raise ValueError(
+                    "Invalid worker %d, the context has %d workers"
+                    % (worker, len(self.workers))
+                )
+            return worker
+        if self.worker_policy == "hash" and peer is not None:
+            return hash64bits(*peer) % len(self.workers)
+        ret = self._next_worker
+        self._next_worker = (ret + 1) % len(self.workers)
+        return ret
+
     def create_listener(
         self,
         callback_func,
         port=0,
         guarantee_msg_order=False,
         endpoint_error_handling=False,
+        worker=None,
+        max_pending=None,
+        accept="callback",
     ):
         """Create and start a listener to accept incoming connections
 
@@ -266,7 +809,7 @@ class ApplicationContext:
         ----------
         callback_func: function or coroutine
             A callback function that gets invoked when an incoming
-            connection is accepted
+            connection is accepted. Must be None in the "queue" accept mode.
         port: int, optional
             An unused port number for listening, or `0` to let UCX assign
             an unused port.
@@ -277,34 +820,92 @@ class ApplicationContext:
             Enable endpoint error handling raising exceptions when an error
             occurs, may incur in performance penalties but prevents a process
             from terminating unexpectedly that may happen when disabled.
+        worker: int, optional
+            The index of the worker of the listener and its endpoints. If None,
+            the worker is selected by the worker policy of this context.
+        max_pending: int, optional
+            The maximum number of pending connections, which are connections
+            in the handshake, in `callback_func` or waiting in the accept
+            queue. Connection requests beyond this are rejected thus clients
+            see their connection fail instead of overloading the listener.
+            If None, the number is unlimited.
+        accept: str, optional
+            How to hand over the endpoints of accepted connections:
+            "callback" calls `callback_func` with every endpoint and "queue"
+            queues them for `Listener.accept()`, including `async for`.
 
         Returns
         -------
         Listener
             The new listener. When this object is deleted, the listening stops
         """
-        self.continuous_ucx_progress()
+        return self._create_listener(
+            callback_func,
+            port,
+            guarantee_msg_order,
+            endpoint_error_handling,
+            worker,
+            max_pending=max_pending,
+            accept=accept,
+        )
+
+    def _create_listener(
+        self,
+        callback_func,
+        port,
+        guarantee_msg_order,
+        endpoint_error_handling,
+        worker=None,
+        prologue=None,
+        max_pending=None,
+        accept="callback",
+    ):
+        """Create a listener that runs `prologue` on every new connection
+
+        `prologue` is a coroutine function called with the UCX endpoint of
+        an accepted connection before the endpoint info is exchanged. If it
+        returns False, the prologue has taken over the connection and no
+        Endpoint is created.
+        """
+        acceptor = _Acceptor(accept, max_pending)
+        if accept == "queue" and callback_func is not None:
+            raise ValueError("callback_func must be None in the 'queue' accept mode")
+        if accept == "callback" and callback_func is None:
+            raise ValueError("callback_func is required in the 'callback' accept mode")
         if port is None:
             port = 0
+        index = self._select_worker(worker, peer=(port,) if port else None)
+        self.continuous_ucx_progress(worker=index)
 
-        logger.info("create_listener() - Start listening on port %d" % port)
+        logger.info(
+            "create_listener() - Start listening on port %d (worker %d)" % (port, index)
+        )
         ret = Listener(
             ucx_api.UCXListener(
-                worker=self.worker,
+                worker=self.workers[index],
                 port=port,
                 cb_func=_listener_handler,
                 cb_args=(
                     callback_func,
                     self,
+                    self.workers[index],
                     guarantee_msg_order,
                     endpoint_error_handling,
+                    prologue,
+                    acceptor,
                 ),
-            )
+            ),
+            acceptor,
         )
         return ret
 
     async def create_endpoint(
-        self, ip_address, port, guarantee_msg_order, endpoint_error_handling=False
+        self,
+        ip_address,
+        port,
+        guarantee_msg_order,
+        endpoint_error_handling=False,
+        worker=None,
     ):
         """Create a new endpoint to a server
 
@@ -321,83 +922,209 @@ class ApplicationContext:
             Enable endpoint error handling raising exceptions when an error
             occurs, may incur in performance penalties but prevents a process
             from terminating unexpectedly that may happen when disabled.
+        worker: int, optional
+            The index of the worker of the endpoint. If None, the worker is
+            selected by the worker policy of this context.
 
         Returns
         -------
         Endpoint
             The new endpoint
         """
-        self.continuous_ucx_progress()
-        ucx_ep = self.worker.ep_create(ip_address, port, endpoint_error_handling)
-        self.worker.progress()
+        ucx_ep = self._ep_create(ip_address, port, endpoint_error_handling, worker)
+        return await _setup_endpoint(self, ucx_ep, guarantee_msg_order, listener=False)
 
-        # We create the Endpoint in three steps:
-        #  1) Generate unique IDs to use as tags
-        #  2) Exchange endpoint info such as tags
-        #  3) Use the info to create an endpoint
-        seed = os.urandom(16)
-        msg_tag = hash64bits("msg_tag", seed, ucx_ep.handle)
-        ctrl_tag = hash64bits("ctrl_tag", seed, ucx_ep.handle)
-        peer_info = await exchange_peer_info(
-            endpoint=ucx_ep,
-            msg_tag=msg_tag,
-            ctrl_tag=ctrl_tag,
-            guarantee_msg_order=guarantee_msg_order,
-            listener=False,
-        )
-        tags = {
-            "msg_send": peer_info["msg_tag"],
-            "msg_recv": msg_tag,
-            "ctrl_send": peer_info["ctrl_tag"],
-            "ctrl_recv": ctrl_tag,
-        }
-        ep = Endpoint(
-            endpoint=ucx_ep,
-            ctx=self,
-            guarantee_msg_order=guarantee_msg_order,
-            tags=tags,
-        )
+    async def create_endpoint_from_worker_address(
+        self,
+        address,
+        guarantee_msg_order=False,
+        endpoint_error_handling=False,
+        worker=0,
+    ):
+        """Create a new endpoint to a peer worker by its address
 
-        logger.debug(
-            "create_endpoint() client: %s, msg-tag-send: %s, "
-            "msg-tag-recv: %s, ctrl-tag-send: %s, ctrl-tag-recv: %s"
-            % (
-                hex(ep._ep.handle),
-                hex(ep._tags["msg_send"]),
-                hex(ep._tags["msg_recv"]),
-                hex(ep._tags["ctrl_send"]),
-                hex(ep._tags["ctrl_recv"]),
+        As opposed to `create_endpoint()`, no listener is needed, which makes
+        it much faster to connect large meshes of local processes. The worker
+        addresses must be exchanged out-of-band e.g. using an
+        `AddressDirectory`. Notice, the peer must call this function with
+        the address of our worker simultaneously.
+
+        The wireup messages are only told apart by the address of their
+        sender thus only one endpoint to a peer worker can be created at a
+        time, concurrent calls with the same peer raise UCXError.
+
+        Parameters
+        ----------
+        address: UCXAddress or bytes
+            The address of the peer's worker (see `get_worker_address()`)
+        guarantee_msg_order: boolean, optional
+            Whether to guarantee message order or not. Remember, both peers
+            of the endpoint must set guarantee_msg_order to the same value.
+        endpoint_error_handling: boolean, optional
+            Enable endpoint error handling raising exceptions when an error
+            occurs, may incur in performance penalties but prevents a process
+            from terminating unexpectedly that may happen when disabled.
+        worker: int, optional
+            The index of the worker of the endpoint, which must be the worker
+            whose address the peer has.
+
+        Returns
+        -------
+        Endpoint
+            The new endpoint
+        """
+        if not isinstance(address, ucx_api.UCXAddress):
+            address = ucx_api.UCXAddress.from_buffer(address)
+        index = self._select_worker(worker)
+        key = (index, bytes(address))
+        if key in self._wireups:
+            raise UCXError("An endpoint to the peer worker is already being created")
+        self._wireups.add(key)
+        try:
+            self.continuous_ucx_progress(worker=index)
+            ucx_worker = self.workers[index]
+            ucx_ep = ucx_worker.ep_create_from_worker_address(
+                address, endpoint_error_handling
             )
-        )
+            return await _setup_endpoint(
+                self,
+                ucx_ep,
+                guarantee_msg_order,
+                listener=False,
+                addresses=(ucx_worker.get_address(), address),
+            )
+        finally:
+            self._wireups.discard(key)
+
+    def _ep_create(self, ip_address, port, endpoint_error_handling, worker=None):
+        """Create a UCX endpoint to a listener without any handshake"""
+        index = self._select_worker(worker, peer=(ip_address, port))
+        self.continuous_ucx_progress(worker=index)
+        ucx_worker = self.workers[index]
+        ucx_ep = ucx_worker.ep_create(ip_address, port, endpoint_error_handling)
+        ucx_worker.progress()
+        return ucx_ep
+
+    async def create_endpoints(
+        self,
+        addresses,
+        guarantee_msg_order=False,
+        endpoint_error_handling=False,
+        concurrency=None,
+        timeout=None,
+        return_exceptions=False,
+    ):
+        """Create endpoints to multiple servers concurrently
 
-        # Setup the control receive
-        CtrlMsg.setup_ctrl_recv(ep)
-        return ep
+        Parameters
+        ----------
+        addresses: list of tuples
+            The IP address and port of each server
+        guarantee_msg_order: boolean, optional
+            Whether to guarantee message order or not. Remember, both peers
+            of the endpoint must set guarantee_msg_order to the same value.
+        endpoint_error_handling: boolean, optional
+            Enable endpoint error handling raising exceptions when an error
+            occurs, may incur in performance penalties but prevents a process
+            from terminating unexpectedly that may happen when disabled.
+        concurrency: int, optional
+            The maximum number of endpoints being created at a time. If None,
+            all endpoints are created at once.
+        timeout: float, optional
+            The number of seconds to wait for all endpoints, shared between
+            them. A connection that isn't established in time fails with
+            `asyncio.TimeoutError`.
+        return_exceptions: boolean, optional
+            Return the exception of failed connections in place of their
+            endpoint instead of raising `UCXConnectionError`.
 
-    def continuous_ucx_progress(self, event_loop=None):
+        Returns
+        -------
+        list
+            The new endpoints in the order of `addresses`
+
+        Raises
+        ------
+        UCXConnectionError
+            If some connections failed and `return_exceptions` is False. The
+            exception contains the errors and endpoints of all connections.
+        """
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("concurrency must be positive: %d" % concurrency)
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        semaphore = None if concurrency is None else asyncio.Semaphore(concurrency)
+
+        async def connect(ip_address, port):
+            if semaphore is not None:
+                await semaphore.acquire()
+            try:
+                coroutine = self.create_endpoint(
+                    ip_address,
+                    port,
+                    guarantee_msg_order,
+                    endpoint_error_handling=endpoint_error_handling,
+                )
+                if deadline is None:
+                    return await coroutine
+                return await asyncio.wait_for(coroutine, deadline - loop.time())
+            finally:
+                if semaphore is not None:
+                    semaphore.release()
+
+        results = await asyncio.gather(
+            *(connect(ip_address, port) for ip_address, port in addresses),
+            return_exceptions=True,
+        )
+        errors = {i: r for i, r in enumerate(results) if isinstance(r, Exception)}
+        if errors and not return_exceptions:
+            i, e = next(iter(errors.items()))
+            raise UCXConnectionError(
+                "Failed connecting to %d of %d peers, the first failure is "
+                "%s:%s: %r" % (len(errors), len(results), *addresses[i], e),
+                errors,
+                results,
+            )
+        return results
+
+    def continuous_ucx_progress(self, event_loop=None, worker=None):
         """Guarantees continuous UCX progress
 
         Use this function to associate UCX progress with an event loop.
         Notice, multiple event loops can be associate with UCX progress.
 
         This function is automatically called when calling
-        `create_listener()` or `create_endpoint()`.
+        `create_listener()` or `create_endpoint()`, which associates the
+        worker of the new listener or endpoint with the current event loop.
 
         Parameters
         ----------
         event_loop: asyncio.event_loop, optional
             The event loop to evoke UCX progress. If None,
             `asyncio.get_event_loop()` is used.
+        worker: int, optional
+            The index of the worker to progress. If None, all workers
+            are progressed.
         """
         loop = event_loop if event_loop is not None else asyncio.get_event_loop()
-        if loop in self.progress_tasks:
-            return  # Progress has already been guaranteed for the current event loop
-
-        if self.blocking_progress_mode:
-            task = BlockingMode(self.worker, loop, self.epoll_fd)
-        else:
-            task = NonBlockingMode(self.worker, loop)
-        self.progress_tasks.append(task)
+        indices = range(len(self.workers)) if worker is None else (worker,)
+        for i in indices:
+            ucx_worker = self.workers[i]
+            if any(
+                t.event_loop is loop and t.weakref_worker() is ucx_worker
+                for t in self.progress_tasks
+            ):
+                continue  # Progress has already been guaranteed for the event loop
+
+            if self.progress_mode == "blocking":
+                task = BlockingMode(ucx_worker, loop, self.epoll_fds[i])
+            elif self.progress_mode == "adaptive":
+                task = AdaptiveMode(ucx_worker, loop, self.epoll_fds[i])
+            elif self.progress_mode == "thread":
+                task = ThreadMode(ucx_worker, loop, self.epoll_fds[i])
+            else:
+                task = NonBlockingMode(ucx_worker, loop)
+            self.progress_tasks.append(task)
 
     def get_ucp_worker(self):
         """Returns the underlying UCP worker handle (ucp_worker_h)
@@ -423,14 +1150,153 @@ class ApplicationContext:
         """Return low-level UCX info about this endpoint as a string"""
         return self.worker.info()
 
+    def progress(self):
+        """Try to progress all workers of this context
+
+        Returns
+        -------
+        int
+            The number of communication events progressed
+        """
+        return sum(worker.progress() for worker in self.workers)
+
     def fence(self):
-        return self.worker.fence()
+        for worker in self.workers:
+            worker.fence()
 
     async def flush(self):
-        return await comm.flush_worker(self.worker)
+        await asyncio.gather(*(comm.flush_worker(w) for w in self.workers))
 
-    def get_worker_address(self):
-        return self.worker.get_address()
+    def get_worker_address(self, worker=0):
+        return self.workers[self._select_worker(worker)].get_address()
+
+    def get_buffer_pool(self):
+        """Get the pool of receive buffers of this context
+
+        The pool allocates uninitialized host buffers, which are reused when
+        they have been deleted or released. Use it as the `allocator` of
+        `Endpoint.recv_obj()` and `Endpoint.recv_frames()` to avoid allocating
+        and zero-filling a new buffer for every message.
+
+        Returns
+        -------
+        BufferPool
+            The buffer pool
+        """
+        return self.buffer_pool
+
+    def mem_map(self, buffer, cache=False):
+        """Register `buffer` for remote memory access
+
+        Peers can read and write the registered buffer using `Endpoint.get()`
+        and `Endpoint.put()` given its address and packed remote key.
+
+        Parameters
+        ----------
+        buffer: exposing the buffer protocol or array/cuda interface
+            The buffer to register, which must be contiguous and writable.
+        cache: boolean, optional
+            Use the registration cache of this context, which avoids registering
+            buffers that are used repeatedly more than once. Notice, the returned
+            registration might contain a larger buffer that contains `buffer`.
+
+        Returns
+        -------
+        UCXMemoryHandle
+            The memory handle, which keeps `buffer` registered until it is
+            closed or deleted. Use `UCXMemoryHandle.address` and
+            `UCXMemoryHandle.pack_rkey()` to share the buffer with peers.
+        """
+        if not isinstance(buffer, Array):
+            buffer = Array(buffer)
+        if cache:
+            return self.registration_cache.get(buffer)
+        return ucx_api.UCXMemoryHandle(self.context, buffer)
+
+    def register_am_allocator(self, allocator):
+        """Register the allocator of received Active Messages
+
+        Messages sent by `Endpoint.am_send()` are received into buffers
+        allocated by `allocator`, which must take the number of bytes to
+        allocate as input and return a new host buffer of that size as output.
+        The default allocator is `bytearray`.
+
+        Parameters
+        ----------
+        allocator: callable
+            Function to allocate received Active Messages.
+        """
+        self._am_allocator = allocator
+
+    async def recv_any(self, buffer, tag=None, any_tag=False):
+        """Receive a message from any endpoint of this context into `buffer`.
+
+        Parameters
+        ----------
+        buffer: exposing the buffer protocol or array/cuda interface
+            The buffer to receive into. Raise ValueError if buffer
+            is smaller than nbytes or read-only.
+        tag: hashable, optional
+            Set a tag that must match the received message.
+        any_tag: bool, optional
+            Match any tag, in which case `tag` is ignored.
+
+        Notice, the matched message is counted as received by its endpoint
+        but this doesn't support endpoints that guarantee message order.
+        Only endpoints of the first worker of this context are matched.
+
+        Returns
+        -------
+        tuple
+            The endpoint that received the message, or None if the endpoint
+            has been closed, and the tag of the message (see `Endpoint.recv_any()`).
+        """
+        self.continuous_ucx_progress()
+        if not isinstance(buffer, Array):
+            buffer = Array(buffer)
+        nbytes = buffer.nbytes
+        mask = TAG_CTRL_BIT
+        if not any_tag:
+            mask |= TAG_USER_MASK
+        log = "[Recv any] worker: %s, tag: %s, mask: %s, nbytes: %d" % (
+            hex(self.worker.handle),
+            tag,
+            hex(mask),
+            nbytes,
+        )
+        logger.debug(log)
+        sender_tag = await comm.tag_recv_masked(
+            self.worker, buffer, nbytes, _ucx_tag(0, tag), mask, name=log
+        )
+        ep = self.endpoints_by_tag.get(sender_tag & TAG_ENDPOINT_MASK)
+        if ep is not None and not ep.closed():
+            ep._recv_count += 1
+            ep._finished_recv()
+        return ep, _decode_user_tag(sender_tag)
+
+    def _am_push_unmatched(self, ep_tag, buffer):
+        """Keep an Active Message of an unknown endpoint
+
+        The endpoint might not have been created yet. Expired messages and,
+        when there are too many, the oldest messages are dropped.
+        """
+        now = time.monotonic()
+        self._am_unmatched.append((now, ep_tag, buffer))
+        while self._am_unmatched and (
+            len(self._am_unmatched) > self._am_unmatched_max
+            or now - self._am_unmatched[0][0] > self._am_unmatched_timeout
+        ):
+            _, tag, _ = self._am_unmatched.popleft()
+            logger.debug("Dropping Active Message of unknown endpoint %s" % hex(tag))
+
+    def _am_pop_unmatched(self, ep_tag):
+        """Remove and return the kept Active Messages of an endpoint"""
+        ret = [buffer for _, tag, buffer in self._am_unmatched if tag == ep_tag]
+        if ret:
+            self._am_unmatched = collections.deque(
+                m for m in self._am_unmatched if m[1] != ep_tag
+            )
+        return ret
 
 
 class Listener:
@@ -438,11 +1304,22 @@ class Listener:
 
     The listening continues as long as this object exist or `.close()` is called.
     Please use `create_listener()` to create an Listener.
+
+    In the "queue" accept mode, use `accept()` or `async for` to get the
+    endpoints of the accepted connections:
+
+    >>> listener = ucp.create_listener(None, accept="queue", max_pending=1024)
+    >>> async for ep in listener:
+    ...     asyncio.ensure_future(handle(ep))
     """
 
-    def __init__(self, backend):
+    def __init__(self, backend, acceptor=None):
         assert backend.initialized
         self._b = backend
+        if acceptor is None:
+            acceptor = _Acceptor("callback", None)
+        self._acceptor = acceptor
+        acceptor.listener = weakref.ref(self)
 
     def closed(self):
         """Is the listener closed?"""
@@ -458,9 +1335,68 @@ class Listener:
         """The listening network port"""
         return self._b.port
 
+    @property
+    def stats(self):
+        """Dict of the accept statistics
+
+        "pending" is the number of connections being accepted, "queue_depth"
+        the number of endpoints waiting for `accept()` and "accept_latency"
+        the mean seconds from the arrival of a connection request until the
+        endpoint is handed over.
+        """
+        a = self._acceptor
+        return {
+            "accepted": a.accepted,
+            "rejected": a.rejected,
+            "failed": a.failed,
+            "pending": a.pending,
+            "queue_depth": len(a.queue),
+            "max_queue_depth": a.max_queue_depth,
+            "accept_latency": a.total_latency / a.accepted if a.accepted else 0.0,
+            "max_accept_latency": a.max_latency,
+        }
+
+    async def accept(self):
+        """Wait for the endpoint of the next accepted connection
+
+        Only available in the "queue" accept mode.
+
+        Returns
+        -------
+        Endpoint
+            The endpoint connected to the client
+
+        Raises
+        ------
+        UCXCloseError
+            If the listener is closed
+        """
+        a = self._acceptor
+        if a.accept != "queue":
+            raise ValueError("accept() requires the 'queue' accept mode")
+        if a.queue:
+            ep, arrival = a.queue.popleft()
+            a.handed_over(arrival)
+            return ep
+        if a.closed or self.closed():
+            raise UCXCloseError("Listener closed")
+        waiter = asyncio.get_event_loop().create_future()
+        a.waiters.append(waiter)
+        return await waiter
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.accept()
+        except UCXCloseError:
+            raise StopAsyncIteration
+
     def close(self):
         """Closing the listener"""
         self._b.close()
+        self._acceptor.close()
 
 
 class Endpoint:
@@ -480,6 +1416,12 @@ class Endpoint:
         self._shutting_down_peer = False  # Told peer to shutdown
         self._close_after_n_recv = None
         self._tags = tags
+        self._am_recv_queue = collections.deque()  # Undelivered Active Messages
+        self._am_recv_waiters = collections.deque()  # Futures of self.am_recv()
+        if tags is not None:
+            ctx.endpoints_by_tag[tags["msg_recv"]] = self
+            for buffer in ctx._am_pop_unmatched(tags["msg_recv"]):
+                self._am_deliver(buffer)
 
     @property
     def uid(self):
@@ -502,7 +1444,13 @@ class Endpoint:
         logger.debug("Endpoint.abort(): %s" % hex(self.uid))
         self._ep.close()
         self._ep = None
+        if self._tags is not None:
+            self._ctx._am_pop_unmatched(self._tags["msg_recv"])
         self._ctx = None
+        while self._am_recv_waiters:
+            future = self._am_recv_waiters.popleft()
+            if not future.done():
+                future.set_exception(UCXCanceled("am_recv(): endpoint closed"))
 
     async def close(self):
         """Close the endpoint cleanly.
@@ -543,7 +1491,7 @@ class Endpoint:
         finally:
             if not self.closed():
                 # Give all current outstanding send() calls a chance to return
-                self._ctx.worker.progress()
+                self._ep.worker.progress()
                 await asyncio.sleep(0)
                 self.abort()
 
@@ -559,6 +1507,10 @@ class Endpoint:
         tag: hashable, optional
             Set a tag that the receiver must match.
         """
+        return await self._send(buffer, self._tags["msg_send"] | _user_tag_bits(tag))
+
+    async def _send(self, buffer, ucx_tag):
+        """Send `buffer` using `ucx_tag`, which excludes the sequence number"""
         if self.closed():
             raise UCXCloseError("Endpoint closed")
         if not isinstance(buffer, Array):
@@ -573,12 +1525,7 @@ class Endpoint:
         )
         logger.debug(log)
         self._send_count += 1
-        if tag is None:
-            tag = self._tags["msg_send"]
-        else:
-            tag = hash64bits(self._tags["msg_send"], hash(tag))
-        if self._guarantee_msg_order:
-            tag += self._send_count
+        tag = self._send_sequence(ucx_tag)
         return await comm.tag_send(self._ep, buffer, nbytes, tag, name=log)
 
     @nvtx_annotate("UCXPY_RECV", color="red", domain="ucxpy")
@@ -591,10 +1538,14 @@ class Endpoint:
             The buffer to receive into. Raise ValueError if buffer
             is smaller than nbytes or read-only.
         tag: hashable, optional
-            Set a tag that must match the received message. Notice, currently
-            UCX-Py doesn't support a "any tag" thus `tag=None` only matches a
-            send that also sets `tag=None`.
+            Set a tag that must match the received message. Notice,
+            `tag=None` only matches a send that also sets `tag=None`,
+            use `recv_any()` to match any tag.
         """
+        return await self._recv(buffer, self._tags["msg_recv"] | _user_tag_bits(tag))
+
+    async def _recv(self, buffer, ucx_tag):
+        """Receive into `buffer` using `ucx_tag`, which excludes the sequence number"""
         if self.closed():
             raise UCXCloseError("Endpoint closed")
         if not isinstance(buffer, Array):
@@ -609,19 +1560,163 @@ class Endpoint:
         )
         logger.debug(log)
         self._recv_count += 1
-        if tag is None:
-            tag = self._tags["msg_recv"]
-        else:
-            tag = hash64bits(self._tags["msg_recv"], hash(tag))
-        if self._guarantee_msg_order:
-            tag += self._recv_count
+        tag = self._recv_sequence(ucx_tag)
         ret = await comm.tag_recv(self._ep, buffer, nbytes, tag, name=log)
-        self._finished_recv_count += 1
+        self._finished_recv()
+        return ret
+
+    @nvtx_annotate("UCXPY_RECV_ANY", color="red", domain="ucxpy")
+    async def recv_any(self, buffer):
+        """Receive from connected peer into `buffer` matching any tag.
+
+        Parameters
+        ----------
+        buffer: exposing the buffer protocol or array/cuda interface
+            The buffer to receive into. Raise ValueError if buffer
+            is smaller than nbytes or read-only.
+
+        Returns
+        -------
+        tag: int or None
+            The tag of the matched message, which is None if the message was sent
+            without a tag. Notice, only integer tags in the range
+            [0, TAG_MAX_USER_TAG) are returned exactly, other tags are
+            returned as their hash, which is outside of that range.
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        if self._guarantee_msg_order:
+            raise ValueError("recv_any() doesn't support guarantee_msg_order=True")
+        if not isinstance(buffer, Array):
+            buffer = Array(buffer)
+        nbytes = buffer.nbytes
+        log = "[Recv #%03d] ep: %s, tag: %s (any), nbytes: %d, type: %s" % (
+            self._recv_count,
+            hex(self.uid),
+            hex(self._tags["msg_recv"]),
+            nbytes,
+            type(buffer.obj),
+        )
+        logger.debug(log)
+        self._recv_count += 1
+        sender_tag = await comm.tag_recv_masked(
+            self._ep.worker,
+            buffer,
+            nbytes,
+            self._tags["msg_recv"],
+            TAG_CTRL_BIT | TAG_ENDPOINT_MASK,
+            name=log,
+            ep=self._ep,
+        )
+        self._finished_recv()
+        return _decode_user_tag(sender_tag)
+
+    def _send_tag(self, tag):
+        """The UCX tag of the next send, which must be counted already"""
+        return self._send_sequence(self._tags["msg_send"] | _user_tag_bits(tag))
+
+    def _recv_tag(self, tag):
+        """The UCX tag of the next receive, which must be counted already"""
+        return self._recv_sequence(self._tags["msg_recv"] | _user_tag_bits(tag))
+
+    def _send_sequence(self, ucx_tag):
+        """Add the sequence number of the next send to `ucx_tag`, if any"""
+        if self._guarantee_msg_order:
+            ucx_tag |= self._send_count & TAG_SEQUENCE_MASK
+        return ucx_tag
+
+    def _recv_sequence(self, ucx_tag):
+        """Add the sequence number of the next receive to `ucx_tag`, if any"""
+        if self._guarantee_msg_order:
+            ucx_tag |= self._recv_count & TAG_SEQUENCE_MASK
+        return ucx_tag
+
+    def _finished_recv(self, n=1):
+        """Count `n` finished receives and close if requested by the peer"""
+        self._finished_recv_count += n
         if (
             self._close_after_n_recv is not None
             and self._finished_recv_count >= self._close_after_n_recv
         ):
             self.abort()
+
+    @nvtx_annotate("UCXPY_SEND_MANY", color="green", domain="ucxpy")
+    async def send_many(self, buffers, tags=None):
+        """Send multiple buffers to connected peer.
+
+        All sends are posted by a single call to UCX and the returned
+        awaitable completes when every send has completed. Each buffer
+        is matched by the peer as if it was sent by `send()`, thus the peer
+        can receive them using either `recv()` or `recv_many()`.
+
+        Parameters
+        ----------
+        buffers: sequence of objects exposing the buffer protocol or
+                 array/cuda interface
+            The buffers to send.
+        tags: sequence of hashables, optional
+            Set a tag for each buffer that the receiver must match.
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        buffers = [b if isinstance(b, Array) else Array(b) for b in buffers]
+        if tags is None:
+            tags = [None] * len(buffers)
+        elif len(tags) != len(buffers):
+            raise ValueError("`buffers` and `tags` must have the same length")
+        nbytes = [b.nbytes for b in buffers]
+        log = "[Send #%03d-#%03d] ep: %s, tag: %s, nbytes: %d" % (
+            self._send_count,
+            self._send_count + len(buffers) - 1,
+            hex(self.uid),
+            hex(self._tags["msg_send"]),
+            sum(nbytes),
+        )
+        logger.debug(log)
+        ucx_tags = []
+        for tag in tags:
+            self._send_count += 1
+            ucx_tags.append(self._send_tag(tag))
+        return await comm.tag_send_many(self._ep, buffers, nbytes, ucx_tags, name=log)
+
+    @nvtx_annotate("UCXPY_RECV_MANY", color="red", domain="ucxpy")
+    async def recv_many(self, buffers, tags=None):
+        """Receive from connected peer into multiple buffers.
+
+        All receives are posted by a single call to UCX and the returned
+        awaitable completes when every receive has completed.
+
+        Parameters
+        ----------
+        buffers: sequence of objects exposing the buffer protocol or
+                 array/cuda interface
+            The buffers to receive into. Raise ValueError if a buffer
+            is smaller than nbytes or read-only.
+        tags: sequence of hashables, optional
+            Set a tag for each buffer that must match the received message.
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        buffers = [b if isinstance(b, Array) else Array(b) for b in buffers]
+        if tags is None:
+            tags = [None] * len(buffers)
+        elif len(tags) != len(buffers):
+            raise ValueError("`buffers` and `tags` must have the same length")
+        nbytes = [b.nbytes for b in buffers]
+        log = "[Recv #%03d-#%03d] ep: %s, tag: %s, nbytes: %d" % (
+            self._recv_count,
+            self._recv_count + len(buffers) - 1,
+            hex(self.uid),
+            hex(self._tags["msg_recv"]),
+            sum(nbytes),
+        )
+        logger.debug(log)
+        ucx_tags = []
+        for tag in tags:
+            self._recv_count += 1
+            ucx_tags.append(self._recv_tag(tag))
+        ret = await comm.tag_recv_many(self._ep, buffers, nbytes, ucx_tags, name=log)
+        self._finished_recv(len(buffers))
         return ret
 
     def cuda_support(self):
@@ -632,7 +1727,7 @@ class Endpoint:
         """Returns the underlying UCP worker handle (ucp_worker_h)
         as a Python integer.
         """
-        return self._ctx.worker.handle
+        return self._ep.worker.handle
 
     def get_ucp_endpoint(self):
         """Returns the underlying UCP endpoint handle (ucp_ep_h)
@@ -675,8 +1770,8 @@ class Endpoint:
     async def send_obj(self, obj, tag=None):
         """Send `obj` to connected peer that calls `recv_obj()`.
 
-        The transfer includes an extra message containing the size of `obj`,
-        which increases the overhead slightly.
+        The object is sent as a single message, the receiver finds its
+        size by probing the message.
 
         Parameters
         ----------
@@ -689,51 +1784,441 @@ class Endpoint:
         -------
         >>> await ep.send_obj(pickle.dumps([1,2,3]))
         """
-        if not isinstance(obj, Array):
-            obj = Array(obj)
-        nbytes = Array(array.array("Q", [obj.nbytes]))
-        await self.send(nbytes, tag=tag)
         await self.send(obj, tag=tag)
 
+    @nvtx_annotate("UCXPY_RECV_OBJ", color="red", domain="ucxpy")
     async def recv_obj(self, tag=None, allocator=bytearray):
         """Receive from connected peer that calls `send_obj()`.
 
         As opposed to `recv()`, this function returns the received object.
-        Data is received into a buffer allocated by `allocator`.
+        Data is received into a buffer allocated by `allocator` when the
+        message arrives.
 
-        The transfer includes an extra message containing the size of `obj`,
-        which increses the overhead slightly.
+        Notice, the message is probed thus a concurrent `recv()` using the
+        same tag might receive it instead.
 
         Parameters
         ----------
         tag: hashable, optional
-            Set a tag that must match the received message. Notice, currently
-            UCX-Py doesn't support a "any tag" thus `tag=None` only matches a
-            send that also sets `tag=None`.
+            Set a tag that must match the received message. Notice,
+            `tag=None` only matches a send that also sets `tag=None`.
         allocator: callabale, optional
             Function to allocate the received object. The function should
             take the number of bytes to allocate as input and return a new
-            buffer of that size as output.
+            buffer of that size as output. Use `get_buffer_pool()` to reuse
+            buffers.
 
         Example
         -------
         >>> await pickle.loads(ep.recv_obj())
         """
-        nbytes = array.array("Q", [0])
-        await self.recv(nbytes, tag=tag)
-        nbytes = nbytes[0]
-        ret = allocator(nbytes)
-        await self.recv(ret, tag=tag)
+        return await self._recv_obj(
+            self._tags["msg_recv"] | _user_tag_bits(tag), allocator
+        )
+
+    async def _recv_obj(self, ucx_tag, allocator):
+        """Receive an object using `ucx_tag`, which excludes the sequence number"""
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        log = "[Recv obj #%03d] ep: %s, tag: %s" % (
+            self._recv_count,
+            hex(self.uid),
+            hex(self._tags["msg_recv"]),
+        )
+        logger.debug(log)
+        self._recv_count += 1
+        tag = self._recv_sequence(ucx_tag)
+        ret = await comm.tag_recv_probe(self._ep, tag, allocator, name=log)
+        self._finished_recv()
         return ret
 
+    @nvtx_annotate("UCXPY_SEND_FRAMES", color="green", domain="ucxpy")
+    async def send_frames(self, frames, tag=None):
+        """Send a list of frames to connected peer that calls `recv_frames()`.
+
+        The frames are sent as a single message using a scatter-gather list,
+        thus no copy is made to concatenate them. The message starts with
+        a header containing the number of frames and their sizes.
+
+        Parameters
+        ----------
+        frames: list of objects exposing the buffer protocol
+            The frames to send. Only host memory is supported.
+        tag: hashable, optional
+            Set a tag that the receiver must match.
+
+        Example
+        -------
+        >>> await ep.send_frames([header, data])
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        frames = [f if isinstance(f, Array) else Array(f) for f in frames]
+        sizes = [f.nbytes for f in frames]
+        header = struct.pack("%dQ" % (len(frames) + 1), len(frames), *sizes)
+        log = "[Send frames #%03d] ep: %s, tag: %s, nframes: %d, nbytes: %d" % (
+            self._send_count,
+            hex(self.uid),
+            hex(self._tags["msg_send"]),
+            len(frames),
+            sum(sizes),
+        )
+        logger.debug(log)
+        self._send_count += 1
+        tag = self._send_tag(tag)
+        return await comm.tag_send_iov(
+            self._ep, [Array(header)] + frames, tag, name=log
+        )
+
+    @nvtx_annotate("UCXPY_RECV_FRAMES", color="red", domain="ucxpy")
+    async def recv_frames(self, tag=None, allocator=bytearray):
+        """Receive a list of frames from connected peer that calls `send_frames()`.
+
+        The message is received into a single buffer allocated by `allocator`
+        and the frames are returned as memoryviews of that buffer.
+
+        Parameters
+        ----------
+        tag: hashable, optional
+            Set a tag that must match the received message. Notice,
+            `tag=None` only matches a send that also sets `tag=None`.
+        allocator: callabale, optional
+            Function to allocate the received message. The function should
+            take the number of bytes to allocate as input and return a new
+            host buffer of that size as output. Use `get_buffer_pool()` to
+            reuse buffers.
+
+        Returns
+        -------
+        frames: list of memoryview
+            The received frames
+
+        Example
+        -------
+        >>> header, data = await ep.recv_frames()
+        """
+        buffer = memoryview(await self.recv_obj(tag=tag, allocator=allocator))
+        buffer = buffer.cast("B")
+        nframes = struct.unpack_from("Q", buffer)[0]
+        sizes = struct.unpack_from("%dQ" % nframes, buffer, 8)
+        frames = []
+        offset = 8 * (nframes + 1)
+        for size in sizes:
+            frames.append(buffer[offset : offset + size])
+            offset += size
+        return frames
+
+    @nvtx_annotate("UCXPY_SEND_CHUNKED", color="green", domain="ucxpy")
+    async def send_chunked(self, buffer, tag=None, chunk_size=None, max_inflight=4):
+        """Send `buffer` in chunks to connected peer that calls `recv_chunked()`.
+
+        The buffer is sent as a header followed by a sequence of chunks, of
+        which up to `max_inflight` are in flight at a time. This makes it
+        possible for the peer to process chunks while the transfer continues.
+
+        Parameters
+        ----------
+        buffer: exposing the buffer protocol or array/cuda interface
+            The buffer to send, which must be contiguous.
+        tag: hashable, optional
+            Set a tag that the receiver must match.
+        chunk_size: int, optional
+            The size of the chunks in bytes. By default, the chunk size adapts
+            to the size of `buffer`: 1/16 of its size but between 1MB and 64MB.
+        max_inflight: int, optional
+            The maximum number of chunks in flight.
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        if not isinstance(buffer, Array):
+            buffer = Array(buffer)
+        if not buffer.contiguous:
+            raise ValueError("Array must be C or F contiguous")
+        nbytes = buffer.nbytes
+        if chunk_size is None:
+            chunk_size = _chunk_size(nbytes)
+        if chunk_size < 1 or max_inflight < 1:
+            raise ValueError("chunk_size and max_inflight must be positive")
+        logger.debug(
+            "[Send chunked] ep: %s, nbytes: %d, chunk_size: %d"
+            % (hex(self.uid), nbytes, chunk_size)
+        )
+        await self.send(_CHUNK_HEADER.pack(nbytes, chunk_size), tag=tag)
+        inflight = set()
+        for start in range(0, nbytes, chunk_size):
+            if len(inflight) >= max_inflight:
+                done, inflight = await asyncio.wait(
+                    inflight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for fut in done:
+                    fut.result()
+            chunk = _ArrayRange(buffer, start, min(start + chunk_size, nbytes))
+            # Notice, the send is posted when the task starts thus the tasks
+            # post the chunks in order
+            inflight.add(asyncio.ensure_future(self.send(chunk.as_array(), tag=tag)))
+        if inflight:
+            await asyncio.gather(*inflight)
+
+    async def recv_chunked(self, tag=None, allocator=bytearray, max_inflight=4):
+        """Receive from connected peer that calls `send_chunked()` chunk by chunk.
+
+        This is an asynchronous generator that yields the chunks in order as
+        they arrive. Each chunk is received into a separate buffer allocated
+        by `allocator`, thus a consumer that drops the chunks it has processed
+        never holds the whole message in memory.
+
+        Notice, the generator must be exhausted, otherwise the remaining
+        chunks are left unreceived.
+
+        Parameters
+        ----------
+        tag: hashable, optional
+            Set a tag that must match the received message. Notice,
+            `tag=None` only matches a send that also sets `tag=None`.
+        allocator: callabale, optional
+            Function to allocate the chunks. The function should take the
+            number of bytes to allocate as input and return a new buffer of
+            that size as output.
+        max_inflight: int, optional
+            The maximum number of chunks being received at a time.
+
+        Example
+        -------
+        >>> async for chunk in ep.recv_chunked():
+        ...     f.write(chunk)
+        """
+        if max_inflight < 1:
+            raise ValueError("max_inflight must be positive")
+        header = bytearray(_CHUNK_HEADER.size)
+        await self.recv(header, tag=tag)
+        nbytes, chunk_size = _CHUNK_HEADER.unpack(header)
+        logger.debug(
+            "[Recv chunked] ep: %s, nbytes: %d, chunk_size: %d"
+            % (hex(self.uid), nbytes, chunk_size)
+        )
+        pending = collections.deque()
+        start = 0
+        while start < nbytes or pending:
+            while start < nbytes and len(pending) < max_inflight:
+                chunk = allocator(min(chunk_size, nbytes - start))
+                pending.append(
+                    (chunk, asyncio.ensure_future(self.recv(chunk, tag=tag)))
+                )
+                start += chunk_size
+            chunk, fut = pending.popleft()
+            await fut
+            yield chunk
+
+    def unpack_rkey(self, rkey):
+        """Unpack a remote key packed by the connected peer.
+
+        Parameters
+        ----------
+        rkey: bytes
+            The packed remote key (see `UCXMemoryHandle.pack_rkey()`)
+
+        Returns
+        -------
+        UCXRkey
+            The remote key, which is valid for this endpoint only
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        return ucx_api.UCXRkey(self._ep, rkey)
+
+    @nvtx_annotate("UCXPY_PUT", color="green", domain="ucxpy")
+    async def put(self, buffer, remote_addr, rkey):
+        """Write `buffer` into the remote memory of connected peer.
+
+        The returned awaitable completes when `buffer` can be reused, use
+        `flush()` to make sure the data has been written to the remote memory.
+
+        Parameters
+        ----------
+        buffer: exposing the buffer protocol or array/cuda interface
+            The buffer to write.
+        remote_addr: int
+            The remote address to write into, which must be within
+            a buffer registered by the peer.
+        rkey: UCXRkey
+            The remote key of the registered buffer (see `unpack_rkey()`).
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        if not isinstance(buffer, Array):
+            buffer = Array(buffer)
+        nbytes = buffer.nbytes
+        log = "[Put] ep: %s, remote_addr: %s, nbytes: %d, type: %s" % (
+            hex(self.uid),
+            hex(remote_addr),
+            nbytes,
+            type(buffer.obj),
+        )
+        logger.debug(log)
+        return await comm.put(self._ep, buffer, nbytes, remote_addr, rkey, name=log)
+
+    @nvtx_annotate("UCXPY_GET", color="red", domain="ucxpy")
+    async def get(self, buffer, remote_addr, rkey):
+        """Read the remote memory of connected peer into `buffer`.
+
+        As opposed to `recv()`, the peer doesn't take part in the transfer.
+
+        Parameters
+        ----------
+        buffer: exposing the buffer protocol or array/cuda interface
+            The buffer to read into. The size of `buffer` determines
+            the number of bytes to read.
+        remote_addr: int
+            The remote address to read from, which must be within
+            a buffer registered by the peer.
+        rkey: UCXRkey
+            The remote key of the registered buffer (see `unpack_rkey()`).
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        if not isinstance(buffer, Array):
+            buffer = Array(buffer)
+        nbytes = buffer.nbytes
+        log = "[Get] ep: %s, remote_addr: %s, nbytes: %d, type: %s" % (
+            hex(self.uid),
+            hex(remote_addr),
+            nbytes,
+            type(buffer.obj),
+        )
+        logger.debug(log)
+        return await comm.get(self._ep, buffer, nbytes, remote_addr, rkey, name=log)
+
+    @nvtx_annotate("UCXPY_AM_SEND", color="green", domain="ucxpy")
+    async def am_send(self, buffer):
+        """Send `buffer` to connected peer as an Active Message.
+
+        As opposed to `send()`, the peer doesn't have to post a matching
+        receive. The message is received into a buffer allocated by the
+        allocator of the peer (see `register_am_allocator()`) and returned
+        by its `am_recv()`.
+
+        Parameters
+        ----------
+        buffer: exposing the buffer protocol
+            The buffer to send. Only host memory is supported.
+        """
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        if not isinstance(buffer, Array):
+            buffer = Array(buffer)
+        header = Array(_AM_HEADER.pack(self._tags["msg_send"]))
+        log = "[AM Send] ep: %s, tag: %s, nbytes: %d, type: %s" % (
+            hex(self.uid),
+            hex(self._tags["msg_send"]),
+            buffer.nbytes,
+            type(buffer.obj),
+        )
+        logger.debug(log)
+        return await comm.am_send(self._ep, _AM_ID_ENDPOINT, [header, buffer], name=log)
+
+    @nvtx_annotate("UCXPY_AM_RECV", color="red", domain="ucxpy")
+    async def am_recv(self):
+        """Receive an Active Message from connected peer that calls `am_send()`.
+
+        Messages are returned in the order they arrive.
+
+        Returns
+        -------
+        buffer
+            The received message allocated by the registered allocator
+        """
+        if self._am_recv_queue:
+            return self._am_recv_queue.popleft()
+        if self.closed():
+            raise UCXCloseError("Endpoint closed")
+        future = asyncio.get_event_loop().create_future()
+        self._am_recv_waiters.append(future)
+        return await future
+
+    def _am_deliver(self, buffer):
+        """Hand over a received Active Message to `am_recv()`"""
+        if self.closed():
+            return
+        while self._am_recv_waiters:
+            future = self._am_recv_waiters.popleft()
+            if not future.done():
+                future.set_result(buffer)
+                return
+        self._am_recv_queue.append(buffer)
+
     async def flush(self):
-        return await comm.flush_ep(self)
+        return await comm.flush_ep(self._ep)
+
+    def channel(self, tag):
+        """Create a channel of messages using `tag`
+
+        The UCX tags of the channel are computed once thus sending and receiving
+        through a channel avoids encoding `tag` for every message, which makes
+        channels well suited for multiplexing many logical streams over this
+        endpoint. Messages sent through a channel match `recv(tag=tag)` at the
+        peer and vice versa.
+
+        Parameters
+        ----------
+        tag: hashable
+            The tag of the messages of the channel.
+
+        Returns
+        -------
+        Channel
+            The new channel
+        """
+        return Channel(self, tag)
+
+
+class Channel:
+    """Messages of an endpoint using a fixed tag
+
+    Please use `Endpoint.channel()` to create a Channel.
+    """
+
+    __slots__ = ("_ep", "_send_tag", "_recv_tag", "tag")
+
+    def __init__(self, ep, tag):
+        self._ep = ep
+        self.tag = tag
+        bits = _user_tag_bits(tag)
+        self._send_tag = ep._tags["msg_send"] | bits
+        self._recv_tag = ep._tags["msg_recv"] | bits
+
+    @property
+    def endpoint(self):
+        """The endpoint of the channel"""
+        return self._ep
+
+    async def send(self, buffer):
+        """Send `buffer` to connected peer (see `Endpoint.send()`)"""
+        return await self._ep._send(buffer, self._send_tag)
+
+    async def recv(self, buffer):
+        """Receive from connected peer into `buffer` (see `Endpoint.recv()`)"""
+        return await self._ep._recv(buffer, self._recv_tag)
+
+    async def send_obj(self, obj):
+        """Send `obj` to connected peer (see `Endpoint.send_obj()`)"""
+        await self._ep._send(obj, self._send_tag)
+
+    async def recv_obj(self, allocator=bytearray):
+        """Receive an object from connected peer (see `Endpoint.recv_obj()`)"""
+        return await self._ep._recv_obj(self._recv_tag, allocator)
 
 
 # The following functions initialize and use a single ApplicationContext instance
 
 
-def init(options={}, env_takes_precedence=False, blocking_progress_mode=None):
+def init(
+    options={},
+    env_takes_precedence=False,
+    blocking_progress_mode=None,
+    progress_mode=None,
+    n_workers=None,
+    worker_policy=None,
+):
     """Initiate UCX.
 
     Usually this is done automatically at the first API call
@@ -751,6 +2236,26 @@ def init(options={}, env_takes_precedence=False, blocking_progress_mode=None):
         If None, blocking UCX progress mode is used unless the environment variable
         `UCXPY_NON_BLOCKING_MODE` is defined.
         Otherwise, if True blocking mode is used and if False non-blocking mode is used.
+        Cannot be combined with `progress_mode`.
+    progress_mode: str, optional
+        The UCX progress mode: "blocking" waits on the UCX file descriptor,
+        "non-blocking" progresses continuously, "adaptive" progresses
+        continuously during activity and waits when idle, and "thread"
+        progresses in a background thread, which keeps communicating while
+        the event loop is busy running Python code. If None, the mode is
+        set by `blocking_progress_mode` or the environment variable
+        `UCXPY_PROGRESS_MODE` and defaults to "blocking".
+    n_workers: int, optional
+        The number of UCX workers, each with its own progress engine. In the
+        "thread" progress mode, each worker is progressed by its own thread.
+        If None, the environment variable `UCXPY_N_WORKERS` is used and
+        defaults to 1.
+    worker_policy: str, optional
+        The assignment of new endpoints and listeners to workers, which can be
+        overridden by the `worker` argument of `create_endpoint()` and
+        `create_listener()`: "round-robin" or "hash", which hashes the address
+        of the peer. If None, the environment variable `UCXPY_WORKER_POLICY` is
+        used and defaults to "round-robin".
     """
     global _ctx
     if _ctx is not None:
@@ -763,7 +2268,13 @@ def init(options={}, env_takes_precedence=False, blocking_progress_mode=None):
             if k in options:
                 del options[k]
 
-    _ctx = ApplicationContext(options, blocking_progress_mode=blocking_progress_mode)
+    _ctx = ApplicationContext(
+        options,
+        blocking_progress_mode=blocking_progress_mode,
+        progress_mode=progress_mode,
+        n_workers=n_workers,
+        worker_policy=worker_policy,
+    )
 
 
 def reset():
@@ -806,7 +2317,7 @@ def progress():
     Warning, it is illegal to call this from a call-back function such as
     the call-back function given to create_listener.
     """
-    return _get_ctx().worker.progress()
+    return _get_ctx().progress()
 
 
 def get_config():
@@ -829,37 +2340,80 @@ def get_config():
 
 
 def create_listener(
-    callback_func, port=None, guarantee_msg_order=False, endpoint_error_handling=False
+    callback_func,
+    port=None,
+    guarantee_msg_order=False,
+    endpoint_error_handling=False,
+    worker=None,
+    max_pending=None,
+    accept="callback",
 ):
     return _get_ctx().create_listener(
         callback_func,
         port,
         guarantee_msg_order,
         endpoint_error_handling=endpoint_error_handling,
+        worker=worker,
+        max_pending=max_pending,
+        accept=accept,
     )
 
 
 async def create_endpoint(
-    ip_address, port, guarantee_msg_order=False, endpoint_error_handling=False
+    ip_address,
+    port,
+    guarantee_msg_order=False,
+    endpoint_error_handling=False,
+    worker=None,
 ):
     return await _get_ctx().create_endpoint(
         ip_address,
         port,
         guarantee_msg_order,
         endpoint_error_handling=endpoint_error_handling,
+        worker=worker,
+    )
+
+
+async def create_endpoint_from_worker_address(
+    address, guarantee_msg_order=False, endpoint_error_handling=False, worker=0
+):
+    return await _get_ctx().create_endpoint_from_worker_address(
+        address,
+        guarantee_msg_order,
+        endpoint_error_handling=endpoint_error_handling,
+        worker=worker,
+    )
+
+
+async def create_endpoints(
+    addresses,
+    guarantee_msg_order=False,
+    endpoint_error_handling=False,
+    concurrency=None,
+    timeout=None,
+    return_exceptions=False,
+):
+    return await _get_ctx().create_endpoints(
+        addresses,
+        guarantee_msg_order,
+        endpoint_error_handling=endpoint_error_handling,
+        concurrency=concurrency,
+        timeout=timeout,
+        return_exceptions=return_exceptions,
     )
 
 
-def continuous_ucx_progress(event_loop=None):
-    _get_ctx().continuous_ucx_progress(event_loop=event_loop)
+def continuous_ucx_progress(event_loop=None, worker=None):
+    _get_ctx().continuous_ucx_progress(event_loop=event_loop, worker=worker)
 
 
 def get_ucp_worker():
     return _get_ctx().get_ucp_worker()
 
 
-def get_worker_address():
-    return _get_ctx().get_worker_address()
+def get_worker_address(worker=0):
+    return _get_ctx().get_worker_address(worker)
 
 
 def get_ucp_context_info():
@@ -886,6 +2440,22 @@ def get_active_transports():
     return set([r.split()[-1].split("/")[0] for r in resources])
 
 
+def get_buffer_pool():
+    return _get_ctx().get_buffer_pool()
+
+
+def mem_map(buffer, cache=False):
+    return _get_ctx().mem_map(buffer, cache=cache)
+
+
+def register_am_allocator(allocator):
+    return _get_ctx().register_am_allocator(allocator)
+
+
+async def recv_any(buffer, tag=None, any_tag=False):
+    return await _get_ctx().recv_any(buffer, tag=tag, any_tag=any_tag)
+
+
 async def flush():
     """Flushes outstanding AMO and RMA operations. This ensures that the
        operations issued on this worker have completed both locally and remotely.
@@ -910,5 +2480,13 @@ def fence():
 # Setting the __doc__
 create_listener.__doc__ = ApplicationContext.create_listener.__doc__
 create_endpoint.__doc__ = ApplicationContext.create_endpoint.__doc__
+create_endpoints.__doc__ = ApplicationContext.create_endpoints.__doc__
+create_endpoint_from_worker_address.__doc__ = (
+    ApplicationContext.create_endpoint_from_worker_address.__doc__
+)
 continuous_ucx_progress.__doc__ = ApplicationContext.continuous_ucx_progress.__doc__
 get_ucp_worker.__doc__ = ApplicationContext.get_ucp_worker.__doc__
+recv_any.__doc__ = ApplicationContext.recv_any.__doc__
+register_am_allocator.__doc__ = ApplicationContext.register_am_allocator.__doc__
+mem_map.__doc__ = ApplicationContext.mem_map.__doc__
+get_buffer_pool.__doc__ = ApplicationContext.get_buffer_pool.__doc__
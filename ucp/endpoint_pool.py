@@ -0,0 +1,202 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+# See file LICENSE for terms.
+
+import asyncio
+import collections
+import logging
+
+from . import core
+
+logger = logging.getLogger("ucx")
+
+
+class EndpointPool:
+    """LRU pool of endpoints keyed by peer address.
+
+    Services that talk to many peers cannot keep an endpoint open to every
+    one of them. The pool bounds the number of open endpoints, evicting and
+    gracefully closing the least recently used ones, and (re)connects lazily
+    when a peer is used. Endpoints found closed, e.g. because the peer
+    closed or the connection failed, are replaced on use.
+
+    Concurrent requests for the same peer share a single connection attempt
+    thus a burst of traffic to an evicted peer doesn't create a reconnect
+    storm.
+
+    Parameters
+    ----------
+    max_endpoints: int, optional
+        The maximum number of open endpoints. When exceeded, the least
+        recently used endpoints that aren't in use by `connection()` are
+        evicted. If None, the number is unlimited.
+    guarantee_msg_order: boolean, optional
+        Passed to `create_endpoint()`
+    endpoint_error_handling: boolean, optional
+        Passed to `create_endpoint()`
+    on_evict: callable, optional
+        Function called with the address and endpoint of every endpoint that
+        leaves the pool, before it is closed.
+    """
+
+    def __init__(
+        self,
+        max_endpoints=None,
+        guarantee_msg_order=False,
+        endpoint_error_handling=False,
+        on_evict=None,
+    ):
+        if max_endpoints is not None and max_endpoints < 1:
+            raise ValueError("max_endpoints must be positive")
+        self.max_endpoints = max_endpoints
+        self.guarantee_msg_order = guarantee_msg_order
+        self.endpoint_error_handling = endpoint_error_handling
+        self.on_evict = on_evict
+        # The open endpoints in LRU order: (ip, port) -> Endpoint
+        self._entries = collections.OrderedDict()
+        # Connection attempts in flight: (ip, port) -> Future
+        self._pending = {}
+        # Number of `connection()` contexts using an endpoint: (ip, port) -> int
+        self._in_use = collections.Counter()
+        # Close operations of evicted endpoints still in flight
+        self._closing = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reconnects = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, address):
+        return address in self._entries
+
+    @property
+    def stats(self):
+        """Dict of the pool statistics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "reconnects": self.reconnects,
+            "entries": len(self._entries),
+            "pending": len(self._pending),
+        }
+
+    async def get(self, ip, port):
+        """Get an open endpoint to a peer, connecting on a miss
+
+        The returned endpoint might be evicted, and thus closed, when other
+        peers are used. Use `connection()` to keep it open while in use.
+
+        Parameters
+        ----------
+        ip: str
+            IP address of the peer's listener
+        port: int
+            Port of the peer's listener
+
+        Returns
+        -------
+        Endpoint
+            An open endpoint to the peer
+        """
+        address = (ip, port)
+        ep = self._entries.get(address)
+        if ep is not None:
+            if not ep.closed():
+                self.hits += 1
+                self._entries.move_to_end(address)
+                return ep
+            logger.debug("EndpointPool: reconnecting to closed peer %s:%d" % address)
+            del self._entries[address]
+            self.reconnects += 1
+
+        pending = self._pending.get(address)
+        if pending is None:
+            self.misses += 1
+            pending = asyncio.ensure_future(self._connect(address))
+            self._pending[address] = pending
+        # Shield the attempt, which other callers might be waiting for
+        return await asyncio.shield(pending)
+
+    def connection(self, ip, port):
+        """Async context manager of an endpoint that isn't evicted while in use
+
+        Example
+        -------
+        >>> async with pool.connection(ip, port) as ep:
+        ...     await ep.send(msg)
+        """
+        return _PooledConnection(self, (ip, port))
+
+    async def remove(self, ip, port):
+        """Remove and gracefully close the endpoint to a peer, if any"""
+        address = (ip, port)
+        if address in self._entries:
+            await self._pop(address).close()
+
+    async def clear(self):
+        """Remove and gracefully close all endpoints"""
+        eps = [self._pop(address) for address in list(self._entries)]
+        await asyncio.gather(*(ep.close() for ep in eps))
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+    async def _connect(self, address):
+        try:
+            ep = await core.create_endpoint(
+                *address,
+                guarantee_msg_order=self.guarantee_msg_order,
+                endpoint_error_handling=self.endpoint_error_handling,
+            )
+        finally:
+            del self._pending[address]
+        self._entries[address] = ep
+        # The new endpoint is about to be returned thus it isn't evicted
+        self._evict(keep=address)
+        return ep
+
+    def _evict(self, keep=None):
+        if self.max_endpoints is None:
+            return
+        # Endpoints in use, and `keep`, are skipped, which might leave the
+        # pool above `max_endpoints` until they are released
+        excess = len(self._entries) - self.max_endpoints
+        if excess <= 0:
+            return
+        victims = [a for a in self._entries if not self._in_use[a] and a != keep]
+        for address in victims[:excess]:
+            self.evictions += 1
+            task = asyncio.ensure_future(self._pop(address).close())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    def _pop(self, address):
+        ep = self._entries.pop(address)
+        if self.on_evict is not None:
+            self.on_evict(address, ep)
+        return ep
+
+
+class _PooledConnection:
+    def __init__(self, pool, address):
+        self._pool = pool
+        self._address = address
+
+    async def __aenter__(self):
+        self._pool._in_use[self._address] += 1
+        try:
+            return await self._pool.get(*self._address)
+        except BaseException:
+            self._release()
+            raise
+
+    async def __aexit__(self, *exc_info):
+        self._release()
+        self._pool._evict()
+
+    def _release(self):
+        in_use = self._pool._in_use
+        in_use[self._address] -= 1
+        if not in_use[self._address]:
+            del in_use[self._address]
@@ -1,14 +1,74 @@
-import ctypes
-import pickle
-import uuid
+import os
+import struct
 
-from . import core
+from . import comm, core
+from ._libs.arr import Array
+from .exceptions import UCXError
+
+# Random ID of this process, which peers use to find an existing endpoint
+_PEER_ID = int.from_bytes(os.urandom(8), "little") or 1
+
+# Handshake messages: the peer ID of the client, the answer of the server
+# with its peer ID, the ID of the endpoint to reuse (or zero) and the tag of
+# the virtual endpoint, and the answer of the client whether to reuse
+_HELLO = struct.Struct("Q")
+_REPLY = struct.Struct("QQQ")
+_ACK = struct.Struct("?")
+
+# The tag of the first virtual endpoint of a new endpoint
+_FIRST_TAG = 1
+
+
+def _key(peer_id, listener):
+    """Key of the existing endpoint to a peer
+
+    Both ends of a connection of this process to itself are registered thus
+    they are told apart by their role.
+    """
+    if peer_id == _PEER_ID:
+        return (peer_id, listener)
+    return peer_id
+
+
+async def _stream_send(ucx_ep, msg):
+    await comm.stream_send(ucx_ep, Array(msg), len(msg))
+
+
+async def _stream_recv(ucx_ep, nbytes):
+    msg = bytearray(nbytes)
+    await comm.stream_recv(ucx_ep, Array(msg), nbytes)
+    return msg
 
 
 class EPHandle:
-    def __init__(self, ep):
+    """An endpoint shared by virtual endpoints
+
+    Virtual endpoint tags are allocated by the listening side of each new
+    virtual endpoint. The two ends of the endpoint allocate tags of their
+    own parity thus they never allocate the same tag: odd tags on the end
+    created by the listener and even tags on the other end.
+    """
+
+    def __init__(self, ep, listener):
         self.ep = ep
-        self.refcount = 1
+        self.tags = set()  # The tags of the virtual endpoints in use
+        self._next_tag = 1 if listener else 0
+
+    @property
+    def refcount(self):
+        return len(self.tags)
+
+    def new_tag(self):
+        """Allocate a tag, which isn't in use on this end"""
+        for _ in range(core.TAG_MAX_USER_TAG // 2):
+            tag = self._next_tag
+            self._next_tag += 2
+            if self._next_tag >= core.TAG_MAX_USER_TAG:
+                self._next_tag %= 2
+            if tag not in self.tags:
+                self.tags.add(tag)
+                return tag
+        raise UCXError("All virtual endpoint tags are in use")
 
 
 class EndpointReuse:
@@ -23,20 +83,26 @@ class EndpointReuse:
 
     Performance
     -----------
-    The overhead of creating endpoints is increased but the performance
-    of the created connections is the same.
+    Connecting to a peer that already has an endpoint costs three small
+    stream messages, i.e. one and a half round trips, and a single dict
+    lookup on each side.
 
     Connection Protocol
     -------------------
-    1) Client connect to server using a new endpoint.
-    2) Client send the IDs of all its existing endpoints.
-    3) Server receives the IDs from the client and checks if it has a
-       matching existing endpoint. It then sends the matching ID to the
-       client or zero if no match.
-    4) The client and server now continue with either the existing matching
-       endpoints or the new endpoints (which are registered for later reuse).
+    1) Client connect to server using a new UCX endpoint.
+    2) Client send its peer ID.
+    3) Server looks up the existing endpoint to the client's peer ID and
+       sends its own peer ID, the ID of that endpoint and a tag allocated
+       on it, or zeros if none.
+    4) Client checks that its existing endpoint to the server's peer ID is
+       the same endpoint and that the tag isn't in use on its end, and
+       sends whether to reuse it.
+    5) On reuse, both abandon the new UCX endpoint. Otherwise, they continue
+       the regular endpoint setup and register the new endpoint for reuse,
+       which first virtual endpoint uses the tag `_FIRST_TAG`.
     """
 
+    # Existing endpoints by the peer ID of their peer
     existing_endpoints = {}
 
     def __init__(self, handle, tag):
@@ -45,58 +111,85 @@ class EndpointReuse:
 
     @classmethod
     async def create_endpoint(cls, ip, port):
-        tag = ctypes.c_uint32(uuid.uuid4().int).value
-        ep_new = await core.create_endpoint(ip, port)
-
-        existing_endpoints = list(cls.existing_endpoints.values())
-        my_ep_ids = []
-        for ep in existing_endpoints:
-            if not ep.ep.closed():
-                ep.refcount += 1
-                my_ep_ids.append(ep.ep._tags["msg_recv"])
-
-        await ep_new.send_obj(pickle.dumps((my_ep_ids, tag)))
-        reuse_ep_id = pickle.loads(await ep_new.recv_obj())
-
-        for ep in existing_endpoints:
-            if not ep.ep.closed():
-                ep.refcount -= 1
-                if ep.refcount == 0:
-                    await ep.ep.close()
-
-        if reuse_ep_id:
-            reuse_ep = cls.existing_endpoints[reuse_ep_id]
-            reuse_ep.refcount += 1
-            await ep_new.close()
-        else:
-            reuse_ep = EPHandle(ep_new)
-            assert ep_new._tags["msg_send"] not in cls.existing_endpoints
-            cls.existing_endpoints[ep_new._tags["msg_send"]] = reuse_ep
-        return cls(reuse_ep, tag)
+        ctx = core._get_ctx()
+        ucx_ep = ctx._ep_create(ip, port, endpoint_error_handling=False)
+
+        await _stream_send(ucx_ep, _HELLO.pack(_PEER_ID))
+        peer_id, reuse_ep_id, tag = _REPLY.unpack(
+            await _stream_recv(ucx_ep, _REPLY.size)
+        )
+        existing_ep = cls.existing_endpoints.get(_key(peer_id, False))
+        reuse = (
+            reuse_ep_id != 0
+            and existing_ep is not None
+            and not existing_ep.ep.closed()
+            and existing_ep.ep._tags["msg_send"] == reuse_ep_id
+            # The tag might still be in use by a virtual endpoint, which
+            # only the server has closed
+            and tag not in existing_ep.tags
+        )
+        if reuse:
+            existing_ep.tags.add(tag)
+        try:
+            await _stream_send(ucx_ep, _ACK.pack(reuse))
+        except BaseException:
+            if reuse:
+                await cls(existing_ep, tag).close()
+            raise
+
+        if reuse:
+            ucx_ep.close()
+            return cls(existing_ep, tag)
+
+        ep = await core._setup_endpoint(
+            ctx, ucx_ep, guarantee_msg_order=False, listener=False
+        )
+        handle = EPHandle(ep, listener=False)
+        handle.tags.add(_FIRST_TAG)
+        cls.existing_endpoints[_key(peer_id, False)] = handle
+        return cls(handle, _FIRST_TAG)
 
     @classmethod
     def create_listener(cls, cb_coroutine, port):
-        async def _handle(ep_new):
-            peers_ep_ids, tag = pickle.loads(await ep_new.recv_obj())
-            existing_ep = None
-            for peers_ep_id in peers_ep_ids:
-                existing_ep = cls.existing_endpoints.get(peers_ep_id)
-                if existing_ep is not None and not existing_ep.ep.closed():
-                    break
-
-            if existing_ep:
-                existing_ep.refcount += 1
-                await ep_new.send_obj(pickle.dumps(existing_ep.ep._tags["msg_recv"]))
-                await ep_new.close()
+        # Handshakes of the connections that continue as new endpoints
+        handshakes = {}
+
+        async def _prologue(ucx_ep):
+            (peer_id,) = _HELLO.unpack(await _stream_recv(ucx_ep, _HELLO.size))
+            existing_ep = cls.existing_endpoints.get(_key(peer_id, True))
+            if existing_ep is not None and not existing_ep.ep.closed():
+                # The allocated tag keeps the endpoint alive until the client
+                # has answered
+                tag = existing_ep.new_tag()
+                reuse_ep_id = existing_ep.ep._tags["msg_recv"]
             else:
-                await ep_new.send_obj(pickle.dumps(None))
-                existing_ep = EPHandle(ep_new)
-                assert ep_new._tags["msg_send"] not in cls.existing_endpoints
-                cls.existing_endpoints[ep_new._tags["msg_send"]] = existing_ep
+                existing_ep = None
+                tag = reuse_ep_id = 0
+            reuse = False
+            try:
+                await _stream_send(ucx_ep, _REPLY.pack(_PEER_ID, reuse_ep_id, tag))
+                (reuse,) = _ACK.unpack(await _stream_recv(ucx_ep, _ACK.size))
+            finally:
+                if existing_ep is not None and not reuse:
+                    await cls(existing_ep, tag).close()
+
+            if reuse:
+                ucx_ep.close()
+                await cb_coroutine(cls(existing_ep, tag))
+                return False
+            handshakes[ucx_ep.handle] = peer_id
+            return True
 
-            await cb_coroutine(cls(existing_ep, tag))
+        async def _handle(ep_new):
+            peer_id = handshakes.pop(ep_new._ep.handle)
+            handle = EPHandle(ep_new, listener=True)
+            handle.tags.add(_FIRST_TAG)
+            cls.existing_endpoints[_key(peer_id, True)] = handle
+            await cb_coroutine(cls(handle, _FIRST_TAG))
 
-        return core.create_listener(_handle, port=port)
+        return core._get_ctx()._create_listener(
+            _handle, port, False, False, prologue=_prologue
+        )
 
     async def send(self, buffer):
         await self.handle.ep.send(buffer, tag=self.tag)
@@ -107,10 +200,10 @@ class EndpointReuse:
     async def close(self):
         if self.closed():
             return
-        self.handle.refcount -= 1
-        if self.handle.refcount == 0:
-            h = self.handle
-            self.handle = None
+        h = self.handle
+        self.handle = None
+        h.tags.discard(self.tag)
+        if not h.tags:
             await h.ep.close()
 
     def closed(self):
@@ -119,7 +212,8 @@ class EndpointReuse:
     def abort(self):
         if self.closed():
             return
-        self.handle.refcount -= 1
-        if self.handle.refcount == 0:
-            self.handle.ep.abort()
-            self.handle = None
+        h = self.handle
+        self.handle = None
+        h.tags.discard(self.tag)
+        if not h.tags:
+            h.ep.abort()
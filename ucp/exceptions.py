@@ -43,3 +43,20 @@ class UCXCanceled(UCXBaseException):
 
 class UCXMsgTruncated(UCXBaseException):
     pass
+
+
+class UCXConnectionError(UCXError):
+    """Failure to connect to some of the peers of `create_endpoints()`
+
+    Attributes
+    ----------
+    errors: dict
+        The exception of each failed peer by its index in the list of addresses
+    results: list
+        The endpoint of each peer or its exception if it failed
+    """
+
+    def __init__(self, msg, errors, results):
+        super().__init__(msg)
+        self.errors = errors
+        self.results = results
@@ -0,0 +1,154 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+# See file LICENSE for terms.
+
+import bisect
+import collections
+
+from ._libs import ucx_api
+from ._libs.arr import Array
+
+
+class RegistrationCache:
+    """LRU cache of memory registrations.
+
+    Registering (pinning) a large buffer is expensive thus buffers that are
+    used repeatedly, such as the arenas of an allocator, should only be
+    registered once. The cache is keyed by address ranges, which means that
+    a buffer within an already registered buffer is a hit.
+
+    Warning
+    -------
+    A cached registration keeps its buffer alive. Use `invalidate()` when
+    the owner of the memory wants to release or reuse it.
+
+    Parameters
+    ----------
+    context: UCXContext
+        The context to register buffers at
+    max_bytes: int, optional
+        The total size of the cached registrations. When exceeded, the least
+        recently used registrations are evicted. Buffers larger than `max_bytes`
+        are registered but not cached. If None, the size is unlimited.
+    on_evict: callable, optional
+        Function called with the memory handle of every registration that
+        leaves the cache, either by eviction or invalidation.
+    """
+
+    def __init__(self, context, max_bytes=None, on_evict=None):
+        self._context = context
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        # The registrations in LRU order: (address, length) -> memory handle
+        self._entries = collections.OrderedDict()
+        # Sorted list of the (address, length) of all registrations
+        self._ranges = []
+        self._max_length = 0
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def stats(self):
+        """Dict of the cache statistics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+            "nbytes": self.nbytes,
+        }
+
+    def lookup(self, address, length):
+        """Find a cached registration containing the range without registering
+
+        Returns
+        -------
+        UCXMemoryHandle or None
+            The memory handle or None if no registration contains the range.
+        """
+        end = address + length
+        i = bisect.bisect_right(self._ranges, (address, float("inf")))
+        # Only ranges that starts within `_max_length` can contain `address`
+        while i > 0:
+            i -= 1
+            start, size = self._ranges[i]
+            if start + self._max_length < end:
+                break
+            if start + size >= end:
+                key = (start, size)
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        return None
+
+    def get(self, buffer):
+        """Get a registration of `buffer`, registering it on a miss
+
+        Parameters
+        ----------
+        buffer: exposing the buffer protocol or array/cuda interface
+            The buffer to register, which must be contiguous and writable.
+
+        Returns
+        -------
+        UCXMemoryHandle
+            The memory handle of a registration containing `buffer`, which
+            might be a larger buffer that contains `buffer`.
+        """
+        if not isinstance(buffer, Array):
+            buffer = Array(buffer)
+        memh = self.lookup(buffer.ptr, buffer.nbytes)
+        if memh is not None:
+            self.hits += 1
+            return memh
+        self.misses += 1
+        memh = ucx_api.UCXMemoryHandle(self._context, buffer)
+        if self.max_bytes is not None:
+            if memh.length > self.max_bytes:
+                return memh
+            while self.nbytes + memh.length > self.max_bytes:
+                self.evictions += 1
+                self._remove(next(iter(self._entries)))
+        key = (memh.address, memh.length)
+        self._entries[key] = memh
+        bisect.insort(self._ranges, key)
+        self._max_length = max(self._max_length, memh.length)
+        self.nbytes += memh.length
+        return memh
+
+    def invalidate(self, address, length):
+        """Remove all registrations overlapping the range
+
+        Returns
+        -------
+        int
+            The number of removed registrations
+        """
+        end = address + length
+        i = bisect.bisect_left(self._ranges, (end, 0))
+        keys = [
+            (start, size) for start, size in self._ranges[:i] if start + size > address
+        ]
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self):
+        """Remove all registrations"""
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _remove(self, key):
+        memh = self._entries.pop(key)
+        del self._ranges[bisect.bisect_left(self._ranges, key)]
+        self.nbytes -= key[1]
+        if not self._ranges:
+            self._max_length = 0
+        if self.on_evict is not None:
+            self.on_evict(memh)
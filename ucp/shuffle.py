@@ -0,0 +1,229 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+# See file LICENSE for terms.
+
+"""All-to-all exchange of partitions with bounded memory"""
+
+import asyncio
+import collections
+import time
+
+import numpy as np
+
+ORDERS = ("pairwise", "staggered")
+
+
+class _ByteBudget:
+    """First-come first-served budget of outstanding bytes
+
+    A request larger than the budget is granted when nothing is outstanding
+    thus oversized partitions are transferred one at a time.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.outstanding = 0
+        self.peak = 0
+        self._waiters = collections.deque()  # (Future, nbytes)
+
+    def _fits(self, nbytes):
+        return self.outstanding == 0 or self.outstanding + nbytes <= self.max_bytes
+
+    def _grant(self, nbytes):
+        self.outstanding += nbytes
+        self.peak = max(self.peak, self.outstanding)
+
+    async def acquire(self, nbytes):
+        if not self._waiters and self._fits(nbytes):
+            self._grant(nbytes)
+            return
+        future = asyncio.get_event_loop().create_future()
+        self._waiters.append((future, nbytes))
+        await future
+
+    def release(self, nbytes):
+        self.outstanding -= nbytes
+        while self._waiters and self._fits(self._waiters[0][1]):
+            future, n = self._waiters.popleft()
+            if not future.done():
+                self._grant(n)
+                future.set_result(None)
+
+
+def _schedule(rank, size, order):
+    """The (destination, source) of every round of the exchange
+
+    In the "pairwise" order, which requires the size to be a power of two,
+    the ranks exchange with `rank ^ round`. In the "staggered" order, the
+    ranks send to `rank + round` and receive from `rank - round`. Either way,
+    every rank receives from a single peer per round, which avoids incast.
+    """
+    if order not in ORDERS:
+        raise ValueError("Unknown order %r, expected one of %s" % (order, ORDERS))
+    if order == "pairwise" and size & (size - 1) == 0:
+        return [(rank ^ k, rank ^ k) for k in range(1, size)]
+    return [((rank + k) % size, (rank - k) % size) for k in range(1, size)]
+
+
+def _nbytes(buffer):
+    return memoryview(buffer).nbytes
+
+
+async def _call(func, *args):
+    if asyncio.iscoroutinefunction(func):
+        await func(*args)
+    else:
+        func(*args)
+
+
+async def shuffle(
+    rank,
+    eps,
+    partitions,
+    consumer,
+    max_outstanding_bytes=2 ** 28,
+    order="pairwise",
+    allocator=bytearray,
+    tag="ucp.shuffle",
+):
+    """Exchange partitions between all ranks
+
+    Every rank sends partition `i` to rank `i` and hands each partition it
+    receives to `consumer` as soon as it has arrived. The transfers are
+    scheduled in rounds, in which every rank receives from a single peer,
+    and the bytes being sent and the bytes received but not yet consumed
+    are each bounded by `max_outstanding_bytes`.
+
+    All ranks must call this function with the same `order` and `tag`.
+
+    Parameters
+    ----------
+    rank: int
+        The rank of this process
+    eps: dict
+        The endpoints to all other ranks by rank, e.g. as given to
+        `worker_func` by `ucp.utils.run_on_local_network()`
+    partitions: dict or list
+        The partitions by destination rank, which are host buffers exposing
+        the buffer protocol. A missing or None partition is sent as empty.
+    consumer: function or coroutine
+        Called with the source rank and the buffer of every received
+        partition, including the partition of this rank and empty ones.
+        The buffer of a partition received from a peer counts towards the
+        outstanding bytes until it returns. The partition of this rank is
+        already in memory thus it doesn't count.
+    max_outstanding_bytes: int, optional
+        The maximum number of bytes in flight in each direction. A partition
+        larger than this is transferred alone.
+    order: str, optional
+        "pairwise" or "staggered" (see above). The pairwise order requires
+        the number of ranks to be a power of two and falls back to the
+        staggered order otherwise.
+    allocator: callable, optional
+        Function to allocate the buffer of a received partition, which is
+        called with the size in bytes. Use a
+        `ucp.spilling_allocator.SpillingAllocator` to spill the received
+        partitions to disk beyond a memory budget.
+    tag: hashable, optional
+        The tag of the messages of the shuffle. Other messages on the
+        endpoints must not use this tag.
+
+    Returns
+    -------
+    dict
+        The statistics of this rank: "peers" maps every peer rank to the
+        bytes sent and received, the seconds spent transferring them and
+        the resulting throughput in bytes per second. "peak_send_bytes" and
+        "peak_recv_bytes" are the maximum outstanding bytes.
+    """
+    rank = int(rank)
+    size = len(eps) + 1
+    channels = {int(peer): ep.channel(tag) for peer, ep in eps.items()}
+    if isinstance(partitions, dict):
+        partitions = [partitions.get(i) for i in range(size)]
+    if len(partitions) != size:
+        raise ValueError("Expected a partition for each of the %d ranks" % size)
+    partitions = [b"" if p is None else p for p in partitions]
+    schedule = _schedule(rank, size, order)
+
+    send_budget = _ByteBudget(max_outstanding_bytes)
+    recv_budget = _ByteBudget(max_outstanding_bytes)
+    peers = collections.defaultdict(
+        lambda: {
+            "bytes_sent": 0,
+            "bytes_recv": 0,
+            "send_seconds": 0.0,
+            "recv_seconds": 0.0,
+        }
+    )
+
+    async def send_partition(dst, buffer, nbytes):
+        t0 = time.monotonic()
+        try:
+            await channels[dst].send(buffer)
+        finally:
+            send_budget.release(nbytes)
+        peers[dst]["bytes_sent"] += nbytes
+        peers[dst]["send_seconds"] += time.monotonic() - t0
+
+    async def send_all():
+        tasks = []
+        for dst, _ in schedule:
+            buffer = partitions[dst]
+            nbytes = _nbytes(buffer)
+            # The header with the size of the partition
+            await channels[dst].send(np.array([nbytes], dtype="u8"))
+            if nbytes:
+                await send_budget.acquire(nbytes)
+                tasks.append(asyncio.ensure_future(send_partition(dst, buffer, nbytes)))
+        await asyncio.gather(*tasks)
+
+    async def recv_partition(src, buffer, nbytes):
+        try:
+            if nbytes:
+                t0 = time.monotonic()
+                await channels[src].recv(buffer)
+                peers[src]["bytes_recv"] += nbytes
+                peers[src]["recv_seconds"] += time.monotonic() - t0
+            await _call(consumer, src, buffer)
+        finally:
+            recv_budget.release(nbytes)
+
+    async def recv_all():
+        # The headers are small thus all of them are received upfront
+        headers = {src: np.empty(1, dtype="u8") for _, src in schedule}
+        header_futures = [
+            asyncio.ensure_future(channels[src].recv(headers[src]))
+            for _, src in schedule
+        ]
+        tasks = []
+        try:
+            for (_, src), future in zip(schedule, header_futures):
+                await future
+                nbytes = int(headers[src][0])
+                await recv_budget.acquire(nbytes)
+                tasks.append(
+                    asyncio.ensure_future(
+                        recv_partition(src, allocator(nbytes), nbytes)
+                    )
+                )
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for future in header_futures + tasks:
+                future.cancel()
+            raise
+
+    own = partitions[rank]
+    await asyncio.gather(send_all(), recv_all(), _call(consumer, rank, own))
+
+    for s in peers.values():
+        s["send_throughput"] = (
+            s["bytes_sent"] / s["send_seconds"] if s["send_seconds"] else 0.0
+        )
+        s["recv_throughput"] = (
+            s["bytes_recv"] / s["recv_seconds"] if s["recv_seconds"] else 0.0
+        )
+    return {
+        "peers": dict(peers),
+        "peak_send_bytes": send_budget.peak,
+        "peak_recv_bytes": recv_budget.peak,
+    }
@@ -0,0 +1,170 @@
+# Copyright (c) 2020, NVIDIA CORPORATION. All rights reserved.
+# See file LICENSE for terms.
+
+import mmap
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+
+class _SpillBuffer:
+    """Owner of a buffer handed out by `SpillingAllocator`
+
+    All arrays and memoryviews derived from the allocated array reference
+    this object thus the buffer is only released when all of them have been
+    deleted.
+    """
+
+    def __init__(self, block, spill_file=None):
+        self.block = block
+        self.spill_file = spill_file
+        self.__array_interface__ = {
+            "data": (block.ctypes.data, False),
+            "shape": (block.nbytes,),
+            "typestr": "|u1",
+            "version": 3,
+        }
+
+
+class _SpillFile:
+    """A memory-mapped file, which regions are allocated from
+
+    The file is unlinked right away thus the disk space is reclaimed when
+    the mapping is closed, which happens when all regions have been deleted.
+    """
+
+    def __init__(self, directory, size):
+        fd, path = tempfile.mkstemp(prefix="ucx-spill-", dir=directory)
+        try:
+            os.unlink(path)
+            try:
+                # Reserve the disk space, which avoids SIGBUS when the disk
+                # is full while UCX is writing to the mapping
+                os.posix_fallocate(fd, 0, size)
+            except (AttributeError, OSError):
+                os.ftruncate(fd, size)
+            self.mmap = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+        self.size = size
+        self.offset = 0  # Start of the unallocated space
+        self.live = 0  # Number of regions not yet released
+
+
+class SpillingAllocator:
+    """Allocator of receive buffers that spills to memory-mapped files.
+
+    Buffers are allocated in memory as long as the buffers in use fit in
+    `memory_budget`. Beyond that, buffers are regions of memory-mapped files
+    thus UCX receives straight into the file and the resident memory stays
+    bounded, at the cost of disk I/O when the data is paged out.
+
+    The allocator can be used as the `allocator` argument of
+    `ucp.shuffle.shuffle()`, `Endpoint.recv_obj()` and
+    `Endpoint.recv_frames()`.
+
+    Parameters
+    ----------
+    memory_budget: int
+        The maximum number of bytes of in-memory buffers in use
+    directory: str, optional
+        The directory of the spill files. If None, the default directory of
+        temporary files is used (see `tempfile.gettempdir()`).
+    file_size: int, optional
+        The size of the preallocated spill files. Buffers larger than this
+        get a file of their own.
+    alignment: int, optional
+        The alignment of buffers within the spill files in bytes
+    """
+
+    def __init__(self, memory_budget, directory=None, file_size=2 ** 30, alignment=64):
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.file_size = file_size
+        self.alignment = alignment
+        self._file = None  # The spill file being allocated from
+        self.memory_nbytes = 0  # Bytes of in-memory buffers in use
+        self.spilled_nbytes = 0  # Bytes of spilled buffers in use
+        self.total_spilled_nbytes = 0
+        self.spill_files = 0
+
+    @property
+    def stats(self):
+        """Dict of the allocator statistics"""
+        return {
+            "memory_nbytes": self.memory_nbytes,
+            "spilled_nbytes": self.spilled_nbytes,
+            "total_spilled_nbytes": self.total_spilled_nbytes,
+            "spill_files": self.spill_files,
+        }
+
+    def allocate(self, nbytes):
+        """Allocate an uninitialized buffer
+
+        Parameters
+        ----------
+        nbytes: int
+            The size of the buffer in bytes
+
+        Returns
+        -------
+        numpy.ndarray
+            A uint8 array of `nbytes` elements, which might be backed by a
+            spill file
+        """
+        if self.memory_nbytes + nbytes <= self.memory_budget:
+            block = np.empty(nbytes, dtype=np.uint8)
+            self.memory_nbytes += nbytes
+            owner = _SpillBuffer(block)
+            owner.finalizer = weakref.finalize(owner, self._release_memory, nbytes)
+        else:
+            spill_file, block = self._allocate_spilled(nbytes)
+            owner = _SpillBuffer(block, spill_file)
+            owner.finalizer = weakref.finalize(
+                owner, self._release_spilled, spill_file, nbytes
+            )
+        return np.asarray(owner)
+
+    __call__ = allocate
+
+    def release(self, buffer):
+        """Release `buffer` immediately
+
+        Warning, `buffer` and all views of it must not be used afterwards.
+
+        Parameters
+        ----------
+        buffer: numpy.ndarray
+            A buffer returned by `allocate()`
+        """
+        owner = buffer
+        while isinstance(owner, np.ndarray):
+            owner = owner.base
+        if not isinstance(owner, _SpillBuffer):
+            raise ValueError("The buffer wasn't allocated by a SpillingAllocator")
+        owner.finalizer()
+
+    def _allocate_spilled(self, nbytes):
+        f = self._file
+        if f is None or f.offset + nbytes > f.size:
+            f = _SpillFile(self.directory, max(self.file_size, nbytes))
+            self._file = f
+            self.spill_files += 1
+        block = np.frombuffer(f.mmap, dtype=np.uint8, count=nbytes, offset=f.offset)
+        f.offset += -(-nbytes // self.alignment) * self.alignment
+        f.live += 1
+        self.spilled_nbytes += nbytes
+        self.total_spilled_nbytes += nbytes
+        return f, block
+
+    def _release_memory(self, nbytes):
+        self.memory_nbytes -= nbytes
+
+    def _release_spilled(self, spill_file, nbytes):
+        self.spilled_nbytes -= nbytes
+        spill_file.live -= 1
+        # The space of the current file is reused when all regions are released
+        if spill_file.live == 0 and spill_file is self._file:
+            spill_file.offset = 0
@@ -4,6 +4,7 @@ import hashlib
 import logging
 import multiprocessing as mp
 import os
+import queue
 import socket
 import struct
 import time
@@ -127,41 +128,62 @@ def get_ucxpy_logger():
 
 # Help function used by `run_on_local_network()`
 def _worker_process(
-    queue, rank, server_address, n_workers, ucx_options_list, func, args
+    results, ports, barrier, rank, server_address, ucx_options_list, func, args
 ):
     import ucp
 
-    if ucx_options_list is not None:
-        ucp.init(ucx_options_list[rank])
+    n_workers = len(ports)
 
     async def run():
         eps = {}
+        ready = asyncio.Event()
+
+        def add_endpoint(peer_rank, ep):
+            assert peer_rank not in eps
+            eps[peer_rank] = ep
+            if len(eps) == n_workers - 1:
+                ready.set()
 
         async def server_handler(ep):
             peer_rank = np.empty((1,), dtype=np.uint64)
             await ep.recv(peer_rank)
-            assert peer_rank[0] not in eps
-            eps[peer_rank[0]] = ep
+            add_endpoint(int(peer_rank[0]), ep)
 
         lf = ucp.create_listener(server_handler)
-        queue.put(lf.port)
-        port_list = queue.get()
-        for i in range(rank + 1, n_workers):
-            assert i not in eps
-            eps[i] = await ucp.create_endpoint(server_address, port_list[i])
-            await eps[i].send(np.array([rank], dtype=np.uint64))
-
-        while len(eps) != n_workers - 1:
-            await asyncio.sleep(0.1)
+        # Exchange the ports of all workers in a single step, the barrier
+        # is waited on in a thread to keep progressing UCX meanwhile
+        ports[rank] = lf.port
+        await asyncio.get_event_loop().run_in_executor(None, barrier.wait)
+
+        # Connect to all higher ranks concurrently, the lower ranks connect
+        # to this worker
+        peers = range(rank + 1, n_workers)
+        new_eps = await ucp.create_endpoints(
+            [(server_address, ports[i]) for i in peers]
+        )
+        await asyncio.gather(
+            *(ep.send(np.array([rank], dtype=np.uint64)) for ep in new_eps)
+        )
+        for i, ep in zip(peers, new_eps):
+            add_endpoint(i, ep)
+        if n_workers > 1:
+            await ready.wait()
 
         if asyncio.iscoroutinefunction(func):
             return await func(rank, eps, args)
         else:
             return func(rank, eps, args)
 
-    loop = asyncio.get_event_loop()
-    ret = loop.run_until_complete(run())
-    queue.put(ret)
+    try:
+        if ucx_options_list is not None:
+            ucp.init(ucx_options_list[rank])
+        ret = asyncio.get_event_loop().run_until_complete(run())
+    except BaseException as e:
+        # Wake up the workers waiting on the barrier and report the failure
+        barrier.abort()
+        results.put((rank, False, e))
+        raise
+    results.put((rank, True, ret))
 
 
 def run_on_local_network(
@@ -170,6 +192,9 @@ def run_on_local_network(
     """
     Creates a local UCX network of `n_workers` that runs `worker_func`
 
+    All workers are started at once, exchange the ports of their listeners
+    through shared memory and connect to each other concurrently.
+
     Parameters
     ----------
     n_workers : int
@@ -195,35 +220,55 @@ def run_on_local_network(
 
     if server_address is None:
         server_address = get_address()
+    results = mp.Queue()
+    ports = mp.Array("i", n_workers, lock=False)
+    barrier = mp.Barrier(n_workers)
     process_list = []
     for rank in range(n_workers):
-        q = mp.Queue()
         p = mp.Process(
             target=_worker_process,
             args=(
-                q,
+                results,
+                ports,
+                barrier,
                 rank,
                 server_address,
-                n_workers,
                 ucx_options_list,
                 worker_func,
                 worker_args,
             ),
         )
         p.start()
-        port = q.get()
-        process_list.append((p, q, port))
-
-    for proc, queue, port in process_list:
-        queue.put([p[2] for p in process_list])  # Send list of ports
-
-    results = []
-    for proc, queue, port in process_list:
-        results.append(queue.get())
-        proc.join()
+        process_list.append(p)
+
+    # The results must be received before joining the processes, which
+    # otherwise might block on flushing the queue
+    ret = {}
+    try:
+        while len(ret) < n_workers:
+            try:
+                rank, success, result = results.get(timeout=1)
+            except queue.Empty:
+                # A worker that crashed never reports its result
+                for rank, proc in enumerate(process_list):
+                    if rank not in ret and proc.exitcode:
+                        raise RuntimeError(
+                            "Worker %d exited with code %d" % (rank, proc.exitcode)
+                        )
+                continue
+            if not success:
+                raise result
+            ret[rank] = result
+    except BaseException:
+        for proc in process_list:
+            proc.terminate()
+        raise
+    finally:
+        for proc in process_list:
+            proc.join()
+    for proc in process_list:
         assert not proc.exitcode
-    assert len(results) == n_workers
-    return results
+    return [ret[rank] for rank in range(n_workers)]
 
 
 try:
@@ -243,3 +288,12 @@ def hash64bits(*args):
     h = hashlib.sha1(bytes(repr(args), "utf-8")).hexdigest()[:16]
     # Convert to an integer and return
     return int(h, 16)
+
+
+def bytes_hash64(data):
+    """Fast non-cryptographic 64 bit hash of the bytes `data`
+
+    As opposed to `hash()`, the hash of str and bytes is the same in all
+    processes.
+    """
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")